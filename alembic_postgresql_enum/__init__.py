@@ -1,10 +1,16 @@
 from .compare_dispatch import compare_enums as _
-from .get_enum_data import ColumnType, TableReference
+from .get_enum_data import ColumnType, TableReference, EnumValuesSync, EnumDefinition, LockRetry, OnlineSync
 from .configuration import set_configuration, Config
+from .statement_events import StatementEvent
 
 __all__ = (
     "ColumnType",
     "TableReference",
+    "EnumValuesSync",
+    "EnumDefinition",
+    "LockRetry",
+    "OnlineSync",
     "set_configuration",
     "Config",
+    "StatementEvent",
 )
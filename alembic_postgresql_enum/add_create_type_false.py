@@ -2,12 +2,11 @@ import logging
 
 import sqlalchemy
 from alembic.operations.ops import (
-    UpgradeOps,
-    ModifyTableOps,
     AddColumnOp,
     CreateTableOp,
     DropColumnOp,
     DropTableOp,
+    MigrateOperation,
 )
 from sqlalchemy import Column
 from sqlalchemy.dialects import postgresql
@@ -29,6 +28,24 @@ class ReprWorkaround(postgresql.ENUM):
 log = logging.getLogger(f"alembic.{__name__}")
 
 
+def convert_to_postgresql_enum(enum_type: sqlalchemy.Enum) -> postgresql.ENUM:
+    """
+    Build postgresql.ENUM with the same values and attributes as native sqlalchemy.Enum,
+    so its repr matches the repr of the original type
+    """
+    return postgresql.ENUM(
+        *enum_type.enums,
+        name=enum_type.name,
+        schema=enum_type.schema,
+        metadata=enum_type.metadata,
+        inherit_schema=enum_type.inherit_schema,
+        values_callable=enum_type.values_callable,
+        validate_strings=enum_type.validate_strings,
+        length=enum_type.length,
+        create_constraint=enum_type.create_constraint,
+    )
+
+
 def get_replacement_type(column_type):
     replacement_enum_type = column_type
 
@@ -37,7 +54,7 @@ def get_replacement_type(column_type):
             return replacement_enum_type
 
         log.info("%r converted into postgresql.ENUM", replacement_enum_type)
-        replacement_enum_type = eval(repr(replacement_enum_type).replace("Enum", "postgresql.ENUM"))
+        replacement_enum_type = convert_to_postgresql_enum(replacement_enum_type)
 
     if isinstance(replacement_enum_type, postgresql.ENUM):
         if replacement_enum_type.create_type:
@@ -56,24 +73,25 @@ def inject_repr_into_enums(column: Column):
         column.type = get_replacement_type(column.type)
 
 
-def add_create_type_false(upgrade_ops: UpgradeOps):
-    """Add create_type=False to all postgresql.ENUM types that are generated by alembic"""
-    for operations_group in upgrade_ops.ops:
-        if isinstance(operations_group, ModifyTableOps):
-            for operation in operations_group.ops:
-                if isinstance(operation, AddColumnOp):
-                    inject_repr_into_enums(operation.column)
-                elif isinstance(operation, DropColumnOp):
-                    assert operation._reverse is not None
-                    inject_repr_into_enums(operation._reverse.column)
-
-        elif isinstance(operations_group, CreateTableOp):
-            for column in operations_group.columns:
-                if isinstance(column, Column):
-                    inject_repr_into_enums(column)
-
-        elif isinstance(operations_group, DropTableOp):
-            assert operations_group._reverse is not None
-            for column in operations_group._reverse.columns:
-                if isinstance(column, Column):
-                    inject_repr_into_enums(column)
+def add_create_type_false_to_operation(operation: MigrateOperation):
+    """
+    Add create_type=False to postgresql.ENUM types of a single operation generated by alembic,
+    columns of ModifyTableOps are handled by passing its operations one by one
+    """
+    if isinstance(operation, AddColumnOp):
+        inject_repr_into_enums(operation.column)
+
+    elif isinstance(operation, DropColumnOp):
+        assert operation._reverse is not None
+        inject_repr_into_enums(operation._reverse.column)
+
+    elif isinstance(operation, CreateTableOp):
+        for column in operation.columns:
+            if isinstance(column, Column):
+                inject_repr_into_enums(column)
+
+    elif isinstance(operation, DropTableOp):
+        assert operation._reverse is not None
+        for column in operation._reverse.columns:
+            if isinstance(column, Column):
+                inject_repr_into_enums(column)
@@ -3,7 +3,7 @@ import logging
 from alembic.autogenerate import renderers, render
 from alembic.autogenerate.api import AutogenContext
 from alembic.operations import ops
-from alembic.operations.ops import UpgradeOps, ModifyTableOps, AlterColumnOp
+from alembic.operations.ops import AlterColumnOp
 from sqlalchemy import String
 
 from alembic_postgresql_enum.get_enum_data.declared_enums import column_type_is_enum
@@ -45,11 +45,7 @@ def add_postgres_using_to_alter_operation(op: AlterColumnOp):
     op.__class__ = PostgresUsingAlterColumnOp
 
 
-def add_postgres_using_to_text(upgrade_ops: UpgradeOps):
-    """Add postgresql_using to alter_column expressions that changes type from string to enum"""
-    for group_op in upgrade_ops.ops:
-        if isinstance(group_op, ModifyTableOps):
-            for i, op in enumerate(group_op.ops):
-                if isinstance(op, AlterColumnOp):
-                    if isinstance(op.existing_type, String) and column_type_is_enum(op.modify_type):
-                        add_postgres_using_to_alter_operation(op)
+def add_postgres_using_if_text_to_enum(op: AlterColumnOp):
+    """Add postgresql_using to alter_column expression if it changes type from string to enum"""
+    if isinstance(op.existing_type, String) and column_type_is_enum(op.modify_type):
+        add_postgres_using_to_alter_operation(op)
@@ -1,21 +1,29 @@
 import logging
-from typing import Iterable, Union
+from typing import TYPE_CHECKING, Iterable, Union, List
 
 import alembic
 from alembic.autogenerate.api import AutogenContext
-from alembic.operations.ops import UpgradeOps, CreateTableOp
+from alembic.operations.ops import UpgradeOps
 
-from alembic_postgresql_enum.add_create_type_false import add_create_type_false
-from alembic_postgresql_enum.add_postgres_using_to_text import (
-    add_postgres_using_to_text,
-)
 from alembic_postgresql_enum.detection_of_changes import (
     sync_changed_enums,
+    merge_syncs_sharing_tables,
     create_new_enums,
     drop_unused_enums,
+    batch_enum_lifecycle_ops,
+)
+from alembic_postgresql_enum.get_enum_data import (
+    DeclaredEnumValues,
+    get_defined_enums_by_schema,
+    get_declared_enums_by_schema,
 )
-from alembic_postgresql_enum.get_enum_data import get_defined_enums, get_declared_enums
-from alembic_postgresql_enum.configuration import get_configuration
+from alembic_postgresql_enum.configuration import Config, get_configuration
+from alembic_postgresql_enum.preprocess_upgrade_ops import preprocess_upgrade_ops
+from alembic_postgresql_enum.tracing import trace_span
+
+if TYPE_CHECKING:
+    from sqlalchemy import MetaData
+    from sqlalchemy.engine import Connection
 
 log = logging.getLogger(f"alembic.{__name__}")
 
@@ -47,43 +55,86 @@ def compare_enums(
         )
         return
 
-    add_create_type_false(upgrade_ops)
-    add_postgres_using_to_text(upgrade_ops)
+    with trace_span("compare_enums", autogen_context.connection) as span:
+        _compare_enums(
+            autogen_context.connection,
+            autogen_context.metadata,
+            upgrade_ops,
+            list(schema_names),
+            configuration,
+            autogen_context.dialect.default_schema_name,
+        )
+        if span is not None:
+            span.set_attribute("operation_count", len(upgrade_ops.ops))
+
 
-    schema_names = list(schema_names)
+def _compare_enums(
+    connection: "Connection",
+    metadata: Union["MetaData", List["MetaData"]],
+    upgrade_ops: UpgradeOps,
+    schema_names: List[Union[str, None]],
+    configuration: Config,
+    default_schema: str,
+):
+    # Walk upgrade ops once for all preprocessing
+    with trace_span("preprocess_upgrade_ops", operation_count=len(upgrade_ops.ops)):
+        preprocessed_upgrade_ops = preprocess_upgrade_ops(upgrade_ops, default_schema)
 
     # Issue #40
     # Add schema if it is gonna be created inside the migration
-    for operations_group in upgrade_ops.ops:
-        if isinstance(operations_group, CreateTableOp) and operations_group.schema not in schema_names:
-            schema_names.append(operations_group.schema)
+    known_schema_names = set(schema_names)
+    for schema in preprocessed_upgrade_ops.created_table_schemas:
+        if schema not in known_schema_names:
+            schema_names.append(schema)
+
+    # Walk declared schema once for all schemas instead of walking it for each of them
+    with trace_span("get_declared_enums") as span:
+        declarations_by_schema = get_declared_enums_by_schema(
+            metadata,
+            default_schema,
+            connection,
+            include_name=configuration.include_name,
+            just_added_defaults=preprocessed_upgrade_ops.just_added_defaults,
+        )
+        if span is not None:
+            span.set_attribute(
+                "enum_count", sum(len(declarations.enum_values) for declarations in declarations_by_schema.values())
+            )
 
-    for schema in schema_names:
-        default_schema = autogen_context.dialect.default_schema_name
-        if schema is None:
-            schema = default_schema
+    schemas = [default_schema if schema is None else schema for schema in schema_names]
 
-        definitions = get_defined_enums(autogen_context.connection, schema, configuration.include_name)
+    # Fetch enum definitions of all schemas in a single query
+    with trace_span("get_defined_enums", schema_count=len(schemas)) as span:
+        definitions_by_schema = get_defined_enums_by_schema(connection, schemas, configuration.include_name)
+        if span is not None:
+            span.set_attribute("enum_count", sum(len(definitions) for definitions in definitions_by_schema.values()))
 
-        declarations = get_declared_enums(
-            autogen_context.metadata,
-            schema,
-            default_schema,
-            autogen_context.connection,
-            upgrade_ops,
-            configuration.include_name,
-        )
+    for schema in schemas:
+        definitions = definitions_by_schema[schema]
 
-        create_new_enums(definitions, declarations.enum_values, schema, upgrade_ops)
+        declarations = declarations_by_schema.get(schema, DeclaredEnumValues(enum_values={}, enum_table_references={}))
+
+        with trace_span("create_new_enums", schema=schema):
+            create_new_enums(definitions, declarations.enum_values, schema, upgrade_ops)
 
         if configuration.drop_unused_enums:
-            drop_unused_enums(definitions, declarations.enum_values, schema, upgrade_ops)
+            with trace_span("drop_unused_enums", schema=schema):
+                drop_unused_enums(definitions, declarations.enum_values, schema, upgrade_ops)
 
         if configuration.detect_enum_values_changes:
-            sync_changed_enums(
-                definitions,
-                declarations.enum_values,
-                declarations.enum_table_references,
-                schema,
-                upgrade_ops,
-            )
+            with trace_span("sync_changed_enums", schema=schema):
+                sync_changed_enums(
+                    definitions,
+                    declarations.enum_values,
+                    declarations.enum_table_references,
+                    schema,
+                    upgrade_ops,
+                )
+
+    if configuration.detect_enum_values_changes:
+        with trace_span("merge_syncs_sharing_tables"):
+            merge_syncs_sharing_tables(upgrade_ops)
+
+    if configuration.batch_enum_lifecycle_operations:
+        with trace_span("batch_enum_lifecycle_ops"):
+            batch_enum_lifecycle_ops(upgrade_ops)
@@ -1,5 +1,10 @@
 from dataclasses import dataclass
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+from alembic_postgresql_enum.get_enum_data.types import LockRetry
+
+if TYPE_CHECKING:
+    from alembic_postgresql_enum.statement_events import StatementListener
 
 
 @dataclass
@@ -10,6 +15,16 @@ class Config:
     detect_enum_values_changes: bool = True
     force_dialect_support: bool = False
     ignore_enum_values_order: bool = False
+    add_new_values_in_place: bool = False
+    validate_removed_values: bool = False
+    lock_retry: Optional[LockRetry] = None
+    alter_partitions_separately: bool = False
+    canary_sample_percent: Optional[float] = None
+    single_round_trip_sync: bool = False
+    batch_enum_lifecycle_operations: bool = False
+    statement_listeners: Sequence["StatementListener"] = ()
+    log_statement_timings: bool = False
+    tracer: Optional[Any] = None
 
 
 _config = Config()
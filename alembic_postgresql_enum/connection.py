@@ -1,18 +1,77 @@
+import logging
+import threading
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from typing import Iterator
 
 import sqlalchemy
 
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+@dataclass(frozen=True)
+class ConnectionMetrics:
+    """
+    Connections used by operations of the library
+    :param reused:
+        Number of operations executed on the connection of the migration context
+    :param checked_out:
+        Number of connections checked out from the pool of an Engine operations are bound to
+    :param returned:
+        Number of checked out connections returned to the pool
+    """
+
+    reused: int = 0
+    checked_out: int = 0
+    returned: int = 0
+
+    @property
+    def in_use(self) -> int:
+        """Connections checked out by the library and not returned yet"""
+        return self.checked_out - self.returned
+
+
+_metrics = ConnectionMetrics()
+_metrics_lock = threading.Lock()
+
+
+def _count(**increments: int):
+    global _metrics
+    with _metrics_lock:
+        _metrics = replace(
+            _metrics, **{name: getattr(_metrics, name) + increment for name, increment in increments.items()}
+        )
+
+
+def get_connection_metrics() -> ConnectionMetrics:
+    """Connections used by operations since the start of the process or the last reset_connection_metrics"""
+    return _metrics
+
+
+def reset_connection_metrics():
+    global _metrics
+    with _metrics_lock:
+        _metrics = ConnectionMetrics()
+
 
 @contextmanager
 def get_connection(operations) -> Iterator[sqlalchemy.engine.Connection]:
     """
-    SQLAlchemy 2.0 changes the operation binding location; bridge function to support
-    both 1.x and 2.x.
-
+    Connection to execute statements of an operation with.
+    Within a migration it is the connection of the migration context, so statements are a part of its transaction.
+    If operations are bound to an Engine, a connection is checked out from its pool for the operation,
+    committed if the operation succeeds and returned to the pool in any case.
     """
     binding = operations.get_bind()
     if isinstance(binding, sqlalchemy.engine.Connection):
+        _count(reused=1)
         yield binding
         return
-    yield binding.connect()
+
+    _count(checked_out=1)
+    try:
+        with binding.begin() as connection:
+            log.debug("Connection checked out from the pool: %s", binding.pool.status())
+            yield connection
+    finally:
+        _count(returned=1)
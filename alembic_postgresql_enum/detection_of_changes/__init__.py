@@ -1,3 +1,4 @@
-from .enum_alteration import sync_changed_enums
+from .enum_alteration import sync_changed_enums, merge_syncs_sharing_tables
 from .enum_creation import create_new_enums
 from .enum_deletion import drop_unused_enums
+from .enum_lifecycle_batching import batch_enum_lifecycle_ops
@@ -1,10 +1,12 @@
 """
 Alembic extension to generate ALTER TYPE ... ADD VALUE statements to update
-SQLAlchemy enums.
+SQLAlchemy enums if add_new_values_in_place configuration flag is turned on.
+Other changed enums, and enums which values are removed or reordered, are synced with SyncEnumValuesOp.
 
 """
 
 import logging
+from typing import List, Set, Tuple
 
 from alembic.operations.ops import UpgradeOps
 
@@ -12,7 +14,10 @@ from alembic_postgresql_enum.get_enum_data import (
     EnumNamesToValues,
     EnumNamesToTableReferences,
 )
+from alembic_postgresql_enum.detection_of_changes.enum_values_diff import get_enum_values_insertions
+from alembic_postgresql_enum.operations.add_enum_value import AddEnumValuesOp, EnumValueInsertion
 from alembic_postgresql_enum.operations.sync_enum_values import SyncEnumValuesOp
+from alembic_postgresql_enum.operations.sync_multiple_enum_values import SyncMultipleEnumValuesOp
 from alembic_postgresql_enum.configuration import get_configuration
 
 log = logging.getLogger(f"alembic.{__name__}")
@@ -49,15 +54,70 @@ def sync_changed_enums(
             list(old_values),
             list(new_values),
         )
-        affected_columns = table_references[enum_name]
+        affected_columns = sorted(  # Sort references alphabetically for consistency of generated text
+            table_references[enum_name],
+            key=lambda reference: (reference.table_schema, reference.table_name, reference.column_name),
+        )
+
+        insertions = None
+        if configuration.add_new_values_in_place:
+            # Added values can not be used until commit, so migrations that use them right away keep the rewrite
+            insertions = get_enum_values_insertions(old_values, new_values)
+            if insertions is None and configuration.ignore_enum_values_order and set(old_values).issubset(new_values):
+                insertions = [EnumValueInsertion(value) for value in new_values if value not in old_values]
+
+        if insertions is not None:
+            # Values are only inserted, so there is no need to rewrite affected tables
+            upgrade_ops.ops.append(
+                AddEnumValuesOp(
+                    schema,
+                    enum_name,
+                    list(old_values),
+                    list(new_values),
+                    affected_columns,
+                    insertions,
+                )
+            )
+            continue
+
         op = SyncEnumValuesOp(
             schema,
             enum_name,
             list(old_values),
             list(new_values),
-            sorted(  # Sort references alphabetically for consistency of generated text
-                affected_columns,
-                key=lambda reference: (reference.table_schema, reference.table_name, reference.column_name),
-            ),
+            affected_columns,
         )
         upgrade_ops.ops.append(op)
+
+
+def merge_syncs_sharing_tables(upgrade_ops: UpgradeOps):
+    """
+    Merge SyncEnumValuesOps that affect the same tables into SyncMultipleEnumValuesOp,
+    so these tables are rewritten only once
+    """
+    groups: List[Tuple[Set[str], List[SyncEnumValuesOp]]] = []
+
+    for op in upgrade_ops.ops:
+        if not isinstance(op, SyncEnumValuesOp):
+            continue
+
+        tables = {reference.table_name_with_schema for reference in op.affected_columns}
+        group_tables, group_ops = set(tables), [op]
+
+        for other_group in [group for group in groups if group[0] & tables]:
+            groups.remove(other_group)
+            group_tables |= other_group[0]
+            group_ops = other_group[1] + group_ops
+
+        groups.append((group_tables, group_ops))
+
+    for _, group_ops in groups:
+        if len(group_ops) < 2:
+            continue
+
+        group_ops.sort(key=upgrade_ops.ops.index)
+        log.info("Enums %r share affected tables and will be synced together", [op.name for op in group_ops])
+
+        upgrade_ops.ops[upgrade_ops.ops.index(group_ops[0])] = SyncMultipleEnumValuesOp(group_ops)
+        for op in group_ops[1:]:
+            upgrade_ops.ops.remove(op)
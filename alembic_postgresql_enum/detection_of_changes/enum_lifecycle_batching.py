@@ -0,0 +1,41 @@
+import logging
+from typing import List
+
+from alembic.operations.ops import UpgradeOps, MigrateOperation
+
+from alembic_postgresql_enum.operations import CreateEnumOp, DropEnumOp, CreateMultipleEnumsOp, DropMultipleEnumsOp
+from alembic_postgresql_enum.operations.enum_lifecycle_base import EnumLifecycleOp
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+def batch_enum_lifecycle_ops(upgrade_ops: UpgradeOps):
+    """
+    Merge consecutive CreateEnumOps into CreateMultipleEnumsOp and consecutive DropEnumOps into DropMultipleEnumsOp,
+    so every run of them is executed in a single round trip
+    """
+    batched_ops: List[MigrateOperation] = []
+    run: List[EnumLifecycleOp] = []
+
+    def flush_run():
+        if len(run) < 2:
+            batched_ops.extend(run)
+        elif isinstance(run[0], CreateEnumOp):
+            log.info("Creation of enums %r is batched", [op.name for op in run])
+            batched_ops.append(CreateMultipleEnumsOp(list(run)))
+        else:
+            log.info("Deletion of enums %r is batched", [op.name for op in run])
+            batched_ops.append(DropMultipleEnumsOp(list(run)))
+        run.clear()
+
+    for op in upgrade_ops.ops:
+        if run and type(op) is not type(run[0]):
+            flush_run()
+
+        if isinstance(op, (CreateEnumOp, DropEnumOp)):
+            run.append(op)
+        else:
+            batched_ops.append(op)
+    flush_run()
+
+    upgrade_ops.ops[:] = batched_ops
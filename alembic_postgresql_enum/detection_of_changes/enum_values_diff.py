@@ -0,0 +1,41 @@
+from typing import List, Optional, Sequence
+
+from alembic_postgresql_enum.operations.add_enum_value import EnumValueInsertion
+
+
+def get_enum_values_insertions(
+    old_values: Sequence[str], new_values: Sequence[str]
+) -> Optional[List[EnumValueInsertion]]:
+    """
+    Return insertions that turn old values into new values,
+    or None if some of old values are removed or reordered and enum has to be rewritten.
+
+    As enum values are unique, the longest common subsequence of old and new values is equal to old values
+    exactly when old values are a subsequence of new values, so the minimal edit script consists of insertions only.
+    Each inserted value is placed after the preceding value of new values,
+    or before the first old value if it is inserted at the very beginning.
+    """
+    insertions = []
+    old_values_index = 0
+    previous_value = None
+
+    for value in new_values:
+        if old_values_index < len(old_values) and value == old_values[old_values_index]:
+            old_values_index += 1
+        elif value in old_values:
+            # Value is moved
+            return None
+        elif previous_value is not None:
+            insertions.append(EnumValueInsertion(value, after=previous_value))
+        elif old_values:
+            insertions.append(EnumValueInsertion(value, before=old_values[0]))
+        else:
+            insertions.append(EnumValueInsertion(value))
+
+        previous_value = value
+
+    if old_values_index != len(old_values):
+        # Some values are removed
+        return None
+
+    return insertions
@@ -0,0 +1,9 @@
+from .estimate import (
+    EnumChangeEstimate,
+    TableCostEstimate,
+    estimate_enum_syncs,
+    estimate_enum_value_insertion,
+    estimate_upgrade_ops,
+    format_enum_plan,
+)
+from .command import enum_plan, PlanningOperations
@@ -0,0 +1,23 @@
+import argparse
+import os
+
+from alembic.config import Config as AlembicConfig
+
+from . import enum_plan, format_enum_plan
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m alembic_postgresql_enum.enum_plan",
+        description="Estimate cost of enum changes of pending alembic revisions without executing them",
+    )
+    parser.add_argument("-c", "--config", default=os.environ.get("ALEMBIC_CONFIG", "alembic.ini"))
+    parser.add_argument("-n", "--name", default="alembic", help="Name of section in .ini file to use")
+    parser.add_argument("revision", nargs="?", default="heads")
+    args = parser.parse_args()
+
+    print(format_enum_plan(enum_plan(AlembicConfig(args.config, ini_section=args.name), args.revision)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from contextlib import contextmanager
+from types import ModuleType
+from typing import List, Iterable, Iterator, Tuple, Optional
+
+from alembic import op
+from alembic.config import Config as AlembicConfig
+from alembic.operations import Operations
+from alembic.runtime.environment import EnvironmentContext
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from alembic_postgresql_enum.get_enum_data import EnumValuesSync, EnumDefinition, LockRetry, OnlineSync
+from .estimate import (
+    EnumChangeEstimate,
+    DEFAULT_REWRITE_BYTES_PER_SECOND,
+    estimate_enum_syncs,
+    estimate_enum_value_insertion,
+)
+
+
+class PlanningOperations(Operations):
+    """
+    Operations that estimate enum operations of migration scripts instead of executing them.
+    Other alembic operations are skipped.
+    """
+
+    def __init__(
+        self, migration_context: MigrationContext, rewrite_bytes_per_second: float = DEFAULT_REWRITE_BYTES_PER_SECOND
+    ):
+        super().__init__(migration_context)
+        self.rewrite_bytes_per_second = rewrite_bytes_per_second
+        self.estimates: List[EnumChangeEstimate] = []
+
+    def invoke(self, operation):
+        return None
+
+    def sync_enum_values(
+        self,
+        enum_schema: str,
+        enum_name: str,
+        new_values: List[str],
+        affected_columns: List[Tuple[str, str]],
+        enum_values_to_rename: Iterable[Tuple[str, str]] = tuple(),
+        lock_retry: Optional[LockRetry] = None,
+        online: Optional[OnlineSync] = None,
+    ):
+        self.sync_multiple_enum_values(
+            [EnumValuesSync(enum_schema, enum_name, new_values, affected_columns, list(enum_values_to_rename))],
+            lock_retry,
+            online,
+        )
+
+    def sync_multiple_enum_values(
+        self,
+        enum_syncs: Iterable[EnumValuesSync],
+        lock_retry: Optional[LockRetry] = None,
+        online: Optional[OnlineSync] = None,
+    ):
+        self.estimates.append(
+            estimate_enum_syncs(
+                self.get_bind(),
+                enum_syncs,
+                online=online is not None,
+                rewrite_bytes_per_second=self.rewrite_bytes_per_second,
+            )
+        )
+
+    def add_enum_value(
+        self,
+        enum_schema: str,
+        enum_name: str,
+        value: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ):
+        self.estimates.append(estimate_enum_value_insertion(self.get_bind(), enum_schema, enum_name))
+
+    def create_enums(self, enums: Iterable[EnumDefinition]):
+        pass
+
+    def drop_enums(self, enums: Iterable[EnumDefinition]):
+        pass
+
+
+@contextmanager
+def _operations_of_script(module: ModuleType, operations: Operations) -> Iterator[None]:
+    """Point alembic.op references of a migration script, including aliased ones, to operations while it runs"""
+    names = [name for name, value in vars(module).items() if value is op]
+    for name in names:
+        setattr(module, name, operations)
+    try:
+        yield
+    finally:
+        for name in names:
+            setattr(module, name, op)
+
+
+def enum_plan(
+    config: AlembicConfig,
+    revision: str = "heads",
+    rewrite_bytes_per_second: float = DEFAULT_REWRITE_BYTES_PER_SECOND,
+) -> List[EnumChangeEstimate]:
+    """
+    Estimate cost of enum operations of revisions that are not applied yet, up to the given revision.
+    Migration scripts are run with PlanningOperations, so no DDL is executed,
+    and everything done by them directly with the connection is rolled back.
+    Estimates are based on the current database state, so changes of previous pending revisions are not
+    taken into account.
+    """
+    script = ScriptDirectory.from_config(config)
+    planning_operations: List[PlanningOperations] = []
+
+    def plan(current_revisions, context: MigrationContext):
+        operations = PlanningOperations(context, rewrite_bytes_per_second)
+        planning_operations.append(operations)
+
+        pending_revisions = list(script.iterate_revisions(revision, current_revisions or "base"))
+        savepoint = context.connection.begin_nested()
+        try:
+            for revision_script in reversed(pending_revisions):
+                with _operations_of_script(revision_script.module, operations):
+                    revision_script.module.upgrade()
+        finally:
+            savepoint.rollback()
+        return []
+
+    with EnvironmentContext(config, script, fn=plan, destination_rev=revision, dont_mutate=True):
+        script.run_env()
+
+    return [estimate for operations in planning_operations for estimate in operations.estimates]
@@ -0,0 +1,242 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, DefaultDict, Set, Iterable
+
+from alembic.operations.ops import UpgradeOps
+
+from alembic_postgresql_enum.get_enum_data import EnumValuesSync, TableReference, get_defined_enums_by_schema
+from alembic_postgresql_enum.operations import SyncEnumValuesOp, AddEnumValuesOp, SyncMultipleEnumValuesOp
+from alembic_postgresql_enum.operations.sync_enum_values import get_in_place_change, get_table_references
+from alembic_postgresql_enum.sql_commands.table_size import get_table_sizes
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+# Rough rewrite throughput of a table with its indexes, depends heavily on hardware
+DEFAULT_REWRITE_BYTES_PER_SECOND = 64 * 1024 * 1024
+
+REWRITE = "rewrite"
+ONLINE = "online"
+CATALOG_ONLY = "catalog only"
+# Table does not exist yet, it is created by the same or a previous pending migration
+CREATED_IN_MIGRATION = "created in this migration"
+
+
+@dataclass(frozen=True)
+class TableCostEstimate:
+    table_name_with_schema: str
+    strategy: str
+    pages: int
+    tuples: float
+    total_size: int
+    rebuilt_indexes: Tuple[str, ...]
+    estimated_seconds: float
+
+
+@dataclass(frozen=True)
+class EnumChangeEstimate:
+    """Estimated cost of a single enum operation"""
+
+    enum_names: Tuple[str, ...]
+    tables: Tuple[TableCostEstimate, ...]
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(table.estimated_seconds for table in self.tables)
+
+    @property
+    def rewrite_required(self) -> bool:
+        return any(table.strategy in (REWRITE, ONLINE) for table in self.tables)
+
+
+def _estimate_tables(
+    connection: "Connection", table_to_strategy: Dict[str, str], rewrite_bytes_per_second: float
+) -> Tuple[TableCostEstimate, ...]:
+    table_sizes = get_table_sizes(connection, table_to_strategy)
+
+    tables = []
+    for table_name_with_schema, strategy in table_to_strategy.items():
+        if table_name_with_schema not in table_sizes:
+            tables.append(
+                TableCostEstimate(
+                    table_name_with_schema=table_name_with_schema,
+                    strategy=CREATED_IN_MIGRATION,
+                    pages=0,
+                    tuples=0.0,
+                    total_size=0,
+                    rebuilt_indexes=(),
+                    estimated_seconds=0.0,
+                )
+            )
+            continue
+
+        pages, tuples, total_size, indexes = table_sizes[table_name_with_schema]
+        rebuilt_indexes: Tuple[str, ...] = ()
+        estimated_seconds = 0.0
+
+        if strategy != CATALOG_ONLY:
+            estimated_seconds = total_size / rewrite_bytes_per_second
+        if strategy == REWRITE:
+            # Table rewrite rebuilds all indexes of the table
+            rebuilt_indexes = tuple(indexes)
+
+        tables.append(
+            TableCostEstimate(
+                table_name_with_schema=table_name_with_schema,
+                strategy=strategy,
+                pages=pages,
+                tuples=tuples,
+                total_size=total_size,
+                rebuilt_indexes=rebuilt_indexes,
+                estimated_seconds=estimated_seconds,
+            )
+        )
+    return tuple(tables)
+
+
+def estimate_enum_syncs(
+    connection: "Connection",
+    enum_syncs: Iterable[EnumValuesSync],
+    online: bool = False,
+    old_values: Optional[Dict[Tuple[str, str], List[str]]] = None,
+    rewrite_bytes_per_second: float = DEFAULT_REWRITE_BYTES_PER_SECOND,
+) -> EnumChangeEstimate:
+    """
+    Estimate cost of syncing enums together with op.sync_enum_values or op.sync_multiple_enum_values
+    without executing any DDL.
+    :param online:
+        Whether online sync is used, see OnlineSync
+    :param old_values:
+        Current values of enums by (enum_schema, enum_name), fetched from the database if not passed
+    """
+    enum_syncs = list(enum_syncs)
+    if old_values is None:
+        schema_to_defined_enums = get_defined_enums_by_schema(
+            connection, {enum_sync.enum_schema for enum_sync in enum_syncs}
+        )
+        old_values = {
+            (enum_sync.enum_schema, enum_sync.enum_name): list(
+                schema_to_defined_enums[enum_sync.enum_schema].get(enum_sync.enum_name, ())
+            )
+            for enum_sync in enum_syncs
+        }
+
+    server_version_info = connection.dialect.server_version_info
+    table_to_strategies: DefaultDict[str, Set[str]] = defaultdict(set)
+    for enum_sync in enum_syncs:
+        in_place_change = get_in_place_change(
+            old_values[enum_sync.enum_schema, enum_sync.enum_name],
+            enum_sync.new_values,
+            list(enum_sync.enum_values_to_rename),
+            server_version_info,
+        )
+        strategy = CATALOG_ONLY
+        if in_place_change is None:
+            strategy = ONLINE if online else REWRITE
+
+        for table_reference in get_table_references(connection, enum_sync.enum_schema, enum_sync.affected_columns):
+            table_to_strategies[table_reference.table_name_with_schema].add(strategy)
+
+    table_to_strategy = {
+        # Table is rewritten once for all enums that need it
+        table_name_with_schema: next(
+            (strategy for strategy in (REWRITE, ONLINE) if strategy in strategies), CATALOG_ONLY
+        )
+        for table_name_with_schema, strategies in table_to_strategies.items()
+    }
+
+    return EnumChangeEstimate(
+        enum_names=tuple(f"{enum_sync.enum_schema}.{enum_sync.enum_name}" for enum_sync in enum_syncs),
+        tables=_estimate_tables(connection, table_to_strategy, rewrite_bytes_per_second),
+    )
+
+
+def estimate_enum_value_insertion(
+    connection: "Connection",
+    enum_schema: str,
+    enum_name: str,
+    affected_columns: Iterable[TableReference] = (),
+) -> EnumChangeEstimate:
+    """Estimate cost of op.add_enum_value, it changes only the catalog"""
+    return EnumChangeEstimate(
+        enum_names=(f"{enum_schema}.{enum_name}",),
+        tables=_estimate_tables(
+            connection,
+            {table_reference.table_name_with_schema: CATALOG_ONLY for table_reference in affected_columns},
+            DEFAULT_REWRITE_BYTES_PER_SECOND,
+        ),
+    )
+
+
+def _to_enum_values_sync(op: SyncEnumValuesOp) -> EnumValuesSync:
+    return EnumValuesSync(op.schema, op.name, op.new_values, op.affected_columns)
+
+
+def estimate_upgrade_ops(
+    connection: "Connection",
+    upgrade_ops: UpgradeOps,
+    rewrite_bytes_per_second: float = DEFAULT_REWRITE_BYTES_PER_SECOND,
+) -> List[EnumChangeEstimate]:
+    """
+    Estimate cost of every enum operation of autogenerated upgrade ops without executing any DDL.
+    Can be called from process_revision_directives hook to report cost of a new revision.
+    """
+    estimates = []
+    for op in upgrade_ops.ops:
+        if isinstance(op, SyncEnumValuesOp):
+            sync_ops = [op]
+        elif isinstance(op, SyncMultipleEnumValuesOp):
+            sync_ops = op.ops
+        elif isinstance(op, AddEnumValuesOp):
+            estimates.append(estimate_enum_value_insertion(connection, op.schema, op.name, op.affected_columns))
+            continue
+        else:
+            continue
+
+        estimates.append(
+            estimate_enum_syncs(
+                connection,
+                [_to_enum_values_sync(sync_op) for sync_op in sync_ops],
+                old_values={(sync_op.schema, sync_op.name): list(sync_op.old_values) for sync_op in sync_ops},
+                rewrite_bytes_per_second=rewrite_bytes_per_second,
+            )
+        )
+    return estimates
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} TB"
+
+
+def format_enum_plan(estimates: Iterable[EnumChangeEstimate]) -> str:
+    """
+    Result example:
+    public.order_status
+        "public"."orders": rewrite, 1250 pages, ~100000 rows, 13 MB, rebuilt indexes: orders_pkey, ~0.2s
+    Total estimated duration: ~0.2s
+    """
+    lines = []
+    total_seconds = 0.0
+    for estimate in estimates:
+        lines.append(", ".join(estimate.enum_names))
+        for table in estimate.tables:
+            if table.strategy == CREATED_IN_MIGRATION:
+                lines.append(f"    {table.table_name_with_schema}: {table.strategy}")
+                continue
+            description = (
+                f"    {table.table_name_with_schema}: {table.strategy}, {table.pages} pages, "
+                f"~{table.tuples:.0f} rows, {_format_size(table.total_size)}"
+            )
+            if table.rebuilt_indexes:
+                description += f", rebuilt indexes: {', '.join(table.rebuilt_indexes)}"
+            if table.strategy in (REWRITE, ONLINE):
+                description += f", ~{table.estimated_seconds:.1f}s"
+            lines.append(description)
+        total_seconds += estimate.estimated_seconds
+
+    lines.append(f"Total estimated duration: ~{total_seconds:.1f}s")
+    return "\n".join(lines)
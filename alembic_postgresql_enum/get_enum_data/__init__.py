@@ -4,6 +4,10 @@ from .types import (
     EnumNamesToValues,
     EnumNamesToTableReferences,
     TableReference,
+    EnumValuesSync,
+    EnumDefinition,
+    LockRetry,
+    OnlineSync,
 )
-from .defined_enums import get_defined_enums
-from .declared_enums import get_declared_enums
+from .defined_enums import get_defined_enums, get_defined_enums_by_schema
+from .declared_enums import get_declared_enums, get_declared_enums_by_schema
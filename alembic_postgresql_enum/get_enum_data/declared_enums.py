@@ -1,13 +1,31 @@
 from collections import defaultdict
-from typing import Tuple, Any, Set, Union, List, TYPE_CHECKING, cast, Optional, Callable
+from typing import (
+    Tuple,
+    Any,
+    Set,
+    Union,
+    List,
+    TYPE_CHECKING,
+    cast,
+    Optional,
+    Callable,
+    Dict,
+    Mapping,
+    FrozenSet,
+    Iterator,
+)
 
 import sqlalchemy
 from alembic.operations.ops import UpgradeOps
 from sqlalchemy import MetaData
 from sqlalchemy.dialects import postgresql
 
-from alembic_postgresql_enum.get_enum_data.get_default_from_alembic_ops import get_just_added_defaults
-from alembic_postgresql_enum.sql_commands.column_default import get_column_default
+from alembic_postgresql_enum.get_enum_data.get_default_from_alembic_ops import (
+    get_just_added_defaults,
+    ColumnLocation,
+)
+from alembic_postgresql_enum.sql_commands.column_default import get_column_defaults
+from alembic_postgresql_enum.tracing import trace_span
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
@@ -46,48 +64,102 @@ def column_type_is_enum(column_type: Any) -> bool:
     return False
 
 
-def get_declared_enums(
+def _get_metadata_list(metadata: Union[MetaData, List[MetaData]]) -> List[MetaData]:
+    if isinstance(metadata, list):
+        return metadata
+    return [metadata]
+
+
+class TableReferencesWithLazyDefaults(Mapping[str, FrozenSet[TableReference]]):
+    """
+    Mapping of enum names to table references that resolves server defaults of the referencing columns
+    only when references of the enum are requested.
+    Defaults are needed only for enums which values are changed, so usually they are never fetched
+    """
+
+    def __init__(
+        self,
+        enum_columns: Dict[str, Set[Tuple[ColumnLocation, ColumnType]]],
+        connection: "Connection",
+        just_added_defaults: Dict[ColumnLocation, Optional[str]],
+    ):
+        self._enum_columns = enum_columns
+        self._connection = connection
+        self._just_added_defaults = just_added_defaults
+        self._table_references: Dict[str, FrozenSet[TableReference]] = {}
+
+    def _resolve_table_references(self, enum_name: str) -> FrozenSet[TableReference]:
+        columns = self._enum_columns[enum_name]
+        with trace_span("get_column_defaults", enum_name=enum_name):
+            column_defaults = get_column_defaults(
+                self._connection,
+                (
+                    (table_schema, table_name)
+                    for (table_schema, table_name, column_name), _ in columns
+                    if (table_schema, table_name, column_name) not in self._just_added_defaults
+                ),
+            )
+
+        table_references = set()
+        for column_location, column_type_wrapper in columns:
+            if column_location in self._just_added_defaults:
+                column_default = self._just_added_defaults[column_location]
+            else:
+                column_default = column_defaults.get(column_location)
+
+            table_schema, table_name, column_name = column_location
+            table_references.add(
+                TableReference(
+                    table_schema=table_schema,
+                    table_name=table_name,
+                    column_name=column_name,
+                    column_type=column_type_wrapper,
+                    existing_server_default=column_default,
+                )
+            )
+        return frozenset(table_references)
+
+    def __getitem__(self, enum_name: str) -> FrozenSet[TableReference]:
+        if enum_name not in self._table_references:
+            self._table_references[enum_name] = self._resolve_table_references(enum_name)
+        return self._table_references[enum_name]
+
+    def __contains__(self, enum_name: object) -> bool:
+        return enum_name in self._enum_columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._enum_columns)
+
+    def __len__(self) -> int:
+        return len(self._enum_columns)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._enum_columns)!r})"
+
+
+def get_declared_enums_by_schema(
     metadata: Union[MetaData, List[MetaData]],
-    schema: str,
     default_schema: str,
     connection: "Connection",
     upgrade_ops: Optional[UpgradeOps] = None,
     include_name: Callable[[str], bool] = lambda _: True,
-) -> DeclaredEnumValues:
+    just_added_defaults: Optional[Dict[ColumnLocation, Optional[str]]] = None,
+) -> Dict[str, DeclaredEnumValues]:
     """
-    Return a dict mapping SQLAlchemy declared enumeration types to the set of their values
-    with columns where enums are used.
-    :param metadata:
-        SqlAlchemy schema
-    :param str schema:
-        Schema name (e.g. "public").
-    :param default_schema:
-        Default schema name, likely will be "public"
-    :param connection:
-        Database connection
-    :param upgrade_ops:
-        Upgrade operations in current migration
-    :returns DeclaredEnumValues:
-        enum_values: {
-            "my_enum": tuple(["a", "b", "c"]),
-        },
-        enum_table_references: {
-            "my_enum": {
-                EnumToTable(table_name="my_table", column_name="my_column")
-            }
-        }
+    Walk SqlAlchemy schema once and return declared enums grouped by schema of the enum.
+    See get_declared_enums for the description of parameters and returned values.
+    :param just_added_defaults:
+        Server defaults added in current migration, collected from upgrade_ops if not passed
     """
-    enum_name_to_values = dict()
-    enum_name_to_table_references: defaultdict[str, Set[TableReference]] = defaultdict(set)
-
-    just_added_defaults = get_just_added_defaults(upgrade_ops, default_schema)
+    schema_to_enum_values: defaultdict[str, Dict[str, Tuple[str, ...]]] = defaultdict(dict)
+    schema_to_enum_columns: defaultdict[str, defaultdict[str, Set[Tuple[ColumnLocation, ColumnType]]]] = defaultdict(
+        lambda: defaultdict(set)
+    )
 
-    if isinstance(metadata, list):
-        metadata_list = metadata
-    else:
-        metadata_list = [metadata]
+    if just_added_defaults is None:
+        just_added_defaults = get_just_added_defaults(upgrade_ops, default_schema)
 
-    for metadata in metadata_list:
+    for metadata in _get_metadata_list(metadata):
         for table in metadata.tables.values():
             for column in table.columns:
                 column_type = column.type
@@ -105,30 +177,62 @@ def get_declared_enums(
                     continue
 
                 column_type_schema = column_type.schema or default_schema  # type: ignore[attr-defined]
-                if column_type_schema != schema:
-                    continue
+                enum_name_to_values = schema_to_enum_values[column_type_schema]
 
                 if column_type.name not in enum_name_to_values:  # type: ignore[attr-defined]
                     enum_name_to_values[column_type.name] = get_enum_values(cast(sqlalchemy.Enum, column_type))  # type: ignore[attr-defined]
 
                 table_schema = table.schema or default_schema
-                column_default = get_column_default(connection, table_schema, table.name, column.name)
-                if (table_schema, table.name, column.name) in just_added_defaults:
-                    column_default = just_added_defaults[table_schema, table.name, column.name]
-                enum_name_to_table_references[column_type.name].add(  # type: ignore[attr-defined]
-                    TableReference(
-                        table_schema=table_schema,
-                        table_name=table.name,
-                        column_name=column.name,
-                        column_type=column_type_wrapper,
-                        existing_server_default=column_default,
-                    )
+                schema_to_enum_columns[column_type_schema][column_type.name].add(  # type: ignore[attr-defined]
+                    ((table_schema, table.name, column.name), column_type_wrapper)
                 )
 
-    return DeclaredEnumValues(
-        enum_values=enum_name_to_values,
-        enum_table_references={
-            enum_name: frozenset(table_references)
-            for enum_name, table_references in enum_name_to_table_references.items()
+    return {
+        schema: DeclaredEnumValues(
+            enum_values=enum_name_to_values,
+            enum_table_references=TableReferencesWithLazyDefaults(
+                schema_to_enum_columns[schema],
+                connection,
+                just_added_defaults,
+            ),
+        )
+        for schema, enum_name_to_values in schema_to_enum_values.items()
+    }
+
+
+def get_declared_enums(
+    metadata: Union[MetaData, List[MetaData]],
+    schema: str,
+    default_schema: str,
+    connection: "Connection",
+    upgrade_ops: Optional[UpgradeOps] = None,
+    include_name: Callable[[str], bool] = lambda _: True,
+) -> DeclaredEnumValues:
+    """
+    Return a dict mapping SQLAlchemy declared enumeration types to the set of their values
+    with columns where enums are used.
+    :param metadata:
+        SqlAlchemy schema
+    :param str schema:
+        Schema name (e.g. "public").
+    :param default_schema:
+        Default schema name, likely will be "public"
+    :param connection:
+        Database connection
+    :param upgrade_ops:
+        Upgrade operations in current migration
+    :returns DeclaredEnumValues:
+        enum_values: {
+            "my_enum": tuple(["a", "b", "c"]),
         },
+        enum_table_references: {
+            "my_enum": {
+                EnumToTable(table_name="my_table", column_name="my_column")
+            }
+        }
+        Server defaults of table references are fetched only when references of the enum are accessed
+    """
+    declarations_by_schema = get_declared_enums_by_schema(
+        metadata, default_schema, connection, upgrade_ops, include_name
     )
+    return declarations_by_schema.get(schema, DeclaredEnumValues(enum_values={}, enum_table_references={}))
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Dict, Iterable
 
 from alembic_postgresql_enum.get_enum_data.types import EnumNamesToValues
 from alembic_postgresql_enum.sql_commands.enum_type import get_all_enums
@@ -7,20 +7,21 @@ if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
 
 
-def _extract_enum_name(enum_name: str, schema: str) -> str:
-    # Remove schema
-    schema_prefix = f"{schema}."
-    quoted_schema_prefix = f'"{schema}".'
-    if enum_name.startswith(schema_prefix):
-        enum_name = enum_name[len(schema_prefix) :]
-    elif enum_name.startswith(quoted_schema_prefix):
-        enum_name = enum_name[len(quoted_schema_prefix) :]
+def get_defined_enums_by_schema(
+    connection: "Connection", schemas: Iterable[str], include_name: Callable[[str], bool] = lambda _: True
+) -> Dict[str, EnumNamesToValues]:
+    """
+    Return PostgreSQL defined enumeration types of all given schemas grouped by schema,
+    fetched in a single query.
+    See get_defined_enums for the description of parameters and returned values.
+    """
+    schema_to_enum_values: Dict[str, EnumNamesToValues] = {schema: {} for schema in schemas}
 
-    # Remove quotes
-    if enum_name.startswith('"') and enum_name.startswith('"'):
-        enum_name = enum_name[1:-1]
+    for schema, enum_name, values in get_all_enums(connection, list(schema_to_enum_values)):
+        if include_name(enum_name):
+            schema_to_enum_values[schema][enum_name] = tuple(values)
 
-    return enum_name
+    return schema_to_enum_values
 
 
 def get_defined_enums(
@@ -40,11 +41,4 @@ def get_defined_enums(
             "my_enum": tuple(["a", "b", "c"]),
         }
     """
-
-    return {
-        enum_name: tuple(values)
-        for enum_name, values in (
-            (_extract_enum_name(name, schema), values) for name, values in get_all_enums(connection, schema)
-        )
-        if include_name(enum_name)
-    }
+    return get_defined_enums_by_schema(connection, [schema], include_name)[schema]
@@ -1,6 +1,13 @@
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Iterator
 
-from alembic.operations.ops import UpgradeOps, ModifyTableOps, AddColumnOp, AlterColumnOp, CreateTableOp
+from alembic.operations.ops import (
+    UpgradeOps,
+    ModifyTableOps,
+    AddColumnOp,
+    AlterColumnOp,
+    CreateTableOp,
+    MigrateOperation,
+)
 from sqlalchemy import Column
 
 SchemaName = str
@@ -33,6 +40,34 @@ def _get_default_from_column(column: Column, default_schema: str) -> Tuple[Colum
     )
 
 
+def get_just_added_defaults_of_operation(
+    operation: MigrateOperation, default_schema: str
+) -> Iterator[Tuple[ColumnLocation, Optional[str]]]:
+    """
+    Get server defaults that will be added by a single operation,
+    columns of ModifyTableOps are handled by passing its operations one by one
+    """
+    if isinstance(operation, AddColumnOp):
+        try:
+            yield _get_default_from_add_column_op(operation, default_schema)
+        except AttributeError:
+            pass
+
+    elif isinstance(operation, AlterColumnOp):
+        try:
+            yield _get_default_from_alter_column_op(operation, default_schema)
+        except AttributeError:
+            pass
+
+    elif isinstance(operation, CreateTableOp):
+        for column in operation.columns:
+            if isinstance(column, Column):
+                try:
+                    yield _get_default_from_column(column, default_schema)
+                except AttributeError:
+                    pass
+
+
 def get_just_added_defaults(
     upgrade_ops: Optional[UpgradeOps], default_schema: str
 ) -> Dict[ColumnLocation, Optional[str]]:
@@ -40,34 +75,13 @@ def get_just_added_defaults(
     if upgrade_ops is None:
         return {}
 
-    new_server_defaults = {}
+    new_server_defaults: Dict[ColumnLocation, Optional[str]] = {}
 
     for operations_group in upgrade_ops.ops:
         if isinstance(operations_group, ModifyTableOps):
             for operation in operations_group.ops:
-                if isinstance(operation, AddColumnOp):
-                    try:
-                        column_location, column_new_default = _get_default_from_add_column_op(operation, default_schema)
-                        new_server_defaults[column_location] = column_new_default
-                    except AttributeError:
-                        pass
-
-                elif isinstance(operation, AlterColumnOp):
-                    try:
-                        column_location, column_new_default = _get_default_from_alter_column_op(
-                            operation, default_schema
-                        )
-                        new_server_defaults[column_location] = column_new_default
-                    except AttributeError:
-                        pass
-
-        elif isinstance(operations_group, CreateTableOp):
-            for column in operations_group.columns:
-                if isinstance(column, Column):
-                    try:
-                        column_location, column_new_default = _get_default_from_column(column, default_schema)
-                        new_server_defaults[column_location] = column_new_default
-                    except AttributeError:
-                        pass
+                new_server_defaults.update(get_just_added_defaults_of_operation(operation, default_schema))
+        else:
+            new_server_defaults.update(get_just_added_defaults_of_operation(operations_group, default_schema))
 
     return new_server_defaults
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum as PyEnum
-from typing import Tuple, Dict, FrozenSet, Optional
+from typing import Tuple, Dict, FrozenSet, Optional, Mapping, List, Sequence, Union, Any
 
 from sqlalchemy import Enum, ARRAY
 
@@ -55,8 +55,72 @@ class TableReference:
         return f'"{self.column_name}"'
 
 
+@dataclass
+class EnumValuesSync:
+    """Values of a single enum to be synced within op.sync_multiple_enum_values"""
+
+    enum_schema: str
+    enum_name: str
+    new_values: List[str]
+    affected_columns: Sequence[Union[TableReference, Tuple[Any, ...]]]
+    enum_values_to_rename: Sequence[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class EnumDefinition:
+    """Enum to be created or dropped within op.create_enums or op.drop_enums, enum without schema uses search_path"""
+
+    enum_name: str
+    enum_values: List[str]
+    enum_schema: Optional[str] = None
+
+    @property
+    def enum_type_name(self) -> str:
+        if self.enum_schema:
+            return f'"{self.enum_schema}"."{self.enum_name}"'
+        return f'"{self.enum_name}"'
+
+
+@dataclass(frozen=True)
+class LockRetry:
+    """
+    Lock acquisition settings of table alterations done by op.sync_enum_values
+    :param lock_timeout:
+        PostgreSQL lock_timeout of every attempt, e.g. "2s" or "500ms"
+    :param retries:
+        How many times the alteration of a table is retried after failing to acquire the lock
+    :param backoff:
+        Seconds to wait before the first retry, doubled on every next retry
+    :param deadline:
+        Seconds after the first attempt for a table when no more retries are made
+    """
+
+    lock_timeout: str = "2s"
+    retries: int = 5
+    backoff: float = 1.0
+    deadline: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class OnlineSync:
+    """
+    Settings of online sync done by op.sync_enum_values, where affected tables are not rewritten under a lock.
+    Every affected column gets a shadow column of the new type that is kept in sync by a trigger,
+    is backfilled in batches ordered by primary key and replaces the original column in a short transaction.
+    Replaced columns keep their comment, statistics target and privileges, but are moved to the end of the table
+    and have no planner statistics until the next ANALYZE.
+    :param batch_size:
+        Number of rows updated by a single backfill statement
+    :param batch_sleep:
+        Seconds to wait between backfill batches
+    """
+
+    batch_size: int = 1000
+    batch_sleep: float = 0.0
+
+
 EnumNamesToValues = Dict[str, Tuple[str, ...]]
-EnumNamesToTableReferences = Dict[str, FrozenSet[TableReference]]
+EnumNamesToTableReferences = Mapping[str, FrozenSet[TableReference]]
 
 
 @dataclass
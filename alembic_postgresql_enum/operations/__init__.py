@@ -1,3 +1,7 @@
 from .create_enum import CreateEnumOp
 from .drop_enum import DropEnumOp
 from .sync_enum_values import SyncEnumValuesOp
+from .add_enum_value import AddEnumValuesOp
+from .sync_multiple_enum_values import SyncMultipleEnumValuesOp
+from .create_multiple_enums import CreateMultipleEnumsOp
+from .drop_multiple_enums import DropMultipleEnumsOp
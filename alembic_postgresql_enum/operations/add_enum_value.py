@@ -0,0 +1,168 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Tuple, Any, Optional, Iterable, TYPE_CHECKING
+
+import alembic.autogenerate
+import alembic.operations.base
+import alembic.operations.ops
+from alembic.autogenerate.api import AutogenContext
+
+from alembic_postgresql_enum.configuration import get_configuration
+from alembic_postgresql_enum.connection import get_connection
+from alembic_postgresql_enum.get_enum_data import TableReference
+from alembic_postgresql_enum.sql_commands.enum_type import add_type_value
+from alembic_postgresql_enum.statement_events import observe_statements, statement_step
+from alembic_postgresql_enum.tracing import trace_span
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+@dataclass(frozen=True)
+class EnumValueInsertion:
+    value: str
+    before: Optional[str] = None
+    after: Optional[str] = None
+
+
+def add_enum_values(
+    operations,
+    connection: "Connection",
+    enum_schema: str,
+    enum_name: str,
+    insertions: Iterable[EnumValueInsertion],
+):
+    enum_type_name = f'"{enum_schema}"."{enum_name}"'
+    enum_names = (f"{enum_schema}.{enum_name}",)
+
+    server_version_info = connection.dialect.server_version_info
+    if server_version_info is not None and server_version_info < (12,):
+        # Before PostgreSQL 12 ALTER TYPE ... ADD VALUE can not be executed inside a transaction block
+        with operations.get_context().autocommit_block():
+            for insertion in insertions:
+                with statement_step("add_value", enum_names):
+                    add_type_value(
+                        operations.get_bind(), enum_type_name, insertion.value, insertion.before, insertion.after
+                    )
+        return
+
+    for insertion in insertions:
+        with statement_step("add_value", enum_names):
+            add_type_value(connection, enum_type_name, insertion.value, insertion.before, insertion.after)
+
+
+@alembic.operations.base.Operations.register_operation("add_enum_value")
+class AddEnumValuesOp(alembic.operations.ops.MigrateOperation):
+    """Insertion of new values into existing enum that does not require rewriting of affected tables"""
+
+    operation_name = "add_enum_values"
+
+    def __init__(
+        self,
+        schema: str,
+        name: str,
+        old_values: List[str],
+        new_values: List[str],
+        affected_columns: List[TableReference],
+        insertions: List[EnumValueInsertion],
+    ):
+        self.schema = schema
+        self.name = name
+        self.old_values = old_values
+        self.new_values = new_values
+        self.affected_columns = affected_columns
+        self.insertions = insertions
+
+    def reverse(self):
+        """
+        See MigrateOperation.reverse().
+        Values can not be removed from enum in place, so enum is synced back
+        """
+        from .sync_enum_values import SyncEnumValuesOp
+
+        return SyncEnumValuesOp(
+            self.schema,
+            self.name,
+            old_values=self.new_values,
+            new_values=self.old_values,
+            affected_columns=self.affected_columns,
+        )
+
+    @classmethod
+    def add_enum_value(
+        cls,
+        operations,
+        enum_schema: str,
+        enum_name: str,
+        value: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ):
+        """
+        Add new value to enum with ALTER TYPE ... ADD VALUE
+        :param operations:
+            ...
+        :param str enum_schema:
+            Schema name.
+        :param enum_name:
+            Enumeration type name.
+        :param value:
+            Value to add.
+        :param before:
+            Existing value that new value is placed before.
+        :param after:
+            Existing value that new value is placed after.
+            If neither before nor after is passed new value is placed last.
+        """
+        config = get_configuration()
+
+        if operations.migration_context.dialect.name != "postgresql" and not config.force_dialect_support:
+            log.warning(
+                f"This library only supports postgresql, but you are using {operations.migration_context.dialect.name}, skipping"
+            )
+            return
+
+        with get_connection(operations) as connection, observe_statements(
+            connection, config.statement_listeners, config.log_statement_timings
+        ), trace_span("add_enum_value", connection, enum_names=(f"{enum_schema}.{enum_name}",)):
+            add_enum_values(
+                operations,
+                connection,
+                enum_schema,
+                enum_name,
+                [EnumValueInsertion(value, before=before, after=after)],
+            )
+
+    def to_diff_tuple(self) -> Tuple[Any, ...]:
+        return (
+            self.operation_name,
+            self.old_values,
+            self.new_values,
+            self.affected_columns,
+        )
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(AddEnumValuesOp)
+def render_add_enum_values_op(autogen_context: AutogenContext, op: AddEnumValuesOp):
+    config = get_configuration()
+
+    rendered_insertions = []
+    for insertion in op.insertions:
+        position = ""
+        if insertion.before is not None:
+            position = f"    before={insertion.before!r},\n"
+        elif insertion.after is not None:
+            position = f"    after={insertion.after!r},\n"
+
+        rendered_insertions.append(
+            f"op.add_enum_value({'  # type: ignore[attr-defined]' if config.add_type_ignore else ''}\n"
+            f"    enum_schema={op.schema!r},\n"
+            f"    enum_name={op.name!r},\n"
+            f"    value={insertion.value!r},\n"
+            f"{position}"
+            f")"
+        )
+
+    return "\n".join(rendered_insertions)
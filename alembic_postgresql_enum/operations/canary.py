@@ -0,0 +1,62 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+
+from alembic_postgresql_enum.sql_commands.canary import CANARY_TABLE_NAME, create_canary_table
+from alembic_postgresql_enum.sql_commands.enum_type import alter_table_columns
+from alembic_postgresql_enum.sql_commands.table_size import get_table_size
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+@dataclass(frozen=True)
+class CanaryResult:
+    table_name_with_schema: str
+    sample_size: int
+    table_size: int
+    sample_seconds: float
+
+    @property
+    def projected_seconds(self) -> Optional[float]:
+        if not self.sample_size:
+            return None
+        return self.sample_seconds * self.table_size / self.sample_size
+
+
+def run_rewrite_canary(
+    connection: "Connection", table_name_with_schema: str, alter_column_clauses: List[str], sample_percent: float
+) -> CanaryResult:
+    """
+    Run the same ALTER TABLE on a sampled copy of the table and extrapolate its duration to the whole table.
+    Sampled copy is created in a savepoint that is rolled back afterwards.
+    """
+    with connection.begin_nested() as savepoint:
+        create_canary_table(connection, table_name_with_schema, sample_percent)
+        _, _, sample_size = get_table_size(connection, CANARY_TABLE_NAME)
+
+        started_at = time.monotonic()
+        alter_table_columns(connection, CANARY_TABLE_NAME, alter_column_clauses)
+        sample_seconds = time.monotonic() - started_at
+
+        savepoint.rollback()
+
+    _, _, table_size = get_table_size(connection, table_name_with_schema)
+    result = CanaryResult(
+        table_name_with_schema=table_name_with_schema,
+        sample_size=sample_size,
+        table_size=table_size,
+        sample_seconds=sample_seconds,
+    )
+    log.info(
+        "Canary rewrite of %s sample (%d bytes) took %.3fs, projected rewrite time of the whole table (%d bytes) is %s",
+        table_name_with_schema,
+        sample_size,
+        sample_seconds,
+        table_size,
+        "unknown" if result.projected_seconds is None else f"{result.projected_seconds:.1f}s",
+    )
+    return result
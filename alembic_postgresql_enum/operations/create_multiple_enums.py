@@ -0,0 +1,94 @@
+from typing import List, Tuple, Any, Iterable
+
+import alembic.autogenerate
+import alembic.operations.base
+import alembic.operations.ops
+from alembic.autogenerate.api import AutogenContext
+
+from alembic_postgresql_enum.configuration import get_configuration
+from alembic_postgresql_enum.connection import get_connection
+from alembic_postgresql_enum.get_enum_data import EnumDefinition
+from alembic_postgresql_enum.sql_commands.enum_type import create_types
+from alembic_postgresql_enum.statement_events import observe_statements, statement_step
+from alembic_postgresql_enum.tracing import trace_span
+from .create_enum import CreateEnumOp
+from .enum_lifecycle_base import EnumLifecycleOp
+
+
+def get_enum_definitions(autogen_context: AutogenContext, ops: Iterable[EnumLifecycleOp]) -> List[EnumDefinition]:
+    """Enums of ops, enums of the default schema are left without schema as sa.Enum(...).create does"""
+    assert autogen_context.dialect is not None
+    return [
+        EnumDefinition(
+            enum_name=op.name,
+            enum_values=list(op.enum_values),
+            enum_schema=None if op.schema == autogen_context.dialect.default_schema_name else op.schema,
+        )
+        for op in ops
+    ]
+
+
+def render_enum_definitions(
+    autogen_context: AutogenContext, operation_name: str, ops: Iterable[EnumLifecycleOp]
+) -> str:
+    config = get_configuration()
+    autogen_context.imports.add("from alembic_postgresql_enum import EnumDefinition")
+
+    rendered_enums = ""
+    for enum in get_enum_definitions(autogen_context, ops):
+        schema = "" if enum.enum_schema is None else f"enum_schema={enum.enum_schema!r}, "
+        rendered_enums += (
+            f"        EnumDefinition({schema}enum_name={enum.enum_name!r}, enum_values={enum.enum_values!r}),\n"
+        )
+
+    return (
+        f"op.{operation_name}({'  # type: ignore[attr-defined]' if config.add_type_ignore else ''}\n"
+        f"    enums=[\n"
+        f"{rendered_enums}"
+        f"    ],\n"
+        f")"
+    )
+
+
+@alembic.operations.base.Operations.register_operation("create_enums")
+class CreateMultipleEnumsOp(alembic.operations.ops.MigrateOperation):
+    """Creation of several enums at once, all CREATE TYPE statements are sent in a single round trip"""
+
+    operation_name = "create_multiple_enums"
+
+    def __init__(self, ops: List[CreateEnumOp]):
+        self.ops = ops
+
+    def reverse(self):
+        """
+        See MigrateOperation.reverse().
+        """
+        from .drop_multiple_enums import DropMultipleEnumsOp
+
+        return DropMultipleEnumsOp([op.reverse() for op in reversed(self.ops)])
+
+    @classmethod
+    def create_enums(cls, operations, enums: Iterable[EnumDefinition]):
+        """
+        Create several enums with a single multi-statement submission
+        :param operations:
+            ...
+        :param enums:
+            Iterable of EnumDefinition, enum without schema is created in the first schema of search_path
+        """
+        config = get_configuration()
+        enums = list(enums)
+        enum_names = tuple(enum.enum_type_name for enum in enums)
+
+        with get_connection(operations) as connection, observe_statements(
+            connection, config.statement_listeners, config.log_statement_timings
+        ), trace_span("create_enums", connection, enum_names=enum_names), statement_step("create_type", enum_names):
+            create_types(connection, [(enum.enum_type_name, enum.enum_values) for enum in enums])
+
+    def to_diff_tuple(self) -> Tuple[Any, ...]:
+        return self.operation_name, [op.to_diff_tuple() for op in self.ops]
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(CreateMultipleEnumsOp)
+def render_create_multiple_enums_op(autogen_context: AutogenContext, op: CreateMultipleEnumsOp):
+    return render_enum_definitions(autogen_context, "create_enums", op.ops)
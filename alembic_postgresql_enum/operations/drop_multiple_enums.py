@@ -0,0 +1,59 @@
+from typing import List, Tuple, Any, Iterable
+
+import alembic.autogenerate
+import alembic.operations.base
+import alembic.operations.ops
+from alembic.autogenerate.api import AutogenContext
+
+from alembic_postgresql_enum.configuration import get_configuration
+from alembic_postgresql_enum.connection import get_connection
+from alembic_postgresql_enum.get_enum_data import EnumDefinition
+from alembic_postgresql_enum.sql_commands.enum_type import drop_types
+from alembic_postgresql_enum.statement_events import observe_statements, statement_step
+from alembic_postgresql_enum.tracing import trace_span
+from .create_multiple_enums import render_enum_definitions
+from .drop_enum import DropEnumOp
+
+
+@alembic.operations.base.Operations.register_operation("drop_enums")
+class DropMultipleEnumsOp(alembic.operations.ops.MigrateOperation):
+    """Deletion of several enums at once with a single DROP TYPE statement"""
+
+    operation_name = "drop_multiple_enums"
+
+    def __init__(self, ops: List[DropEnumOp]):
+        self.ops = ops
+
+    def reverse(self):
+        """
+        See MigrateOperation.reverse().
+        """
+        from .create_multiple_enums import CreateMultipleEnumsOp
+
+        return CreateMultipleEnumsOp([op.reverse() for op in reversed(self.ops)])
+
+    @classmethod
+    def drop_enums(cls, operations, enums: Iterable[EnumDefinition]):
+        """
+        Drop several enums with a single DROP TYPE statement
+        :param operations:
+            ...
+        :param enums:
+            Iterable of EnumDefinition, enum without schema is looked up with search_path.
+            Values are not used, they are kept to create enums back on downgrade
+        """
+        config = get_configuration()
+        enum_names = tuple(enum.enum_type_name for enum in enums)
+
+        with get_connection(operations) as connection, observe_statements(
+            connection, config.statement_listeners, config.log_statement_timings
+        ), trace_span("drop_enums", connection, enum_names=enum_names), statement_step("drop_type", enum_names):
+            drop_types(connection, enum_names)
+
+    def to_diff_tuple(self) -> Tuple[Any, ...]:
+        return self.operation_name, [op.to_diff_tuple() for op in self.ops]
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(DropMultipleEnumsOp)
+def render_drop_multiple_enums_op(autogen_context: AutogenContext, op: DropMultipleEnumsOp):
+    return render_enum_definitions(autogen_context, "drop_enums", op.ops)
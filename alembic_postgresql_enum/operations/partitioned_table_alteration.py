@@ -0,0 +1,68 @@
+import logging
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from alembic_postgresql_enum.sql_commands.enum_type import alter_table_columns
+from alembic_postgresql_enum.sql_commands.partitions import (
+    get_partitions,
+    detach_partition,
+    attach_partition,
+    drop_constraint,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+PARTITION_CONSTRAINT_NAME = "enum_sync_partition_check"
+
+
+def alter_table_columns_by_partition(
+    connection: "Connection",
+    table_name_with_schema: str,
+    alter_column_clauses: List[str],
+    partition_constraint: Optional[str] = None,
+):
+    """
+    Apply column alterations to every partition of a partitioned table separately.
+    Type of inherited column can not be altered in a single partition, so every partition is detached,
+    altered and attached back after the partitioned table itself is altered.
+    All steps run in the transaction of the connection, so locks of every partition are held until it is committed.
+    Tables that are not partitioned are altered with a single ALTER TABLE.
+    :param partition_constraint:
+        Partition constraint of the table if it is a detached partition. It is added as a check constraint
+        while the table is rewritten, so attaching the partition back does not need to scan it again
+    """
+    partitions = get_partitions(connection, table_name_with_schema)
+
+    if partition_constraint is not None and not partitions:
+        alter_column_clauses = alter_column_clauses + [
+            f'ADD CONSTRAINT "{PARTITION_CONSTRAINT_NAME}" CHECK ({partition_constraint})'
+        ]
+
+    if not partitions:
+        alter_table_columns(connection, table_name_with_schema, alter_column_clauses)
+        return
+
+    for partition_number, partition in enumerate(partitions, start=1):
+        started_at = time.monotonic()
+        detach_partition(connection, table_name_with_schema, partition.table_name_with_schema)
+        alter_table_columns_by_partition(
+            connection, partition.table_name_with_schema, alter_column_clauses, partition.constraint
+        )
+        log.info(
+            "Altered partition %s (%d/%d) in %.2fs",
+            partition.table_name_with_schema,
+            partition_number,
+            len(partitions),
+            time.monotonic() - started_at,
+        )
+
+    # Detached partitions are not altered again with the partitioned table
+    alter_table_columns(connection, table_name_with_schema, alter_column_clauses)
+
+    for partition in partitions:
+        attach_partition(connection, table_name_with_schema, partition.table_name_with_schema, partition.bound)
+        if partition.constraint is not None and not partition.is_partitioned:
+            drop_constraint(connection, partition.table_name_with_schema, PARTITION_CONSTRAINT_NAME)
@@ -1,5 +1,6 @@
 import logging
-from typing import List, Tuple, Any, Iterable, TYPE_CHECKING
+from collections import defaultdict
+from typing import List, Tuple, Any, Iterable, TYPE_CHECKING, Dict, DefaultDict, Optional, cast
 
 import alembic.autogenerate
 import alembic.operations.base
@@ -10,8 +11,9 @@ from sqlalchemy.exc import DataError
 from alembic_postgresql_enum.configuration import get_configuration
 from alembic_postgresql_enum.get_enum_data.types import Unspecified
 from alembic_postgresql_enum.sql_commands.column_default import (
-    get_column_default,
-    drop_default,
+    get_column_defaults,
+    get_drop_default_clause,
+    get_set_default_clause,
     set_default,
     rename_default_if_required,
 )
@@ -20,21 +22,136 @@ from alembic_postgresql_enum.sql_commands.comparison_operators import (
     drop_comparison_operators,
 )
 from alembic_postgresql_enum.sql_commands.enum_type import (
-    cast_old_enum_type_to_new,
+    get_cast_old_enum_type_to_new_clause,
+    alter_table_columns,
     drop_type,
     rename_type,
     create_type,
+    rename_type_value,
 )
+from alembic_postgresql_enum.sql_commands.enum_values_usage import count_enum_values_usage
+from alembic_postgresql_enum.sql_commands.lock_timeout import execute_with_lock_retry
+from alembic_postgresql_enum.sql_commands.statement_batch import StatementBatch
+from alembic_postgresql_enum.statement_events import observe_statements, statement_step
+from alembic_postgresql_enum.tracing import trace_span
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
 
 from alembic_postgresql_enum.connection import get_connection
-from alembic_postgresql_enum.get_enum_data import TableReference, ColumnType
+from alembic_postgresql_enum.operations.add_enum_value import add_enum_values, EnumValueInsertion
+from alembic_postgresql_enum.operations.sync_enum_values_online import sync_enum_values_online
+from alembic_postgresql_enum.operations.partitioned_table_alteration import alter_table_columns_by_partition
+from alembic_postgresql_enum.operations.canary import run_rewrite_canary
+from alembic_postgresql_enum.get_enum_data import (
+    TableReference,
+    ColumnType,
+    EnumValuesSync,
+    LockRetry,
+    OnlineSync,
+    get_defined_enums,
+    get_defined_enums_by_schema,
+)
 
 
 log = logging.getLogger(f"alembic.{__name__}")
 
+OLD_VALUE_REFERENCED_MESSAGE = (
+    "New enum values can not be set due to some row containing reference to old enum value.\n"
+    "Please consider using enum_values_to_rename parameter or "
+    "updating/deleting these row before calling sync_enum_values."
+)
+
+
+def _is_rename_only(old_values: List[str], new_values: List[str], enum_values_to_rename: List[Tuple[str, str]]) -> bool:
+    """Check that new values can be obtained from old ones by renaming values one by one"""
+    renames = dict(enum_values_to_rename)
+    if len(renames) != len(enum_values_to_rename) or not set(renames).issubset(old_values):
+        return False
+
+    if set(renames.values()).intersection(old_values):
+        # Chained renames and swaps can not be done value by value
+        return False
+
+    return [renames.get(value, value) for value in old_values] == list(new_values)
+
+
+def get_in_place_change(
+    old_values: List[str],
+    new_values: List[str],
+    enum_values_to_rename: List[Tuple[str, str]],
+    server_version_info: Optional[Tuple[int, ...]],
+) -> Optional[str]:
+    """
+    Return "add" if new values are only appended and add_new_values_in_place configuration flag is turned on,
+    "rename" if values are only renamed, or None if affected tables have to be rewritten
+    """
+    if get_configuration().add_new_values_in_place and not enum_values_to_rename:
+        if old_values and list(new_values[: len(old_values)]) == list(old_values):
+            return "add"
+
+    # ALTER TYPE ... RENAME VALUE is available since PostgreSQL 10
+    if (
+        enum_values_to_rename
+        and (server_version_info is None or server_version_info >= (10,))
+        and _is_rename_only(old_values, new_values, enum_values_to_rename)
+    ):
+        return "rename"
+
+    return None
+
+
+def get_table_references(
+    connection: "Connection", enum_schema: str, affected_columns: Iterable[Any]
+) -> List[TableReference]:
+    """
+    Convert affected columns of op.sync_enum_values to TableReferences.
+    Old style (table_name, column_name[, column_type]) tuples are looked up in the enum schema,
+    their server defaults are fetched in a single query.
+    """
+    affected_columns = list(affected_columns)
+    column_defaults = get_column_defaults(
+        connection,
+        {
+            (enum_schema, affected_column[0])
+            for affected_column in affected_columns
+            if isinstance(affected_column, tuple)
+        },
+    )
+
+    table_references = []
+    for affected_column in affected_columns:
+        if isinstance(affected_column, tuple):  # This is considered old style
+            table_name = affected_column[0]
+            column_name = affected_column[1]
+            if len(affected_column) > 2:
+                column_type = affected_column[2]
+            else:
+                column_type = ColumnType.COMMON
+            table_references.append(
+                TableReference(
+                    table_name,
+                    column_name,
+                    table_schema=enum_schema,
+                    column_type=column_type,
+                    existing_server_default=column_defaults.get((enum_schema, table_name, column_name)),
+                )
+            )
+
+        elif isinstance(affected_column, TableReference):
+            if affected_column.table_schema is Unspecified:
+                affected_column = TableReference(
+                    table_name=affected_column.table_name,
+                    column_name=affected_column.column_name,
+                    table_schema=enum_schema,  # For backwards compatibility
+                    column_type=affected_column.column_type,
+                    existing_server_default=affected_column.existing_server_default,
+                )
+            table_references.append(affected_column)
+        else:
+            raise ValueError("Affected columns must contain tuples or TableReferences")
+    return table_references
+
 
 @alembic.operations.base.Operations.register_operation("sync_enum_values")
 class SyncEnumValuesOp(alembic.operations.ops.MigrateOperation):
@@ -68,47 +185,356 @@ class SyncEnumValuesOp(alembic.operations.ops.MigrateOperation):
 
     @classmethod
     def _set_enum_values(
+        cls,
+        connection: "Connection",
+        enum_syncs: List[EnumValuesSync],
+        lock_retry: Optional[LockRetry] = None,
+    ):
+        """
+        Recreate enum types and cast affected columns to them.
+        Columns of all enums are grouped by table, so each table is altered by a single ALTER TABLE statement
+        and rewritten only once.
+        :param enum_syncs:
+            Syncs with affected_columns converted to TableReferences
+        :param lock_retry:
+            Lock acquisition settings, alteration of each table is retried separately
+        """
+        config = get_configuration()
+        if config.validate_removed_values:
+            cls._validate_removed_values(connection, enum_syncs)
+
+        alter_table = alter_table_columns
+        if config.alter_partitions_separately:
+            alter_table = alter_table_columns_by_partition
+
+        # Statements that do not need results are sent in a single round trip if single_round_trip_sync is turned on
+        batch = StatementBatch(connection) if config.single_round_trip_sync else None
+        executor = cast("Connection", connection if batch is None else batch)
+
+        if config.canary_sample_percent is not None:
+            cls._run_canaries(connection, enum_syncs, config.canary_sample_percent)
+
+        temporary_enum_names = {}
+        for enum_sync in enum_syncs:
+            enum_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+            enum_names = (f"{enum_sync.enum_schema}.{enum_sync.enum_name}",)
+            temporary_enum_name = f"{enum_sync.enum_name}_old"
+            temporary_enum_names[enum_sync.enum_schema, enum_sync.enum_name] = temporary_enum_name
+
+            with statement_step("rename_type", enum_names):
+                rename_type(executor, enum_type_name, temporary_enum_name)
+            with statement_step("create_type", enum_names):
+                create_type(executor, enum_type_name, enum_sync.new_values)
+
+            with statement_step("create_comparison_operators", enum_names):
+                create_comparison_operators(
+                    executor,
+                    enum_sync.enum_schema,
+                    enum_sync.enum_name,
+                    temporary_enum_name,
+                    list(enum_sync.enum_values_to_rename),
+                )
+
+        table_to_alter_column_clauses = cls._get_alter_column_clauses(enum_syncs)
+        table_to_enum_names = cls._get_enum_names_by_table(enum_syncs)
+        try:
+            for table_name_with_schema, alter_column_clauses in table_to_alter_column_clauses.items():
+                if batch is not None and not config.alter_partitions_separately:
+                    with statement_step(
+                        "alter_table", table_to_enum_names[table_name_with_schema], table_name_with_schema
+                    ):
+                        alter_table(batch, table_name_with_schema, alter_column_clauses)
+                    continue
+
+                if batch is not None:
+                    # Partitions are looked up before they are altered
+                    batch.flush()
+
+                def alter():
+                    with statement_step(
+                        "alter_table", table_to_enum_names[table_name_with_schema], table_name_with_schema
+                    ):
+                        alter_table(connection, table_name_with_schema, alter_column_clauses)
+
+                execute_with_lock_retry(connection, lock_retry, alter, table_name_with_schema)
+
+            for enum_sync in enum_syncs:
+                enum_names = (f"{enum_sync.enum_schema}.{enum_sync.enum_name}",)
+                temporary_enum_name = temporary_enum_names[enum_sync.enum_schema, enum_sync.enum_name]
+                with statement_step("drop_comparison_operators", enum_names):
+                    drop_comparison_operators(executor, enum_sync.enum_schema, enum_sync.enum_name, temporary_enum_name)
+                temporary_enum_type_name = f'"{enum_sync.enum_schema}"."{temporary_enum_name}"'
+                with statement_step("drop_type", enum_names):
+                    drop_type(executor, temporary_enum_type_name)
+
+            if batch is not None:
+                # Lock of every affected table is acquired within the same submission, so it is retried as a whole
+                with statement_step(
+                    "single_round_trip", [f"{enum_sync.enum_schema}.{enum_sync.enum_name}" for enum_sync in enum_syncs]
+                ):
+                    execute_with_lock_retry(
+                        connection, lock_retry, batch.flush, ", ".join(table_to_alter_column_clauses)
+                    )
+        except DataError as error:
+            raise ValueError(OLD_VALUE_REFERENCED_MESSAGE) from error
+
+    @classmethod
+    def _run_canaries(cls, connection: "Connection", enum_syncs: List[EnumValuesSync], sample_percent: float):
+        """
+        Run canary rewrite of every affected table before enum types are renamed.
+        New types are created in a savepoint that is rolled back after the canaries,
+        so the types are not locked while sampled tables are rewritten.
+        """
+        table_to_enum_names = cls._get_enum_names_by_table(enum_syncs)
+        try:
+            with connection.begin_nested() as savepoint:
+                with statement_step(
+                    "canary", [f"{enum_sync.enum_schema}.{enum_sync.enum_name}" for enum_sync in enum_syncs]
+                ):
+                    for enum_sync in enum_syncs:
+                        enum_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+                        temporary_enum_name = f"{enum_sync.enum_name}_old"
+                        rename_type(connection, enum_type_name, temporary_enum_name)
+                        create_type(connection, enum_type_name, enum_sync.new_values)
+                        create_comparison_operators(
+                            connection,
+                            enum_sync.enum_schema,
+                            enum_sync.enum_name,
+                            temporary_enum_name,
+                            list(enum_sync.enum_values_to_rename),
+                        )
+
+                for table_name_with_schema, alter_column_clauses in cls._get_alter_column_clauses(enum_syncs).items():
+                    with statement_step("canary", table_to_enum_names[table_name_with_schema], table_name_with_schema):
+                        run_rewrite_canary(connection, table_name_with_schema, alter_column_clauses, sample_percent)
+
+                savepoint.rollback()
+        except DataError as error:
+            raise ValueError(OLD_VALUE_REFERENCED_MESSAGE) from error
+
+    @staticmethod
+    def _get_enum_names_by_table(enum_syncs: List[EnumValuesSync]) -> Dict[str, List[str]]:
+        """Result example: {'"public"."orders"': ["public.order_status", "public.payment_status"]}"""
+        table_to_enum_names: DefaultDict[str, List[str]] = defaultdict(list)
+        for enum_sync in enum_syncs:
+            enum_name = f"{enum_sync.enum_schema}.{enum_sync.enum_name}"
+            for table_reference in cast(List[TableReference], enum_sync.affected_columns):
+                if enum_name not in table_to_enum_names[table_reference.table_name_with_schema]:
+                    table_to_enum_names[table_reference.table_name_with_schema].append(enum_name)
+        return table_to_enum_names
+
+    @staticmethod
+    def _validate_removed_values(connection: "Connection", enum_syncs: List[EnumValuesSync]):
+        """
+        Check that removed enum values are not referenced by any affected column before any table is rewritten.
+        Each affected table is scanned by a single query.
+        """
+        schema_to_defined_enums = get_defined_enums_by_schema(
+            connection, {enum_sync.enum_schema for enum_sync in enum_syncs}
+        )
+
+        table_to_column_checks: DefaultDict[str, List[Tuple[TableReference, str, List[str]]]] = defaultdict(list)
+        for enum_sync in enum_syncs:
+            old_values = schema_to_defined_enums[enum_sync.enum_schema].get(enum_sync.enum_name, ())
+            renamed_values = {old_value for old_value, _ in enum_sync.enum_values_to_rename}
+            removed_values = [
+                value for value in old_values if value not in enum_sync.new_values and value not in renamed_values
+            ]
+            if not removed_values:
+                continue
+
+            enum_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+            for table_reference in cast(List[TableReference], enum_sync.affected_columns):
+                table_to_column_checks[table_reference.table_name_with_schema].append(
+                    (table_reference, enum_type_name, removed_values)
+                )
+
+        table_to_enum_names = SyncEnumValuesOp._get_enum_names_by_table(enum_syncs)
+        usages = []
+        for table_name_with_schema, column_checks in table_to_column_checks.items():
+            with statement_step(
+                "validate_removed_values", table_to_enum_names[table_name_with_schema], table_name_with_schema
+            ):
+                value_counts = count_enum_values_usage(connection, table_name_with_schema, column_checks)
+            usages.extend(
+                f'{table_name_with_schema}."{column_name}" contains {value!r} in {count} row(s)'
+                for (column_name, value), count in value_counts.items()
+                if count
+            )
+
+        if usages:
+            raise ValueError(
+                "New enum values can not be set because removed values are still used:\n"
+                + "\n".join(usages)
+                + "\nPlease consider using enum_values_to_rename parameter or "
+                "updating/deleting these rows before calling sync_enum_values."
+            )
+
+    @staticmethod
+    def _get_alter_column_clauses(enum_syncs: List[EnumValuesSync]) -> Dict[str, List[str]]:
+        """Plan ALTER COLUMN clauses of all affected columns grouped by table"""
+        drop_default_clauses: DefaultDict[str, List[str]] = defaultdict(list)
+        cast_clauses: DefaultDict[str, List[str]] = defaultdict(list)
+        set_default_clauses: DefaultDict[str, List[str]] = defaultdict(list)
+
+        for enum_sync in enum_syncs:
+            enum_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+            enum_values_to_rename = list(enum_sync.enum_values_to_rename)
+
+            for table_reference in cast(List[TableReference], enum_sync.affected_columns):
+                table_name_with_schema = table_reference.table_name_with_schema
+                column_default = table_reference.existing_server_default
+
+                if column_default is not None:
+                    drop_default_clauses[table_name_with_schema].append(get_drop_default_clause(table_reference))
+
+                cast_clauses[table_name_with_schema].append(
+                    get_cast_old_enum_type_to_new_clause(table_reference, enum_type_name, enum_values_to_rename)
+                )
+
+                if column_default is not None:
+                    column_default = rename_default_if_required(
+                        enum_sync.enum_schema, column_default, enum_sync.enum_name, enum_values_to_rename
+                    )
+                    set_default_clauses[table_name_with_schema].append(
+                        get_set_default_clause(table_reference, column_default)
+                    )
+
+        return {
+            table_name_with_schema: (
+                drop_default_clauses[table_name_with_schema]
+                + table_cast_clauses
+                + set_default_clauses[table_name_with_schema]
+            )
+            for table_name_with_schema, table_cast_clauses in cast_clauses.items()
+        }
+
+    @classmethod
+    def _rename_enum_values(
         cls,
         connection: "Connection",
         enum_schema: str,
         enum_name: str,
-        new_values: List[str],
         affected_columns: List[TableReference],
         enum_values_to_rename: List[Tuple[str, str]],
+        lock_retry: Optional[LockRetry] = None,
     ):
         enum_type_name = f'"{enum_schema}"."{enum_name}"'
-        temporary_enum_name = f"{enum_name}_old"
-
-        rename_type(connection, enum_type_name, temporary_enum_name)
-        create_type(connection, enum_type_name, new_values)
+        enum_names = (f"{enum_schema}.{enum_name}",)
 
-        create_comparison_operators(connection, enum_schema, enum_name, temporary_enum_name, enum_values_to_rename)
+        for old_value, new_value in enum_values_to_rename:
+            with statement_step("rename_value", enum_names):
+                rename_type_value(connection, enum_type_name, old_value, new_value)
 
         for table_reference in affected_columns:
             column_default = table_reference.existing_server_default
 
-            if column_default is not None:
-                drop_default(connection, table_reference)
-
-            try:
-                cast_old_enum_type_to_new(connection, table_reference, enum_type_name, enum_values_to_rename)
-            except DataError as error:
-                raise ValueError(
-                    f"""New enum values can not be set due to some row containing reference to old enum value.
-                        Please consider using enum_values_to_rename parameter or "
-                    f"updating/deleting these row before calling sync_enum_values."""
-                ) from error
-
             if column_default is not None:
                 column_default = rename_default_if_required(
                     enum_schema, column_default, enum_name, enum_values_to_rename
                 )
 
-                set_default(connection, table_reference, column_default)
+                def set_renamed_default():
+                    with statement_step("set_default", enum_names, table_reference.table_name_with_schema):
+                        set_default(connection, table_reference, column_default)
+
+                execute_with_lock_retry(
+                    connection, lock_retry, set_renamed_default, table_reference.table_name_with_schema
+                )
+
+    @classmethod
+    def _sync_enums_values(
+        cls,
+        operations,
+        enum_syncs: Iterable[EnumValuesSync],
+        lock_retry: Optional[LockRetry] = None,
+        online: Optional[OnlineSync] = None,
+    ):
+        config = get_configuration()
+        if lock_retry is None:
+            lock_retry = config.lock_retry
+
+        if operations.migration_context.dialect.name != "postgresql" and not config.force_dialect_support:
+            log.warning(
+                f"This library only supports postgresql, but you are using {operations.migration_context.dialect.name}, skipping"
+            )
+            return
+
+        enum_syncs = list(enum_syncs)
+        with get_connection(operations) as connection, observe_statements(
+            connection, config.statement_listeners, config.log_statement_timings
+        ), trace_span(
+            "sync_enum_values",
+            connection,
+            enum_names=tuple(f"{enum_sync.enum_schema}.{enum_sync.enum_name}" for enum_sync in enum_syncs),
+        ) as span:
+            server_version_info = connection.dialect.server_version_info
+            enum_syncs_to_rewrite = []
+            table_names = set()
+
+            for enum_sync in enum_syncs:
+                enum_schema = enum_sync.enum_schema
+                enum_name = enum_sync.enum_name
+                new_values = enum_sync.new_values
+                enum_values_to_rename = list(enum_sync.enum_values_to_rename)
+
+                old_values = []
+                if enum_values_to_rename or config.add_new_values_in_place:
+                    old_values = list(get_defined_enums(connection, enum_schema).get(enum_name, ()))
+
+                in_place_change = get_in_place_change(
+                    old_values, new_values, enum_values_to_rename, server_version_info
+                )
+
+                if in_place_change == "add":
+                    values_to_add = list(new_values[len(old_values) :])
+                    log.info("Values %r are appended to %r in place", values_to_add, enum_name)
+                    add_enum_values(
+                        operations,
+                        connection,
+                        enum_schema,
+                        enum_name,
+                        [EnumValueInsertion(value) for value in values_to_add],
+                    )
+                    continue
+
+                with trace_span("get_table_references", enum_name=f"{enum_schema}.{enum_name}"):
+                    table_references = get_table_references(connection, enum_schema, enum_sync.affected_columns)
+                table_names.update(table_reference.table_name_with_schema for table_reference in table_references)
+
+                if in_place_change == "rename":
+                    log.info("Values of %r are renamed in place", enum_name)
+                    cls._rename_enum_values(
+                        connection, enum_schema, enum_name, table_references, enum_values_to_rename, lock_retry
+                    )
+                    continue
+
+                enum_syncs_to_rewrite.append(
+                    EnumValuesSync(
+                        enum_schema,
+                        enum_name,
+                        new_values,
+                        table_references,
+                        enum_values_to_rename,
+                    )
+                )
+
+            if span is not None:
+                span.set_attribute("table_count", len(table_names))
 
-        drop_comparison_operators(connection, enum_schema, enum_name, temporary_enum_name)
-        temporary_enum_type_name = f'"{enum_schema}"."{temporary_enum_name}"'
-        drop_type(connection, temporary_enum_type_name)
+            if enum_syncs_to_rewrite and online is not None:
+                if config.validate_removed_values:
+                    cls._validate_removed_values(connection, enum_syncs_to_rewrite)
+                with statement_step(
+                    "online_sync",
+                    [f"{enum_sync.enum_schema}.{enum_sync.enum_name}" for enum_sync in enum_syncs_to_rewrite],
+                ):
+                    try:
+                        sync_enum_values_online(operations, enum_syncs_to_rewrite, online, lock_retry)
+                    except DataError as error:
+                        raise ValueError(OLD_VALUE_REFERENCED_MESSAGE) from error
+            elif enum_syncs_to_rewrite:
+                cls._set_enum_values(connection, enum_syncs_to_rewrite, lock_retry)
 
     @classmethod
     def sync_enum_values(
@@ -119,6 +545,8 @@ class SyncEnumValuesOp(alembic.operations.ops.MigrateOperation):
         new_values: List[str],
         affected_columns: List[Tuple[str, str]],
         enum_values_to_rename: Iterable[Tuple[str, str]] = tuple(),
+        lock_retry: Optional[LockRetry] = None,
+        online: Optional[OnlineSync] = None,
     ):
         """
         Replace enum values with `new_values`
@@ -141,55 +569,42 @@ class SyncEnumValuesOp(alembic.operations.ops.MigrateOperation):
                 ('tree', 'three') # to fix typo
             ]
             If there was server default with old_name it will be renamed accordingly
-        """
+        :param lock_retry:
+            Lock acquisition settings of affected tables alterations, lock_retry from configuration is used by default.
+            Alteration of each table is done with given lock_timeout and retried separately
+        :param online:
+            Settings of online sync. If given, affected columns are replaced by shadow columns of the new type
+            that are backfilled in batches, so tables are not rewritten under ACCESS EXCLUSIVE lock.
+            Migration transaction is committed before online sync starts.
+            Replaced columns are moved to the end of the table, see OnlineSync
 
-        config = get_configuration()
+        If add_new_values_in_place configuration flag is turned on and new values are only appended
+        to existing ones, they are added with ALTER TYPE ... ADD VALUE without rewriting affected tables
 
-        if operations.migration_context.dialect.name != "postgresql" and not config.force_dialect_support:
-            log.warning(
-                f"This library only supports postgresql, but you are using {operations.migration_context.dialect.name}, skipping"
-            )
-            return
+        If new values differ from existing ones only by enum_values_to_rename,
+        values are renamed with ALTER TYPE ... RENAME VALUE without rewriting affected tables
 
-        enum_values_to_rename = list(enum_values_to_rename)
-
-        with get_connection(operations) as connection:
-            table_references = []
-            for affected_column in affected_columns:
-                if isinstance(affected_column, tuple):  # This is considered old style
-                    table_name = affected_column[0]
-                    column_name = affected_column[1]
-                    if len(affected_column) > 2:
-                        column_type = affected_column[2]
-                    else:
-                        column_type = ColumnType.COMMON
-                    column_default = get_column_default(connection, enum_schema, table_name, column_name)
-                    table_references.append(
-                        TableReference(
-                            table_name,
-                            column_name,
-                            table_schema=enum_schema,
-                            column_type=column_type,
-                            existing_server_default=column_default,
-                        )
-                    )
+        If validate_removed_values configuration flag is turned on, affected columns are checked
+        for removed values before any table is rewritten
 
-                elif isinstance(affected_column, TableReference):
-                    if affected_column.table_schema is Unspecified:
-                        affected_column = TableReference(
-                            table_name=affected_column.table_name,
-                            column_name=affected_column.column_name,
-                            table_schema=enum_schema,  # For backwards compatibility
-                            column_type=affected_column.column_type,
-                            existing_server_default=affected_column.existing_server_default,
-                        )
-                    table_references.append(affected_column)
-                else:
-                    raise ValueError("Affected columns must contain tuples or TableReferences")
+        If alter_partitions_separately configuration flag is turned on, partitions of affected partitioned tables
+        are detached, rewritten one by one and attached back
 
-            cls._set_enum_values(
-                connection, enum_schema, enum_name, new_values, table_references, enum_values_to_rename
-            )
+        If canary_sample_percent configuration option is set, the same ALTER TABLE is first run on a sampled copy
+        of every affected table before enum types are renamed, and projected rewrite time of the whole table is logged
+
+        If single_round_trip_sync configuration flag is turned on, statements recreating the enum and altering affected
+        tables are sent to the server in a single multi-statement submission
+
+        Executed statements are passed to statement_listeners from configuration,
+        if log_statement_timings configuration flag is turned on, their timing summary is logged per enum
+        """
+        cls._sync_enums_values(
+            operations,
+            [EnumValuesSync(enum_schema, enum_name, new_values, affected_columns, list(enum_values_to_rename))],
+            lock_retry,
+            online,
+        )
 
     def to_diff_tuple(self) -> Tuple[Any, ...]:
         return (
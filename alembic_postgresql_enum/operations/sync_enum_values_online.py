@@ -0,0 +1,327 @@
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, List, Optional, DefaultDict, Dict, Tuple, Set, cast
+
+from alembic_postgresql_enum.get_enum_data import EnumValuesSync, LockRetry, OnlineSync, TableReference, ColumnType
+from alembic_postgresql_enum.sql_commands.column_default import (
+    get_set_default_clause,
+    rename_default_if_required,
+)
+from alembic_postgresql_enum.sql_commands.comparison_operators import (
+    create_comparison_operators,
+    drop_comparison_operators,
+)
+from alembic_postgresql_enum.sql_commands.enum_type import (
+    get_cast_old_enum_value_to_new_expression,
+    alter_table_columns,
+    create_type,
+    drop_type,
+    rename_type,
+)
+from alembic_postgresql_enum.sql_commands.lock_timeout import execute_with_lock_retry
+from alembic_postgresql_enum.sql_commands.online_sync import (
+    transaction_block,
+    get_primary_key_columns,
+    get_column_dependents,
+    is_column_not_null,
+    create_sync_trigger,
+    drop_sync_trigger,
+    backfill_batch,
+    copy_column_settings,
+    rename_column,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+ColumnSync = Tuple[TableReference, EnumValuesSync]
+
+
+def _get_shadow_column_name(table_reference: TableReference) -> str:
+    return f"{table_reference.column_name}__enum_new"
+
+
+def _get_not_null_constraint_name(table_reference: TableReference) -> str:
+    return f"{table_reference.column_name}__enum_new_not_null"
+
+
+def _get_sync_function_name(table_reference: TableReference) -> str:
+    prefix = f'"{table_reference.table_schema}".' if table_reference.table_schema else ""
+    return f'{prefix}"{table_reference.table_name}__enum_sync"'
+
+
+def _get_cast_expression(column_expression: str, table_reference: TableReference, enum_sync: EnumValuesSync) -> str:
+    return get_cast_old_enum_value_to_new_expression(
+        column_expression,
+        table_reference.column_type,
+        f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"',
+        list(enum_sync.enum_values_to_rename),
+    )
+
+
+def _prepare_table(
+    connection: "Connection", table_name_with_schema: str, column_syncs: List[ColumnSync], not_null_columns: Set[str]
+):
+    """Add shadow columns of the new enum types and the trigger that keeps them in sync"""
+    alter_column_clauses = []
+    trigger_assignments = []
+    for table_reference, enum_sync in column_syncs:
+        shadow_column_name = _get_shadow_column_name(table_reference)
+        column_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+        if table_reference.column_type == ColumnType.ARRAY:
+            column_type_name += "[]"
+
+        alter_column_clauses.append(f'ADD COLUMN "{shadow_column_name}" {column_type_name}')
+        if table_reference.column_name in not_null_columns:
+            alter_column_clauses.append(
+                f'ADD CONSTRAINT "{_get_not_null_constraint_name(table_reference)}" '
+                f'CHECK ("{shadow_column_name}" IS NOT NULL) NOT VALID'
+            )
+        trigger_assignments.append(
+            f'NEW."{shadow_column_name}" := '
+            f"{_get_cast_expression(f'NEW.{table_reference.escaped_column_name}', table_reference, enum_sync)}"
+        )
+
+    alter_table_columns(connection, table_name_with_schema, alter_column_clauses)
+    create_sync_trigger(
+        connection, table_name_with_schema, _get_sync_function_name(column_syncs[0][0]), trigger_assignments
+    )
+
+
+def _backfill_table(
+    connection: "Connection",
+    table_name_with_schema: str,
+    column_syncs: List[ColumnSync],
+    primary_key_columns: List[str],
+    online_sync: OnlineSync,
+):
+    assignments = [
+        f'"{_get_shadow_column_name(table_reference)}" = '
+        f"{_get_cast_expression(table_reference.escaped_column_name, table_reference, enum_sync)}"
+        for table_reference, enum_sync in column_syncs
+    ]
+
+    last_key = None
+    batches_count = 0
+    while True:
+        # In autocommit mode every batch is committed separately, so row locks are held only during the batch
+        last_key = backfill_batch(
+            connection, table_name_with_schema, primary_key_columns, assignments, last_key, online_sync.batch_size
+        )
+        if last_key is None:
+            break
+        batches_count += 1
+        if online_sync.batch_sleep:
+            time.sleep(online_sync.batch_sleep)
+
+    log.info("Backfilled %s in %d batch(es)", table_name_with_schema, batches_count)
+
+
+def _swap_columns(
+    connection: "Connection", table_name_with_schema: str, column_syncs: List[ColumnSync], not_null_columns: Set[str]
+):
+    """
+    Replace original columns by backfilled shadow columns.
+    Comments, statistics targets and column privileges are copied,
+    but replaced columns are moved to the end of the table and their statistics are gathered only by the next ANALYZE.
+    """
+    drop_sync_trigger(connection, table_name_with_schema, _get_sync_function_name(column_syncs[0][0]))
+    for table_reference, _ in column_syncs:
+        copy_column_settings(
+            connection, table_name_with_schema, table_reference.column_name, _get_shadow_column_name(table_reference)
+        )
+    alter_table_columns(
+        connection,
+        table_name_with_schema,
+        [f"DROP COLUMN {table_reference.escaped_column_name}" for table_reference, _ in column_syncs],
+    )
+
+    alter_column_clauses = []
+    for table_reference, enum_sync in column_syncs:
+        rename_column(
+            connection, table_name_with_schema, _get_shadow_column_name(table_reference), table_reference.column_name
+        )
+
+        column_default = table_reference.existing_server_default
+        if column_default is not None:
+            column_default = rename_default_if_required(
+                enum_sync.enum_schema, column_default, enum_sync.enum_name, list(enum_sync.enum_values_to_rename)
+            )
+            alter_column_clauses.append(get_set_default_clause(table_reference, column_default))
+
+        if table_reference.column_name in not_null_columns:
+            # Validated check constraint lets SET NOT NULL skip the table scan since PostgreSQL 12
+            alter_column_clauses.append(f"ALTER COLUMN {table_reference.escaped_column_name} SET NOT NULL")
+            alter_column_clauses.append(f'DROP CONSTRAINT "{_get_not_null_constraint_name(table_reference)}"')
+
+    if alter_column_clauses:
+        alter_table_columns(connection, table_name_with_schema, alter_column_clauses)
+
+
+def _undo_prepare_table(connection: "Connection", table_name_with_schema: str, column_syncs: List[ColumnSync]):
+    """Drop the sync trigger and shadow columns, check constraints of shadow columns are dropped with them"""
+    drop_sync_trigger(connection, table_name_with_schema, _get_sync_function_name(column_syncs[0][0]))
+    alter_table_columns(
+        connection,
+        table_name_with_schema,
+        [f'DROP COLUMN "{_get_shadow_column_name(table_reference)}"' for table_reference, _ in column_syncs],
+    )
+
+
+def _undo_sync(
+    connection: "Connection",
+    enum_syncs: List[EnumValuesSync],
+    prepared_table_to_column_syncs: Dict[str, List[ColumnSync]],
+    lock_retry: Optional[LockRetry],
+):
+    """Revert committed steps of a failed sync, so original columns and types are left as they were"""
+    for table_name_with_schema, column_syncs in prepared_table_to_column_syncs.items():
+        with transaction_block(connection):
+            execute_with_lock_retry(
+                connection,
+                lock_retry,
+                lambda: _undo_prepare_table(connection, table_name_with_schema, column_syncs),
+                table_name_with_schema,
+            )
+
+    with transaction_block(connection):
+        for enum_sync in enum_syncs:
+            drop_comparison_operators(
+                connection,
+                enum_sync.enum_schema,
+                enum_sync.enum_name,
+                f"{enum_sync.enum_name}_old",
+                both_directions=True,
+            )
+            drop_type(connection, f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"')
+            rename_type(connection, f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}_old"', enum_sync.enum_name)
+
+
+def sync_enum_values_online(
+    operations,
+    enum_syncs: List[EnumValuesSync],
+    online_sync: OnlineSync,
+    lock_retry: Optional[LockRetry] = None,
+):
+    """
+    Sync enum values without rewriting affected tables under ACCESS EXCLUSIVE lock.
+    Each step is committed separately, so the migration transaction is committed before the sync starts.
+    Tables are locked only briefly to add shadow columns and to swap them with the original ones.
+    Columns of all tables are swapped in a single transaction,
+    if any step fails before that, committed steps are reverted.
+    :param enum_syncs:
+        Syncs with affected_columns converted to TableReferences
+    """
+    table_to_column_syncs: DefaultDict[str, List[ColumnSync]] = defaultdict(list)
+    for enum_sync in enum_syncs:
+        for table_reference in cast(List[TableReference], enum_sync.affected_columns):
+            table_to_column_syncs[table_reference.table_name_with_schema].append((table_reference, enum_sync))
+
+    connection = operations.get_bind()
+    table_to_primary_key_columns = {}
+    table_to_not_null_columns = {}
+    for table_name_with_schema, column_syncs in table_to_column_syncs.items():
+        primary_key_columns = get_primary_key_columns(connection, table_name_with_schema)
+        if not primary_key_columns:
+            raise ValueError(f"Table {table_name_with_schema} can not be synced online because it has no primary key")
+        table_to_primary_key_columns[table_name_with_schema] = primary_key_columns
+
+        for table_reference, _ in column_syncs:
+            dependents = get_column_dependents(connection, table_name_with_schema, table_reference.column_name)
+            if dependents:
+                raise ValueError(
+                    f"Column {table_name_with_schema}.{table_reference.escaped_column_name} can not be synced online "
+                    f"because it is used by: {', '.join(dependents)}"
+                )
+
+        table_to_not_null_columns[table_name_with_schema] = {
+            table_reference.column_name
+            for table_reference, _ in column_syncs
+            if is_column_not_null(connection, table_name_with_schema, table_reference.column_name)
+        }
+
+    with operations.get_context().autocommit_block():
+        connection = operations.get_bind()
+
+        with transaction_block(connection):
+            for enum_sync in enum_syncs:
+                enum_type_name = f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}"'
+                rename_type(connection, enum_type_name, f"{enum_sync.enum_name}_old")
+                create_type(connection, enum_type_name, enum_sync.new_values)
+                # Original columns keep the old type until the swap, so they stay comparable with new enum values
+                create_comparison_operators(
+                    connection,
+                    enum_sync.enum_schema,
+                    enum_sync.enum_name,
+                    f"{enum_sync.enum_name}_old",
+                    list(enum_sync.enum_values_to_rename),
+                    both_directions=True,
+                )
+
+        prepared_table_to_column_syncs: Dict[str, List[ColumnSync]] = {}
+        try:
+            for table_name_with_schema, column_syncs in table_to_column_syncs.items():
+                not_null_columns = table_to_not_null_columns[table_name_with_schema]
+
+                with transaction_block(connection):
+                    execute_with_lock_retry(
+                        connection,
+                        lock_retry,
+                        lambda: _prepare_table(connection, table_name_with_schema, column_syncs, not_null_columns),
+                        table_name_with_schema,
+                    )
+                prepared_table_to_column_syncs[table_name_with_schema] = column_syncs
+
+                _backfill_table(
+                    connection,
+                    table_name_with_schema,
+                    column_syncs,
+                    table_to_primary_key_columns[table_name_with_schema],
+                    online_sync,
+                )
+
+                if not_null_columns:
+                    # VALIDATE CONSTRAINT does not block reads and writes
+                    alter_table_columns(
+                        connection,
+                        table_name_with_schema,
+                        [
+                            f'VALIDATE CONSTRAINT "{_get_not_null_constraint_name(table_reference)}"'
+                            for table_reference, _ in column_syncs
+                            if table_reference.column_name in not_null_columns
+                        ],
+                    )
+
+            def swap_all_columns():
+                for table_name_with_schema, column_syncs in table_to_column_syncs.items():
+                    _swap_columns(
+                        connection,
+                        table_name_with_schema,
+                        column_syncs,
+                        table_to_not_null_columns[table_name_with_schema],
+                    )
+
+            # Columns of all tables are swapped in a single transaction, a failed sync can be reverted until it commits
+            with transaction_block(connection):
+                execute_with_lock_retry(connection, lock_retry, swap_all_columns, ", ".join(table_to_column_syncs))
+                for enum_sync in enum_syncs:
+                    drop_comparison_operators(
+                        connection,
+                        enum_sync.enum_schema,
+                        enum_sync.enum_name,
+                        f"{enum_sync.enum_name}_old",
+                        both_directions=True,
+                    )
+                    drop_type(connection, f'"{enum_sync.enum_schema}"."{enum_sync.enum_name}_old"')
+        except BaseException:
+            log.warning("Online sync failed, reverting committed steps")
+            try:
+                _undo_sync(connection, enum_syncs, prepared_table_to_column_syncs, lock_retry)
+            except Exception:
+                log.exception(
+                    "Online sync could not be reverted, shadow columns, sync triggers and _old types are left in place"
+                )
+            raise
@@ -0,0 +1,86 @@
+import logging
+from typing import List, Tuple, Any, Iterable, Optional
+
+import alembic.autogenerate
+import alembic.operations.base
+import alembic.operations.ops
+from alembic.autogenerate.api import AutogenContext
+
+from alembic_postgresql_enum.configuration import get_configuration
+from alembic_postgresql_enum.get_enum_data import EnumValuesSync, LockRetry, OnlineSync
+from .sync_enum_values import SyncEnumValuesOp
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+@alembic.operations.base.Operations.register_operation("sync_multiple_enum_values")
+class SyncMultipleEnumValuesOp(alembic.operations.ops.MigrateOperation):
+    """Sync of several enums that share affected tables, so each table is rewritten once for all of them"""
+
+    operation_name = "change_multiple_enums_variants"
+
+    def __init__(self, ops: List[SyncEnumValuesOp]):
+        self.ops = ops
+
+    def reverse(self):
+        """
+        See MigrateOperation.reverse().
+        """
+        return SyncMultipleEnumValuesOp([op.reverse() for op in reversed(self.ops)])
+
+    @classmethod
+    def sync_multiple_enum_values(
+        cls,
+        operations,
+        enum_syncs: Iterable[EnumValuesSync],
+        lock_retry: Optional[LockRetry] = None,
+        online: Optional[OnlineSync] = None,
+    ):
+        """
+        Replace values of several enums at once.
+        Affected columns of all enums are grouped by table and each table is altered with a single ALTER TABLE
+        :param operations:
+            ...
+        :param enum_syncs:
+            Iterable of EnumValuesSync, see sync_enum_values for the description of their fields
+        :param lock_retry:
+            Lock acquisition settings, see sync_enum_values
+        :param online:
+            Settings of online sync, see sync_enum_values
+        """
+        SyncEnumValuesOp._sync_enums_values(operations, enum_syncs, lock_retry, online)
+
+    def to_diff_tuple(self) -> Tuple[Any, ...]:
+        return self.operation_name, [op.to_diff_tuple() for op in self.ops]
+
+    @property
+    def is_column_type_import_needed(self) -> bool:
+        return any(op.is_column_type_import_needed for op in self.ops)
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(SyncMultipleEnumValuesOp)
+def render_sync_multiple_enum_values_op(autogen_context: AutogenContext, op: SyncMultipleEnumValuesOp):
+    config = get_configuration()
+    if op.is_column_type_import_needed:
+        autogen_context.imports.add("from alembic_postgresql_enum import ColumnType")
+    autogen_context.imports.add("from alembic_postgresql_enum import EnumValuesSync")
+    autogen_context.imports.add("from alembic_postgresql_enum import TableReference")
+
+    rendered_enum_syncs = "".join(
+        f"        EnumValuesSync(\n"
+        f"            enum_schema={sync_op.schema!r},\n"
+        f"            enum_name={sync_op.name!r},\n"
+        f"            new_values={sync_op.new_values!r},\n"
+        f"            affected_columns={sync_op.affected_columns!r},\n"
+        f"            enum_values_to_rename=[],\n"
+        f"        ),\n"
+        for sync_op in op.ops
+    )
+
+    return (
+        f"op.sync_multiple_enum_values({'  # type: ignore[attr-defined]' if config.add_type_ignore else ''}\n"
+        f"    enum_syncs=[\n"
+        f"{rendered_enum_syncs}"
+        f"    ],\n"
+        f")"
+    )
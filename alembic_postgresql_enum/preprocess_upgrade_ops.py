@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, List
+
+from alembic.operations.ops import UpgradeOps, ModifyTableOps, CreateTableOp, AlterColumnOp
+
+from alembic_postgresql_enum.add_create_type_false import add_create_type_false_to_operation
+from alembic_postgresql_enum.add_postgres_using_to_text import add_postgres_using_if_text_to_enum
+from alembic_postgresql_enum.get_enum_data.get_default_from_alembic_ops import (
+    ColumnLocation,
+    get_just_added_defaults_of_operation,
+)
+
+
+@dataclass(frozen=True)
+class PreprocessedUpgradeOps:
+    created_table_schemas: List[Optional[str]]
+    just_added_defaults: Dict[ColumnLocation, Optional[str]]
+
+
+def preprocess_upgrade_ops(upgrade_ops: UpgradeOps, default_schema: str) -> PreprocessedUpgradeOps:
+    """
+    Walk upgrade ops generated by alembic once to
+    add create_type=False to postgresql.ENUM types (see add_create_type_false_to_operation),
+    add postgresql_using to alterations from string to enum (see add_postgres_using_if_text_to_enum),
+    collect schemas of created tables in order of appearance and server defaults added in the migration
+    (see get_just_added_defaults)
+    """
+    created_table_schemas: Dict[Optional[str], None] = {}
+    just_added_defaults: Dict[ColumnLocation, Optional[str]] = {}
+
+    for operations_group in upgrade_ops.ops:
+        if isinstance(operations_group, CreateTableOp):
+            created_table_schemas[operations_group.schema] = None
+
+        operations = operations_group.ops if isinstance(operations_group, ModifyTableOps) else [operations_group]
+        for operation in operations:
+            add_create_type_false_to_operation(operation)
+            if isinstance(operation, AlterColumnOp):
+                add_postgres_using_if_text_to_enum(operation)
+            just_added_defaults.update(get_just_added_defaults_of_operation(operation, default_schema))
+
+    return PreprocessedUpgradeOps(list(created_table_schemas), just_added_defaults)
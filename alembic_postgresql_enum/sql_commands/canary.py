@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+CANARY_TABLE_NAME = '"pg_temp"."enum_sync_canary"'
+
+
+def create_canary_table(connection: "Connection", table_name_with_schema: str, sample_percent: float):
+    """Copy sample of the table with the same column types, defaults and indexes into a temporary table"""
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        CREATE TEMPORARY TABLE enum_sync_canary (LIKE {table_name_with_schema} INCLUDING DEFAULTS INCLUDING INDEXES)
+    """
+        )
+    )
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {CANARY_TABLE_NAME}
+        SELECT * FROM {table_name_with_schema} TABLESAMPLE SYSTEM (:sample_percent)
+    """
+        ),
+        dict(sample_percent=sample_percent),
+    )
@@ -1,8 +1,13 @@
 import re
-from typing import TYPE_CHECKING, Union, List, Tuple
+from typing import TYPE_CHECKING, Union, List, Tuple, Iterable, Dict
 
 import sqlalchemy
 
+from alembic_postgresql_enum.get_enum_data.get_default_from_alembic_ops import (
+    ColumnLocation,
+    SchemaName,
+    TableName,
+)
 from alembic_postgresql_enum.get_enum_data.types import TableReference
 
 if TYPE_CHECKING:
@@ -28,16 +33,52 @@ def get_column_default(
     return default_value
 
 
-def drop_default(
-    connection: "Connection",
-    table_reference: TableReference,
-):
-    connection.execute(
-        sqlalchemy.text(
-            f"""ALTER TABLE {table_reference.table_name_with_schema}
-             ALTER COLUMN {table_reference.escaped_column_name} DROP DEFAULT"""
-        )
+def get_column_defaults(
+    connection: "Connection", tables: Iterable[Tuple[SchemaName, TableName]]
+) -> Dict[ColumnLocation, str]:
+    """
+    Get server defaults of all columns of given tables in a single query
+    Result example: {("public", "orders", "status"): "'active'::order_status"}
+    """
+    tables = set(tables)
+    if not tables:
+        return {}
+
+    sql = """
+        SELECT
+            n.nspname,
+            c.relname,
+            a.attname,
+            pg_catalog.pg_get_expr(d.adbin, d.adrelid)
+        FROM pg_catalog.pg_attrdef d
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+        JOIN pg_catalog.pg_class c ON c.oid = d.adrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE
+            n.nspname = ANY(:schemas)
+            AND c.relname = ANY(:tables)
+            AND NOT a.attisdropped
+    """
+    result = connection.execute(
+        sqlalchemy.text(sql),
+        dict(
+            schemas=sorted({table_schema for table_schema, _ in tables}),
+            tables=sorted({table_name for _, table_name in tables}),
+        ),
     )
+    return {
+        (table_schema, table_name, column_name): column_default
+        for table_schema, table_name, column_name, column_default in result
+        if (table_schema, table_name) in tables
+    }
+
+
+def get_drop_default_clause(table_reference: TableReference) -> str:
+    return f"ALTER COLUMN {table_reference.escaped_column_name} DROP DEFAULT"
+
+
+def get_set_default_clause(table_reference: TableReference, default_value: str) -> str:
+    return f"ALTER COLUMN {table_reference.escaped_column_name} SET DEFAULT {default_value}"
 
 
 def set_default(
@@ -48,7 +89,7 @@ def set_default(
     connection.execute(
         sqlalchemy.text(
             f"""ALTER TABLE {table_reference.table_name_with_schema}
-            ALTER COLUMN {table_reference.escaped_column_name} SET DEFAULT {default_value}"""
+            {get_set_default_clause(table_reference, default_value)}"""
         )
     )
 
@@ -3,16 +3,25 @@ from typing import Tuple, List
 
 import sqlalchemy
 
+from alembic_postgresql_enum.sql_commands.enum_type import get_enum_value_literal
+
 if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
 
 OPERATORS_TO_CREATE = (("!=", "new_old_not_equals"), ("=", "new_old_equals"))
+# Operators with the old enum on the left side, for columns that still have the old type while they are synced online
+REVERSED_OPERATORS_TO_CREATE = (("!=", "old_new_not_equals"), ("=", "old_new_equals"))
 
 
 def _get_escaped_enum_type_name(enum_schema: str, enum_name: str):
     return f'"{enum_schema}"."{enum_name}"'
 
 
+def _get_arguments(new_enum_type_name: str, old_enum_type_name: str, old_enum_first: bool) -> List[str]:
+    arguments = [f"new_enum_val {new_enum_type_name}", f"old_enum_val {old_enum_type_name}"]
+    return arguments[::-1] if old_enum_first else arguments
+
+
 def _create_comparison_operator(
     connection: "Connection",
     new_enum_type_name: str,
@@ -20,18 +29,18 @@ def _create_comparison_operator(
     enum_values_to_rename: List[Tuple[str, str]],
     operator: str,
     comparison_function_name: str,
+    old_enum_first: bool = False,
 ):
+    arguments = ", ".join(_get_arguments(new_enum_type_name, old_enum_type_name, old_enum_first))
     if enum_values_to_rename:
         connection.execute(
             sqlalchemy.text(
                 f"""
-            CREATE FUNCTION {comparison_function_name}(
-                new_enum_val {new_enum_type_name}, old_enum_val {old_enum_type_name}
-            )
+            CREATE FUNCTION {comparison_function_name}({arguments})
             RETURNS boolean AS $$
                 SELECT new_enum_val::text {operator} CASE
                     {' '.join(
-            f"WHEN old_enum_val::text = '{old_value}' THEN '{new_value}'"
+            f"WHEN old_enum_val::text = {get_enum_value_literal(old_value)} THEN {get_enum_value_literal(new_value)}"
             for old_value, new_value in enum_values_to_rename)}
 
                     ELSE old_enum_val::text
@@ -44,21 +53,22 @@ def _create_comparison_operator(
         connection.execute(
             sqlalchemy.text(
                 f"""
-            CREATE FUNCTION {comparison_function_name}(
-                new_enum_val {new_enum_type_name}, old_enum_val {old_enum_type_name}
-            )
+            CREATE FUNCTION {comparison_function_name}({arguments})
             RETURNS boolean AS $$
                 SELECT new_enum_val::text {operator} old_enum_val::text;
             $$ LANGUAGE SQL IMMUTABLE
         """
             )
         )
+    left_enum_type_name, right_enum_type_name = new_enum_type_name, old_enum_type_name
+    if old_enum_first:
+        left_enum_type_name, right_enum_type_name = old_enum_type_name, new_enum_type_name
     connection.execute(
         sqlalchemy.text(
             f"""
         CREATE OPERATOR {operator} (
-            leftarg = {new_enum_type_name},
-            rightarg = {old_enum_type_name},
+            leftarg = {left_enum_type_name},
+            rightarg = {right_enum_type_name},
             procedure = {comparison_function_name}
         )
     """
@@ -72,10 +82,16 @@ def create_comparison_operators(
     enum_name: str,
     old_enum_name: str,
     enum_values_to_rename: List[Tuple[str, str]],
+    both_directions: bool = False,
 ):
+    """
+    Create comparison operators of the new enum with the old one, old values are renamed before comparison.
+    :param both_directions:
+        Also create operators with the old enum on the left side
+    """
+    new_enum_type_name = _get_escaped_enum_type_name(schema, enum_name)
+    old_enum_type_name = _get_escaped_enum_type_name(schema, old_enum_name)
     for operator, comparison_function_name in OPERATORS_TO_CREATE:
-        new_enum_type_name = _get_escaped_enum_type_name(schema, enum_name)
-        old_enum_type_name = _get_escaped_enum_type_name(schema, old_enum_name)
         _create_comparison_operator(
             connection,
             new_enum_type_name,
@@ -84,6 +100,17 @@ def create_comparison_operators(
             operator,
             comparison_function_name,
         )
+    if both_directions:
+        for operator, comparison_function_name in REVERSED_OPERATORS_TO_CREATE:
+            _create_comparison_operator(
+                connection,
+                new_enum_type_name,
+                old_enum_type_name,
+                enum_values_to_rename,
+                operator,
+                comparison_function_name,
+                old_enum_first=True,
+            )
 
 
 def _drop_comparison_operator(
@@ -91,13 +118,13 @@ def _drop_comparison_operator(
     new_enum_type_name: str,
     old_enum_type_name: str,
     comparison_function_name: str,
+    old_enum_first: bool = False,
 ):
+    arguments = ", ".join(_get_arguments(new_enum_type_name, old_enum_type_name, old_enum_first))
     connection.execute(
         sqlalchemy.text(
             f"""
-        DROP FUNCTION {comparison_function_name}(
-            new_enum_val {new_enum_type_name}, old_enum_val {old_enum_type_name}
-        ) CASCADE
+        DROP FUNCTION {comparison_function_name}({arguments}) CASCADE
     """
         )
     )
@@ -108,8 +135,14 @@ def drop_comparison_operators(
     schema: str,
     enum_name: str,
     old_enum_name: str,
+    both_directions: bool = False,
 ):
+    new_enum_type_name = _get_escaped_enum_type_name(schema, enum_name)
+    old_enum_type_name = _get_escaped_enum_type_name(schema, old_enum_name)
     for _, comparison_function_name in OPERATORS_TO_CREATE:
-        new_enum_type_name = _get_escaped_enum_type_name(schema, enum_name)
-        old_enum_type_name = _get_escaped_enum_type_name(schema, old_enum_name)
         _drop_comparison_operator(connection, new_enum_type_name, old_enum_type_name, comparison_function_name)
+    if both_directions:
+        for _, comparison_function_name in REVERSED_OPERATORS_TO_CREATE:
+            _drop_comparison_operator(
+                connection, new_enum_type_name, old_enum_type_name, comparison_function_name, old_enum_first=True
+            )
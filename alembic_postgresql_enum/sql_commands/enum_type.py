@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Tuple, Optional, Sequence
 
 import sqlalchemy
 
@@ -8,61 +8,53 @@ if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
 
 
-def cast_old_array_enum_type_to_new(
-    connection: "Connection",
-    table_reference: TableReference,
+def get_cast_old_enum_value_to_new_expression(
+    column_expression: str,
+    column_type: ColumnType,
     enum_type_name: str,
     enum_values_to_rename: List[Tuple[str, str]],
-):
-    cast_clause = f"{table_reference.escaped_column_name}::text[]"
+) -> str:
+    """Result example: CASE WHEN "status"::text = 'tree' THEN 'three'::"public"."numbers" ELSE "status"::text::"public"."numbers" END"""
+    if column_type == ColumnType.ARRAY:
+        cast_clause = f"{column_expression}::text[]"
 
-    for old_value, new_value in enum_values_to_rename:
-        cast_clause = f"""array_replace({cast_clause}, '{old_value}', '{new_value}')"""
+        for old_value, new_value in enum_values_to_rename:
+            cast_clause = f"""array_replace({cast_clause}, '{old_value}', '{new_value}')"""
 
-    connection.execute(
-        sqlalchemy.text(
-            f"""ALTER TABLE {table_reference.table_name_with_schema} 
-            ALTER COLUMN {table_reference.escaped_column_name} TYPE {enum_type_name}[]
-            USING {cast_clause}::{enum_type_name}[]
-            """
-        )
-    )
+        return f"{cast_clause}::{enum_type_name}[]"
 
+    if enum_values_to_rename:
+        return f"""CASE 
+                {' '.join(
+                f"WHEN {column_expression}::text = '{old_value}' THEN '{new_value}'::{enum_type_name}"
+                for old_value, new_value in enum_values_to_rename)}
 
-def cast_old_enum_type_to_new(
-    connection: "Connection",
+                ELSE {column_expression}::text::{enum_type_name}
+                END"""
+
+    return f"{column_expression}::text::{enum_type_name}"
+
+
+def get_cast_old_enum_type_to_new_clause(
     table_reference: TableReference,
     enum_type_name: str,
     enum_values_to_rename: List[Tuple[str, str]],
-):
+) -> str:
+    """Result example: ALTER COLUMN "status" TYPE "public"."order_status" USING "status"::text::"public"."order_status" """
+    column_type_name = enum_type_name
     if table_reference.column_type == ColumnType.ARRAY:
-        cast_old_array_enum_type_to_new(connection, table_reference, enum_type_name, enum_values_to_rename)
-        return
+        column_type_name = f"{enum_type_name}[]"
 
-    if enum_values_to_rename:
-        connection.execute(
-            sqlalchemy.text(
-                f"""ALTER TABLE {table_reference.table_name_with_schema} 
-                ALTER COLUMN {table_reference.escaped_column_name} TYPE {enum_type_name} 
-                USING CASE 
-                {' '.join(
-                f"WHEN {table_reference.escaped_column_name}::text = '{old_value}' THEN '{new_value}'::{enum_type_name}"
-                for old_value, new_value in enum_values_to_rename)}
+    cast_expression = get_cast_old_enum_value_to_new_expression(
+        table_reference.escaped_column_name, table_reference.column_type, enum_type_name, enum_values_to_rename
+    )
+    return f"""ALTER COLUMN {table_reference.escaped_column_name} TYPE {column_type_name} 
+                USING {cast_expression}"""
 
-                ELSE {table_reference.escaped_column_name}::text::{enum_type_name}
-                END
-                """
-            )
-        )
-    else:
-        connection.execute(
-            sqlalchemy.text(
-                f"""ALTER TABLE {table_reference.table_name_with_schema} 
-                ALTER COLUMN {table_reference.escaped_column_name} TYPE {enum_type_name} 
-                USING {table_reference.escaped_column_name}::text::{enum_type_name}
-                """
-            )
-        )
+
+def alter_table_columns(connection: "Connection", table_name_with_schema: str, alter_column_clauses: List[str]):
+    """Apply all column alterations in a single ALTER TABLE statement, so table is rewritten only once"""
+    connection.execute(sqlalchemy.text(f"""ALTER TABLE {table_name_with_schema} {', '.join(alter_column_clauses)}"""))
 
 
 def drop_type(connection: "Connection", enum_type_name: str):
@@ -73,24 +65,84 @@ def rename_type(connection: "Connection", enum_type_name: str, new_type_name: st
     connection.execute(sqlalchemy.text(f"""ALTER TYPE {enum_type_name} RENAME TO {new_type_name}"""))
 
 
+def get_enum_value_literal(value: str) -> str:
+    """
+    Quote enum value as a string literal for sqlalchemy.text,
+    colons are escaped so parts of the value are not parsed as bind parameters.
+    Result example: 'o''clock'
+    """
+    escaped_value = value.replace("'", "''").replace(":", "\\:")
+    return f"'{escaped_value}'"
+
+
+def get_create_type_statement(enum_type_name: str, enum_values: Sequence[str]) -> str:
+    return (
+        f"""CREATE TYPE {enum_type_name} AS ENUM({', '.join(get_enum_value_literal(value) for value in enum_values)})"""
+    )
+
+
 def create_type(connection: "Connection", enum_type_name: str, enum_values: List[str]):
+    connection.execute(sqlalchemy.text(get_create_type_statement(enum_type_name, enum_values)))
+
+
+def create_types(connection: "Connection", enum_types: Sequence[Tuple[str, Sequence[str]]]):
+    """Create all enum types with a single multi-statement submission, enum_types are (type name, values) pairs"""
+    connection.execute(
+        sqlalchemy.text(
+            ";\n".join(
+                get_create_type_statement(enum_type_name, enum_values) for enum_type_name, enum_values in enum_types
+            )
+        )
+    )
+
+
+def drop_types(connection: "Connection", enum_type_names: Sequence[str]):
+    connection.execute(sqlalchemy.text(f"""DROP TYPE {', '.join(enum_type_names)}"""))
+
+
+def add_type_value(
+    connection: "Connection",
+    enum_type_name: str,
+    value: str,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+):
+    position = ""
+    if before is not None:
+        position = f" BEFORE {get_enum_value_literal(before)}"
+    elif after is not None:
+        position = f" AFTER {get_enum_value_literal(after)}"
+
     connection.execute(
-        sqlalchemy.text(f"""CREATE TYPE {enum_type_name} AS ENUM({', '.join(f"'{value}'" for value in enum_values)})""")
+        sqlalchemy.text(f"""ALTER TYPE {enum_type_name} ADD VALUE {get_enum_value_literal(value)}{position}""")
     )
 
 
-def get_all_enums(connection: "Connection", schema: str):
+def rename_type_value(connection: "Connection", enum_type_name: str, old_value: str, new_value: str):
+    connection.execute(
+        sqlalchemy.text(
+            f"""ALTER TYPE {enum_type_name} RENAME VALUE {get_enum_value_literal(old_value)} """
+            f"""TO {get_enum_value_literal(new_value)}"""
+        )
+    )
+
+
+def get_all_enums(connection: "Connection", schemas: List[str]):
+    """Result example: [("public", "order_status", ["active", "passive"])]"""
     sql = """
         SELECT
-            pg_catalog.format_type(t.oid, NULL),
-            ARRAY(SELECT enumlabel
-                  FROM pg_catalog.pg_enum
-                  WHERE enumtypid = t.oid
-                  ORDER BY enumsortorder)
+            n.nspname,
+            t.typname,
+            COALESCE(
+                array_agg(e.enumlabel ORDER BY e.enumsortorder) FILTER (WHERE e.enumlabel IS NOT NULL),
+                '{}'
+            )
         FROM pg_catalog.pg_type t
-        LEFT JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+        JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+        LEFT JOIN pg_catalog.pg_enum e ON e.enumtypid = t.oid
         WHERE
             t.typtype = 'e'
-            AND n.nspname = :schema
+            AND n.nspname = ANY(:schemas)
+        GROUP BY n.nspname, t.typname
     """
-    return connection.execute(sqlalchemy.text(sql), dict(schema=schema))
+    return connection.execute(sqlalchemy.text(sql), dict(schemas=schemas))
@@ -0,0 +1,60 @@
+from typing import TYPE_CHECKING, List, Tuple, Dict
+
+import sqlalchemy
+
+from alembic_postgresql_enum.get_enum_data import TableReference, ColumnType
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+def count_enum_values_usage(
+    connection: "Connection",
+    table_name_with_schema: str,
+    column_checks: List[Tuple[TableReference, str, List[str]]],
+) -> Dict[Tuple[str, str], int]:
+    """
+    Count rows referencing given enum values with a single aggregated query over the table.
+    Rows are filtered by "=" for common columns and by "&&" for array columns, so existing indexes can be used.
+    :param column_checks:
+        Columns of the table with their enum type name and values to look for
+    Result example: {("status", "banned"): 3}
+    """
+    counted_values: List[Tuple[str, str]] = []
+    count_expressions: List[str] = []
+    filter_expressions: List[str] = []
+    parameters = {}
+
+    for column_index, (table_reference, enum_type_name, enum_values) in enumerate(column_checks):
+        column_name = table_reference.escaped_column_name
+        values_parameter = f"values_{column_index}"
+        parameters[values_parameter] = list(enum_values)
+
+        if table_reference.column_type == ColumnType.ARRAY:
+            filter_expressions.append(f"{column_name} && CAST(:{values_parameter} AS {enum_type_name}[])")
+        else:
+            filter_expressions.append(f"{column_name} = ANY(CAST(:{values_parameter} AS {enum_type_name}[]))")
+
+        for value_index, enum_value in enumerate(enum_values):
+            value_parameter = f"value_{column_index}_{value_index}"
+            parameters[value_parameter] = enum_value
+
+            if table_reference.column_type == ColumnType.ARRAY:
+                condition = f"CAST(:{value_parameter} AS {enum_type_name}) = ANY({column_name})"
+            else:
+                condition = f"{column_name} = CAST(:{value_parameter} AS {enum_type_name})"
+
+            counted_values.append((table_reference.column_name, enum_value))
+            count_expressions.append(f"count(*) FILTER (WHERE {condition})")
+
+    if not counted_values:
+        return {}
+
+    sql = f"""
+        SELECT {', '.join(count_expressions)}
+        FROM {table_name_with_schema}
+        WHERE {' OR '.join(filter_expressions)}
+    """
+    counts = connection.execute(sqlalchemy.text(sql), parameters).one()
+
+    return dict(zip(counted_values, counts))
@@ -0,0 +1,78 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+import sqlalchemy
+from sqlalchemy.exc import OperationalError
+
+from alembic_postgresql_enum.get_enum_data import LockRetry
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def get_lock_timeout(connection: "Connection") -> str:
+    return connection.execute(sqlalchemy.text("SELECT current_setting('lock_timeout')")).scalar()
+
+
+def set_lock_timeout(connection: "Connection", lock_timeout: str):
+    """Set lock_timeout until the end of the current transaction"""
+    connection.execute(
+        sqlalchemy.text("SELECT set_config('lock_timeout', :lock_timeout, true)"), dict(lock_timeout=lock_timeout)
+    )
+
+
+def _is_lock_not_available(error: OperationalError) -> bool:
+    return getattr(error.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+
+
+def execute_with_lock_retry(
+    connection: "Connection",
+    lock_retry: Optional[LockRetry],
+    execute: Callable[[], None],
+    description: str,
+):
+    """
+    Execute statements that need a table lock, retrying them if the lock can not be acquired within lock_timeout.
+    Every attempt is done in its own savepoint, so a failed attempt does not abort the migration transaction.
+    """
+    if lock_retry is None:
+        execute()
+        return
+
+    previous_lock_timeout = get_lock_timeout(connection)
+    started_at = time.monotonic()
+    attempt = 0
+
+    while True:
+        try:
+            with connection.begin_nested():
+                set_lock_timeout(connection, lock_retry.lock_timeout)
+                execute()
+            break
+        except OperationalError as error:
+            if not _is_lock_not_available(error):
+                raise
+
+            delay = lock_retry.backoff * 2**attempt
+            attempt += 1
+            if attempt > lock_retry.retries:
+                raise
+            if lock_retry.deadline is not None and time.monotonic() - started_at + delay > lock_retry.deadline:
+                raise
+
+            log.warning(
+                "Could not acquire lock for %s within %s, retrying in %.1fs (%d/%d)",
+                description,
+                lock_retry.lock_timeout,
+                delay,
+                attempt,
+                lock_retry.retries,
+            )
+            time.sleep(delay)
+
+    set_lock_timeout(connection, previous_lock_timeout)
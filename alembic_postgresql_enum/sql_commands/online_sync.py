@@ -0,0 +1,218 @@
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Any
+
+import sqlalchemy
+
+from alembic_postgresql_enum.sql_commands.enum_type import get_enum_value_literal
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+@contextmanager
+def transaction_block(connection: "Connection") -> Iterator[None]:
+    """Run statements in an explicit transaction while connection is in autocommit mode"""
+    connection.execute(sqlalchemy.text("BEGIN"))
+    try:
+        yield
+    except BaseException:
+        connection.execute(sqlalchemy.text("ROLLBACK"))
+        raise
+    connection.execute(sqlalchemy.text("COMMIT"))
+
+
+def get_primary_key_columns(connection: "Connection", table_name_with_schema: str) -> List[str]:
+    """Result example: ["id"]"""
+    sql = """
+        SELECT a.attname
+        FROM pg_catalog.pg_index i
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE
+            i.indrelid = CAST(:table_name AS regclass)
+            AND i.indisprimary
+        ORDER BY array_position(i.indkey::int2[], a.attnum)
+    """
+    return list(connection.execute(sqlalchemy.text(sql), dict(table_name=table_name_with_schema)).scalars())
+
+
+def get_column_dependents(connection: "Connection", table_name_with_schema: str, column_name: str) -> List[str]:
+    """
+    Describe objects that would be dropped or would block dropping of the column, such as indexes, constraints and views.
+    Column default and NOT NULL constraint are not included.
+    Result example: ["index users_status_idx"]
+    """
+    sql = """
+        SELECT pg_catalog.pg_describe_object(d.classid, d.objid, d.objsubid)
+        FROM pg_catalog.pg_depend d
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+        LEFT JOIN pg_catalog.pg_constraint c
+            ON d.classid = 'pg_catalog.pg_constraint'::regclass AND c.oid = d.objid
+        WHERE
+            d.refclassid = 'pg_catalog.pg_class'::regclass
+            AND d.refobjid = CAST(:table_name AS regclass)
+            AND a.attname = :column_name
+            AND d.classid <> 'pg_catalog.pg_attrdef'::regclass
+            AND c.contype IS DISTINCT FROM 'n'
+        ORDER BY 1
+    """
+    return list(
+        connection.execute(
+            sqlalchemy.text(sql), dict(table_name=table_name_with_schema, column_name=column_name)
+        ).scalars()
+    )
+
+
+def is_column_not_null(connection: "Connection", table_name_with_schema: str, column_name: str) -> bool:
+    sql = """
+        SELECT attnotnull
+        FROM pg_catalog.pg_attribute
+        WHERE
+            attrelid = CAST(:table_name AS regclass)
+            AND attname = :column_name
+    """
+    return connection.execute(
+        sqlalchemy.text(sql), dict(table_name=table_name_with_schema, column_name=column_name)
+    ).scalar()
+
+
+def create_sync_trigger(
+    connection: "Connection", table_name_with_schema: str, function_name: str, assignments: List[str]
+):
+    """
+    Create trigger that keeps shadow columns in sync with original ones on every insert and update
+    :param assignments:
+        Example: ['NEW."status__enum_new" := NEW."status"::text::"public"."order_status"']
+    """
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        CREATE FUNCTION {function_name}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            {' '.join(f'{assignment};' for assignment in assignments)}
+            RETURN NEW;
+        END
+        $$
+    """
+        )
+    )
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        CREATE TRIGGER enum_sync BEFORE INSERT OR UPDATE ON {table_name_with_schema}
+        FOR EACH ROW EXECUTE PROCEDURE {function_name}()
+    """
+        )
+    )
+
+
+def drop_sync_trigger(connection: "Connection", table_name_with_schema: str, function_name: str):
+    connection.execute(sqlalchemy.text(f"""DROP TRIGGER enum_sync ON {table_name_with_schema}"""))
+    connection.execute(sqlalchemy.text(f"""DROP FUNCTION {function_name}()"""))
+
+
+def backfill_batch(
+    connection: "Connection",
+    table_name_with_schema: str,
+    primary_key_columns: List[str],
+    assignments: List[str],
+    last_key: Optional[Tuple[Any, ...]],
+    batch_size: int,
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Update next batch of rows ordered by primary key
+    :param assignments:
+        Example: ['"status__enum_new" = "status"::text::"public"."order_status"']
+    :returns:
+        Primary key of the last updated row or None if there are no rows left
+    """
+    primary_key = ", ".join(f'"{column_name}"' for column_name in primary_key_columns)
+    parameters: dict = dict(batch_size=batch_size)
+
+    after_last_key = "TRUE"
+    if last_key is not None:
+        after_last_key = f"({primary_key}) > ({', '.join(f':last_key_{i}' for i in range(len(last_key)))})"
+        parameters.update({f"last_key_{i}": value for i, value in enumerate(last_key)})
+
+    sql = f"""
+        WITH batch AS (
+            SELECT {primary_key}
+            FROM {table_name_with_schema}
+            WHERE {after_last_key}
+            ORDER BY {primary_key}
+            LIMIT :batch_size
+        ), updated AS (
+            UPDATE {table_name_with_schema} AS t
+            SET {', '.join(assignments)}
+            FROM batch
+            WHERE
+                ({', '.join(f't."{column_name}"' for column_name in primary_key_columns)})
+                = ({', '.join(f'batch."{column_name}"' for column_name in primary_key_columns)})
+        )
+        SELECT {primary_key}
+        FROM batch
+        ORDER BY {', '.join(f'"{column_name}" DESC' for column_name in primary_key_columns)}
+        LIMIT 1
+    """
+    row = connection.execute(sqlalchemy.text(sql), parameters).first()
+    if row is None:
+        return None
+    return tuple(row)
+
+
+def copy_column_settings(
+    connection: "Connection", table_name_with_schema: str, column_name: str, target_column_name: str
+):
+    """Copy comment, statistics target and column privileges, that are lost when the column is dropped"""
+    sql = """
+        SELECT
+            pg_catalog.col_description(attrelid, attnum),
+            NULLIF(attstattarget, -1),
+            ARRAY(
+                SELECT
+                    format(
+                        'GRANT %s (%I) ON %s TO %s%s',
+                        acl.privilege_type,
+                        CAST(:target_column_name AS text),
+                        CAST(:table_name AS text),
+                        CASE
+                            WHEN acl.grantee = 0 THEN 'PUBLIC'
+                            ELSE quote_ident(pg_catalog.pg_get_userbyid(acl.grantee))
+                        END,
+                        CASE WHEN acl.is_grantable THEN ' WITH GRANT OPTION' ELSE '' END
+                    )
+                FROM aclexplode(attacl) AS acl
+            )
+        FROM pg_catalog.pg_attribute
+        WHERE
+            attrelid = CAST(:table_name AS regclass)
+            AND attname = :column_name
+    """
+    comment, statistics_target, grants = connection.execute(
+        sqlalchemy.text(sql),
+        dict(table_name=table_name_with_schema, column_name=column_name, target_column_name=target_column_name),
+    ).one()
+
+    if comment is not None:
+        connection.execute(
+            sqlalchemy.text(
+                f"""COMMENT ON COLUMN {table_name_with_schema}."{target_column_name}" """
+                f"""IS {get_enum_value_literal(comment)}"""
+            )
+        )
+    if statistics_target is not None:
+        connection.execute(
+            sqlalchemy.text(
+                f"""ALTER TABLE {table_name_with_schema} """
+                f"""ALTER COLUMN "{target_column_name}" SET STATISTICS {int(statistics_target)}"""
+            )
+        )
+    for grant in grants:
+        connection.execute(sqlalchemy.text(grant.replace(":", "\\:")))
+
+
+def rename_column(connection: "Connection", table_name_with_schema: str, column_name: str, new_column_name: str):
+    connection.execute(
+        sqlalchemy.text(
+            f"""ALTER TABLE {table_name_with_schema} RENAME COLUMN "{column_name}" TO "{new_column_name}" """
+        )
+    )
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+
+import sqlalchemy
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+@dataclass(frozen=True)
+class Partition:
+    table_name_with_schema: str
+    bound: str
+    constraint: Optional[str]
+    is_partitioned: bool
+
+
+def get_partitions(connection: "Connection", table_name_with_schema: str) -> List[Partition]:
+    """
+    Return partitions of a declarative-partitioned table, default partition is the last one.
+    Result is empty if table is not partitioned.
+    Result example: [Partition('public.events_2024_01', "FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')", ...)]
+    """
+    sql = """
+        SELECT
+            format('%I.%I', n.nspname, c.relname),
+            pg_catalog.pg_get_expr(c.relpartbound, c.oid),
+            pg_catalog.pg_get_partition_constraintdef(c.oid),
+            c.relkind = 'p'
+        FROM pg_catalog.pg_inherits i
+        JOIN pg_catalog.pg_class c ON c.oid = i.inhrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE
+            i.inhparent = CAST(:table_name AS regclass)
+            AND EXISTS (
+                SELECT 1 FROM pg_catalog.pg_partitioned_table p WHERE p.partrelid = i.inhparent
+            )
+        ORDER BY pg_catalog.pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT', c.relname
+    """
+    return [
+        Partition(*row)
+        for row in connection.execute(sqlalchemy.text(sql), dict(table_name=table_name_with_schema)).all()
+    ]
+
+
+def detach_partition(connection: "Connection", table_name_with_schema: str, partition_name_with_schema: str):
+    connection.execute(
+        sqlalchemy.text(f"""ALTER TABLE {table_name_with_schema} DETACH PARTITION {partition_name_with_schema}""")
+    )
+
+
+def attach_partition(
+    connection: "Connection", table_name_with_schema: str, partition_name_with_schema: str, bound: str
+):
+    connection.execute(
+        sqlalchemy.text(
+            f"""ALTER TABLE {table_name_with_schema} ATTACH PARTITION {partition_name_with_schema} {bound}"""
+        )
+    )
+
+
+def drop_constraint(connection: "Connection", table_name_with_schema: str, constraint_name: str):
+    connection.execute(
+        sqlalchemy.text(f"""ALTER TABLE {table_name_with_schema} DROP CONSTRAINT "{constraint_name}" """)
+    )
@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING, List
+
+import sqlalchemy
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+class StatementBatch:
+    """
+    Stand-in for connection that collects statements instead of executing them,
+    so they are sent to the server in a single round trip by flush.
+    Only statements without parameters and results can be collected.
+    """
+
+    def __init__(self, connection: "Connection"):
+        self.connection = connection
+        self.dialect = connection.dialect
+        self.statements: List[str] = []
+
+    def execute(self, statement, parameters=None):
+        if parameters:
+            raise ValueError("Statements with parameters can not be batched")
+        self.statements.append(str(statement).strip())
+
+    def flush(self):
+        """Execute collected statements as a single multi-statement submission"""
+        if not self.statements:
+            return
+        # Statements are already rendered, their colons are escaped to not be parsed as bind parameters again
+        self.connection.execute(
+            sqlalchemy.text(";\n".join(statement.replace(":", "\\:") for statement in self.statements))
+        )
+        self.statements.clear()
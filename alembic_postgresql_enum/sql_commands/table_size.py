@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING, List, Tuple, Iterable, Dict
+
+import sqlalchemy
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+def get_table_size(connection: "Connection", table_name_with_schema: str) -> Tuple[int, float, int]:
+    """
+    Get size of the table including all its partitions from planner statistics
+    Result example: (relpages, reltuples, total size with indexes and toast in bytes) = (1250, 100000.0, 13336576)
+    """
+    sql = """
+        WITH RECURSIVE tables AS (
+            SELECT to_regclass(:table_name)::oid AS relid
+            UNION ALL
+            SELECT i.inhrelid
+            FROM pg_catalog.pg_inherits i
+            JOIN tables ON i.inhparent = tables.relid
+        )
+        SELECT
+            COALESCE(sum(c.relpages), 0),
+            COALESCE(sum(GREATEST(c.reltuples, 0)), 0),
+            COALESCE(sum(pg_catalog.pg_total_relation_size(c.oid)), 0)
+        FROM tables
+        JOIN pg_catalog.pg_class c ON c.oid = tables.relid
+    """
+    pages, tuples, total_size = connection.execute(sqlalchemy.text(sql), dict(table_name=table_name_with_schema)).one()
+    return int(pages), float(tuples), int(total_size)
+
+
+def get_table_sizes(
+    connection: "Connection", table_names_with_schema: Iterable[str]
+) -> Dict[str, Tuple[int, float, int, List[str]]]:
+    """
+    Get sizes and indexes of many tables including all their partitions in a single query,
+    tables that do not exist are absent from the result
+    Result example: {'"public"."orders"': (1250, 100000.0, 13336576, ["orders_pkey", "orders_status_idx"])}
+    """
+    table_names_with_schema = sorted(set(table_names_with_schema))
+    if not table_names_with_schema:
+        return {}
+
+    sql = """
+        WITH RECURSIVE requested AS (
+            SELECT table_name, to_regclass(table_name)::oid AS root
+            FROM unnest(CAST(:table_names AS text[])) AS table_name
+            WHERE to_regclass(table_name) IS NOT NULL
+        ), tables AS (
+            SELECT table_name, root AS relid
+            FROM requested
+            UNION ALL
+            SELECT tables.table_name, i.inhrelid
+            FROM pg_catalog.pg_inherits i
+            JOIN tables ON i.inhparent = tables.relid
+        )
+        SELECT
+            requested.table_name,
+            COALESCE(sum(c.relpages), 0),
+            COALESCE(sum(GREATEST(c.reltuples, 0)), 0),
+            COALESCE(sum(pg_catalog.pg_total_relation_size(c.oid)), 0),
+            ARRAY(
+                SELECT indexrelid::regclass::text
+                FROM pg_catalog.pg_index
+                WHERE indrelid = requested.root
+                ORDER BY 1
+            )
+        FROM requested
+        JOIN tables ON tables.table_name = requested.table_name
+        JOIN pg_catalog.pg_class c ON c.oid = tables.relid
+        GROUP BY requested.table_name, requested.root
+    """
+    result = connection.execute(sqlalchemy.text(sql), dict(table_names=table_names_with_schema))
+    return {
+        table_name: (int(pages), float(tuples), int(total_size), list(indexes))
+        for table_name, pages, tuples, total_size, indexes in result
+    }
@@ -0,0 +1,155 @@
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Sequence, Tuple, DefaultDict
+
+import sqlalchemy
+
+from alembic_postgresql_enum.tracing import trace_span
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+log = logging.getLogger(f"alembic.{__name__}")
+
+
+@dataclass(frozen=True)
+class StatementEvent:
+    """
+    Statement executed by the library
+    :param kind:
+        Step of the operation, e.g. "rename_type", "create_type", "alter_table", "drop_type"
+    :param enum_names:
+        Enums the statement is executed for, e.g. ("public.order_status",)
+    :param table_name_with_schema:
+        Table the statement is executed for if any
+    :param duration:
+        Seconds the statement took
+    :param rowcount:
+        Row count reported by the driver, -1 if not available
+    """
+
+    kind: str
+    enum_names: Tuple[str, ...]
+    table_name_with_schema: Optional[str]
+    sql: str
+    duration: float
+    rowcount: int
+
+
+StatementListener = Callable[[StatementEvent], None]
+
+
+@dataclass(frozen=True)
+class _StatementStep:
+    kind: str
+    enum_names: Tuple[str, ...]
+    table_name_with_schema: Optional[str]
+
+
+class _StatementObserver:
+    def __init__(self, listeners: Sequence[StatementListener]):
+        self.listeners = listeners
+        self.events: List[StatementEvent] = []
+        self.current_step: Optional[_StatementStep] = None
+        self.started_at = 0.0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.started_at = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.current_step is None:
+            return
+
+        event = StatementEvent(
+            kind=self.current_step.kind,
+            enum_names=self.current_step.enum_names,
+            table_name_with_schema=self.current_step.table_name_with_schema,
+            sql=statement,
+            duration=time.perf_counter() - self.started_at,
+            rowcount=cursor.rowcount,
+        )
+        self.events.append(event)
+        for listener in self.listeners:
+            listener(event)
+
+
+_current_observer: ContextVar[Optional[_StatementObserver]] = ContextVar("_current_observer", default=None)
+
+
+@contextmanager
+def observe_statements(
+    connection: "Connection", listeners: Sequence[StatementListener], log_timings: bool = False
+) -> Iterator[None]:
+    """
+    Pass statements executed within observed steps to listeners.
+    Nothing is observed if there are no listeners and timings are not logged.
+    """
+    if not listeners and not log_timings:
+        yield
+        return
+
+    observer = _StatementObserver(listeners)
+    token = _current_observer.set(observer)
+    sqlalchemy.event.listen(connection, "before_cursor_execute", observer.before_cursor_execute)
+    sqlalchemy.event.listen(connection, "after_cursor_execute", observer.after_cursor_execute)
+    try:
+        yield
+    finally:
+        sqlalchemy.event.remove(connection, "before_cursor_execute", observer.before_cursor_execute)
+        sqlalchemy.event.remove(connection, "after_cursor_execute", observer.after_cursor_execute)
+        _current_observer.reset(token)
+
+    if log_timings:
+        log_timing_summary(observer.events)
+
+
+@contextmanager
+def statement_step(
+    kind: str, enum_names: Sequence[str] = (), table_name_with_schema: Optional[str] = None
+) -> Iterator[None]:
+    """Mark statements executed within the block as a step of the operation, the step is traced as a span"""
+    with trace_span(f"step.{kind}", enum_names=tuple(enum_names), table=table_name_with_schema):
+        observer = _current_observer.get()
+        if observer is None:
+            yield
+            return
+
+        previous_step = observer.current_step
+        observer.current_step = _StatementStep(kind, tuple(enum_names), table_name_with_schema)
+        try:
+            yield
+        finally:
+            observer.current_step = previous_step
+
+
+def log_timing_summary(events: Sequence[StatementEvent]):
+    """
+    Log duration of statements grouped by enum, slowest tables first.
+    Statement executed for several enums, such as ALTER TABLE of a table shared by them, is counted for each of them.
+    """
+    enum_to_events: DefaultDict[str, List[StatementEvent]] = defaultdict(list)
+    for event in events:
+        for enum_name in event.enum_names:
+            enum_to_events[enum_name].append(event)
+
+    for enum_name, enum_events in enum_to_events.items():
+        kind_to_duration: DefaultDict[str, float] = defaultdict(float)
+        table_to_duration: DefaultDict[str, float] = defaultdict(float)
+        for event in enum_events:
+            kind_to_duration[event.kind] += event.duration
+            if event.table_name_with_schema is not None:
+                table_to_duration[event.table_name_with_schema] += event.duration
+
+        log.info(
+            "Enum %s synced in %.3fs with %d statement(s): %s",
+            enum_name,
+            sum(event.duration for event in enum_events),
+            len(enum_events),
+            ", ".join(f"{kind} {duration:.3f}s" for kind, duration in kind_to_duration.items()),
+        )
+        for table_name_with_schema, duration in sorted(table_to_duration.items(), key=lambda item: -item[1]):
+            log.info("    %s %.3fs", table_name_with_schema, duration)
@@ -0,0 +1,175 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, DefaultDict
+
+import sqlalchemy
+
+from alembic_postgresql_enum.configuration import get_configuration
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+SPAN_NAME_PREFIX = "alembic_postgresql_enum."
+QUERY_COUNT_ATTRIBUTE = "query_count"
+
+
+@dataclass(frozen=True)
+class CapturedQuery:
+    phase: str
+    sql: str
+
+
+class QueryLog:
+    """
+    Captures queries executed by the library within the block, grouped by phase.
+    Phase is the name of the innermost span the query is executed in, e.g. "get_defined_enums" or "step.alter_table".
+    Queries are captured whether tracer is configured or not.
+
+    with QueryLog() as query_log:
+        produce_migrations(migration_context, metadata)
+    query_log.assert_max_queries(3)
+    """
+
+    def __init__(self):
+        self.queries: List[CapturedQuery] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryLog":
+        self._token = _query_logs.set(_query_logs.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info):
+        _query_logs.reset(self._token)
+
+    def count(self, phase: Optional[str] = None) -> int:
+        return len(self.get_queries(phase))
+
+    def get_queries(self, phase: Optional[str] = None) -> List[str]:
+        return [query.sql for query in self.queries if phase is None or query.phase == phase]
+
+    def by_phase(self) -> Dict[str, List[str]]:
+        """Result example: {"get_defined_enums": ["SELECT ..."], "step.alter_table": ["ALTER TABLE ..."]}"""
+        phase_to_queries: DefaultDict[str, List[str]] = defaultdict(list)
+        for query in self.queries:
+            phase_to_queries[query.phase].append(query.sql)
+        return dict(phase_to_queries)
+
+    def format(self) -> str:
+        lines = []
+        for phase, queries in self.by_phase().items():
+            lines.append(f"{phase}: {len(queries)} query(ies)")
+            lines.extend(f"    {' '.join(sql.split())}" for sql in queries)
+        return "\n".join(lines)
+
+    def assert_max_queries(self, max_count: int, phase: Optional[str] = None):
+        """Raise AssertionError listing captured queries if more than max_count of them were executed"""
+        count = self.count(phase)
+        if count > max_count:
+            scope = "" if phase is None else f" in phase {phase!r}"
+            raise AssertionError(f"Expected at most {max_count} queries{scope}, {count} executed:\n{self.format()}")
+
+
+_query_logs: ContextVar[Tuple[QueryLog, ...]] = ContextVar("_query_logs", default=())
+_phases: ContextVar[Tuple[str, ...]] = ContextVar("_phases", default=())
+_query_counters: ContextVar[Tuple[List[int], ...]] = ContextVar("_query_counters", default=())
+
+
+def _on_query(conn, cursor, statement, parameters, context, executemany):
+    for query_counter in _query_counters.get():
+        query_counter[0] += 1
+
+    phases = _phases.get()
+    for query_log in _query_logs.get():
+        query_log.queries.append(CapturedQuery(phases[-1], statement))
+
+
+@contextmanager
+def trace_span(name: str, connection: Optional["Connection"] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Wrap the block in a span of configured tracer, yields None if tracer is not configured.
+    Attributes with None value are skipped.
+    Number of queries executed within the block is set as query_count attribute,
+    queries are counted on the connection passed to the outermost span.
+    Queries are also passed to active QueryLogs with the span name as phase.
+    """
+    tracer = get_configuration().tracer
+    is_observed = tracer is not None or bool(_query_logs.get())
+    is_outermost = not _phases.get()
+    phases_token = _phases.set(_phases.get() + (name,))
+
+    if not is_observed:
+        try:
+            yield None
+        finally:
+            _phases.reset(phases_token)
+        return
+
+    listens = connection is not None and is_outermost
+    if listens:
+        sqlalchemy.event.listen(connection, "after_cursor_execute", _on_query)
+    try:
+        if tracer is None:
+            yield None
+            return
+
+        query_counter = [0]
+        counters_token = _query_counters.set(_query_counters.get() + (query_counter,))
+        try:
+            with tracer.start_as_current_span(
+                SPAN_NAME_PREFIX + name,
+                attributes={key: value for key, value in attributes.items() if value is not None},
+            ) as span:
+                try:
+                    yield span
+                finally:
+                    span.set_attribute(QUERY_COUNT_ATTRIBUTE, query_counter[0])
+        finally:
+            _query_counters.reset(counters_token)
+    finally:
+        if listens:
+            sqlalchemy.event.remove(connection, "after_cursor_execute", _on_query)
+        _phases.reset(phases_token)
+
+
+@dataclass
+class RecordedSpan:
+    name: str
+    attributes: Dict[str, Any]
+    parent: Optional["RecordedSpan"] = None
+    children: List["RecordedSpan"] = field(default_factory=list)
+    duration: float = 0.0
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class InMemoryTracer:
+    """
+    Tracer that keeps finished spans in memory instead of exporting them, meant for tests.
+    Any other tracer with the same start_as_current_span method, such as OpenTelemetry Tracer, can be configured.
+    """
+
+    def __init__(self):
+        self.finished_spans: List[RecordedSpan] = []
+        self._current_span: Optional[RecordedSpan] = None
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[RecordedSpan]:
+        span = RecordedSpan(name, dict(attributes or {}), parent=self._current_span)
+        if span.parent is not None:
+            span.parent.children.append(span)
+
+        self._current_span = span
+        started_at = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - started_at
+            self._current_span = span.parent
+            self.finished_spans.append(span)
+
+    def get_spans(self, name: str) -> List[RecordedSpan]:
+        return [span for span in self.finished_spans if span.name == SPAN_NAME_PREFIX + name]
@@ -0,0 +1,193 @@
+"""
+Benchmark of compare_enums on synthetic metadata
+
+python -m benchmarks.autogenerate --scales small,medium --output autogenerate.jsonl
+"""
+
+import argparse
+import enum
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import sqlalchemy
+from alembic.autogenerate.api import AutogenContext
+from alembic.operations.ops import UpgradeOps
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import MetaData, Table, Column, Integer
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum.compare_dispatch import compare_enums
+from .common import (
+    BENCHMARK_SCHEMA_PREFIX,
+    create_engine,
+    drop_benchmark_schemas,
+    get_common_result_fields,
+    measure,
+    parse_choices,
+    write_result,
+)
+
+
+@dataclass(frozen=True)
+class AutogenerateScale:
+    table_count: int
+    enum_count: int
+    schema_count: int
+
+
+SCALES: Dict[str, AutogenerateScale] = {
+    "small": AutogenerateScale(table_count=100, enum_count=10, schema_count=1),
+    "medium": AutogenerateScale(table_count=1000, enum_count=500, schema_count=50),
+    "large": AutogenerateScale(table_count=10000, enum_count=5000, schema_count=500),
+}
+
+# Every CHANGED_ENUM_STEP-th enum gets a new value in declared metadata, so sync detection has work to do
+CHANGED_ENUM_STEP = 10
+
+
+class EnumTypeDecorator(sqlalchemy.types.TypeDecorator):
+    impl = sqlalchemy.types.Enum
+
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, enum.Enum):
+            return value.value
+        return value
+
+
+def _get_enum_values(enum_index: int, changed: bool) -> List[str]:
+    values = [f"value_{value_index}" for value_index in range(4)]
+    if changed and enum_index % CHANGED_ENUM_STEP == 0:
+        values.append("added_value")
+    return values
+
+
+def build_metadata(scale: AutogenerateScale, changed: bool = False) -> MetaData:
+    """
+    Build metadata with tables spread over schemas, every table has an enum column with server default,
+    an array of enum column and a TypeDecorator enum column.
+    If changed, some enums get a new value and every schema gets a table with a new enum.
+    """
+    metadata = MetaData()
+    schemas = [f"{BENCHMARK_SCHEMA_PREFIX}{schema_index}" for schema_index in range(scale.schema_count)]
+
+    enums = []
+    for enum_index in range(scale.enum_count):
+        schema = schemas[enum_index % scale.schema_count]
+        values = _get_enum_values(enum_index, changed)
+        enums.append(
+            (
+                postgresql.ENUM(*values, name=f"enum_{enum_index}", schema=schema),
+                postgresql.ENUM(*values, name=f"array_enum_{enum_index}", schema=schema),
+                EnumTypeDecorator(
+                    enum.Enum(f"PyEnum{enum_index}", values), name=f"decorated_enum_{enum_index}", schema=schema
+                ),
+            )
+        )
+
+    for table_index in range(scale.table_count):
+        # Tables reference enums of their own schema
+        enum_index = table_index % scale.enum_count
+        schema = schemas[enum_index % scale.schema_count]
+        enum_type, array_enum_type, decorated_enum_type = enums[enum_index]
+        Table(
+            f"table_{table_index}",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("status", enum_type, server_default="value_0"),
+            Column("statuses", postgresql.ARRAY(array_enum_type)),
+            Column("decorated_status", decorated_enum_type),
+            schema=schema,
+        )
+
+    if changed:
+        for schema in schemas:
+            Table(
+                "new_table",
+                metadata,
+                Column("id", Integer, primary_key=True),
+                Column("status", postgresql.ENUM("new", "old", name="new_enum", schema=schema)),
+                schema=schema,
+            )
+
+    return metadata
+
+
+def prepare_database(connection: sqlalchemy.engine.Connection, scale: AutogenerateScale):
+    drop_benchmark_schemas(connection)
+    metadata = build_metadata(scale)
+    for schema_index in range(scale.schema_count):
+        schema = f"{BENCHMARK_SCHEMA_PREFIX}{schema_index}"
+        connection.execute(sqlalchemy.text(f'CREATE SCHEMA "{schema}"'))
+        # Tables are created schema by schema to not run out of locks
+        for table in metadata.tables.values():
+            if table.schema == schema:
+                table.create(connection, checkfirst=True)
+        connection.commit()
+
+
+def run_compare_enums(connection: sqlalchemy.engine.Connection, metadata: MetaData, schema_names: List[str]):
+    migration_context = MigrationContext.configure(
+        connection, opts={"target_metadata": metadata, "include_schemas": True}
+    )
+    upgrade_ops = UpgradeOps(ops=[])
+    compare_enums(AutogenContext(migration_context, metadata), upgrade_ops, schema_names)
+    return upgrade_ops
+
+
+def run_benchmark(scale_name: str, repeat: int, output: Optional[str]):
+    scale = SCALES[scale_name]
+    engine = create_engine()
+    with engine.connect() as connection:
+        prepare_database(connection, scale)
+        try:
+            metadata = build_metadata(scale, changed=True)
+            schema_names = [f"{BENCHMARK_SCHEMA_PREFIX}{schema_index}" for schema_index in range(scale.schema_count)]
+
+            # Memory is traced in a separate run as tracemalloc slows everything down
+            with measure(trace_memory=True) as memory_measurement:
+                run_compare_enums(connection, metadata, schema_names)
+
+            for run_index in range(repeat):
+                with measure() as measurement:
+                    upgrade_ops = run_compare_enums(connection, metadata, schema_names)
+
+                write_result(
+                    {
+                        "benchmark": "autogenerate",
+                        "scale": scale_name,
+                        **scale.__dict__,
+                        "run": run_index,
+                        "operation_count": len(upgrade_ops.ops),
+                        "wall_time": measurement.wall_time,
+                        "query_count": measurement.query_count,
+                        "peak_memory": memory_measurement.peak_memory,
+                        "phases": measurement.phases,
+                        **get_common_result_fields(),
+                    },
+                    output,
+                )
+        finally:
+            connection.rollback()
+            drop_benchmark_schemas(connection)
+            connection.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.autogenerate",
+        description="Measure wall time, query count and peak memory of compare_enums on synthetic metadata, "
+        "results are written as JSON lines",
+    )
+    parser.add_argument("--scales", default="small", help=f"Comma separated scales: {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of measured runs of every scale")
+    parser.add_argument("--output", help="File to append results to, stdout by default")
+    args = parser.parse_args()
+
+    for scale_name in parse_choices(args.scales, SCALES):
+        run_benchmark(scale_name, args.repeat, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict, replace
+from typing import Dict, Iterator, Optional, List, Any, DefaultDict
+
+import alembic
+import sqlalchemy
+
+from alembic_postgresql_enum.configuration import get_configuration, set_configuration
+from alembic_postgresql_enum.tracing import InMemoryTracer, QueryLog, SPAN_NAME_PREFIX
+
+try:
+    import dotenv
+
+    dotenv.load_dotenv()
+except ImportError:
+    pass
+
+BENCHMARK_SCHEMA_PREFIX = "bench_"
+
+
+def create_engine(**kwargs) -> sqlalchemy.engine.Engine:
+    """Engine for the database from DATABASE_URI, same as used by tests"""
+    database_uri = os.getenv("DATABASE_URI")
+    if database_uri is None:
+        raise RuntimeError("DATABASE_URI environment variable is not set, see tests/README.md")
+    return sqlalchemy.create_engine(database_uri, **kwargs)
+
+
+def drop_benchmark_schemas(connection: sqlalchemy.engine.Connection):
+    """Drop schemas created by benchmarks, every schema is dropped in its own transaction to not run out of locks"""
+    schema_names = connection.execute(
+        sqlalchemy.text("SELECT nspname FROM pg_catalog.pg_namespace WHERE left(nspname, length(:prefix)) = :prefix"),
+        dict(prefix=BENCHMARK_SCHEMA_PREFIX),
+    ).scalars()
+    for schema_name in list(schema_names):
+        connection.execute(sqlalchemy.text(f'DROP SCHEMA "{schema_name}" CASCADE'))
+        connection.commit()
+
+
+@dataclass
+class PhaseMeasurement:
+    duration: float = 0.0
+    query_count: int = 0
+
+
+@dataclass
+class Measurement:
+    wall_time: float = 0.0
+    query_count: int = 0
+    peak_memory: int = 0
+    phases: Dict[str, PhaseMeasurement] = field(default_factory=dict)
+
+
+@contextmanager
+def measure(trace_memory: bool = False) -> Iterator[Measurement]:
+    """
+    Measure wall time and queries executed by the library within the block.
+    Duration and query count of every library phase are measured with InMemoryTracer.
+    :param trace_memory:
+        Measure peak memory allocated by Python with tracemalloc, it slows the block down, so wall time of the same
+        measurement should not be compared with measurements without it
+    """
+    measurement = Measurement()
+    tracer = InMemoryTracer()
+    old_config = get_configuration()
+    set_configuration(replace(old_config, tracer=tracer))
+
+    if trace_memory:
+        tracemalloc.start()
+    started_at = time.perf_counter()
+    try:
+        with QueryLog() as query_log:
+            yield measurement
+    finally:
+        measurement.wall_time = time.perf_counter() - started_at
+        if trace_memory:
+            _, measurement.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        set_configuration(old_config)
+
+    measurement.query_count = query_log.count()
+    phases: DefaultDict[str, PhaseMeasurement] = defaultdict(PhaseMeasurement)
+    for span in tracer.finished_spans:
+        phase = phases[span.name[len(SPAN_NAME_PREFIX) :]]
+        phase.duration += span.duration
+        phase.query_count += span.attributes.get("query_count", 0) - sum(
+            child.attributes.get("query_count", 0) for child in span.children
+        )
+    measurement.phases = dict(phases)
+
+
+def write_result(result: Dict[str, Any], output: Optional[str] = None):
+    """Append result as a JSON line to output file or print it to stdout"""
+    line = json.dumps(result, default=lambda value: asdict(value))
+    if output is None:
+        print(line)
+        sys.stdout.flush()
+        return
+
+    with open(output, "a") as file:
+        file.write(line + "\n")
+
+
+def get_common_result_fields() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "alembic": alembic.__version__,
+    }
+
+
+def parse_choices(value: str, choices: Dict[str, Any]) -> List[str]:
+    """Parse comma separated names of benchmark scales or cases"""
+    names = value.split(",")
+    for name in names:
+        if name not in choices:
+            raise ValueError(f"Unknown choice {name!r}, available choices: {', '.join(choices)}")
+    return names
+
+
+class LockProbe:
+    """
+    Polls pg_locks from a separate session and sums time the table is locked in ACCESS EXCLUSIVE mode
+    by other sessions. Precision is limited by the poll interval.
+    """
+
+    def __init__(self, engine: sqlalchemy.engine.Engine, table_name_with_schema: str, poll_interval: float = 0.005):
+        self.engine = engine
+        self.table_name_with_schema = table_name_with_schema
+        self.poll_interval = poll_interval
+        self.lock_hold_time = 0.0
+        self.longest_lock_hold_time = 0.0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def __enter__(self) -> "LockProbe":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _poll(self):
+        sql = sqlalchemy.text(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_catalog.pg_locks
+                WHERE
+                    locktype = 'relation'
+                    AND relation = CAST(:table_name AS regclass)
+                    AND mode = 'AccessExclusiveLock'
+                    AND granted
+            )
+        """
+        )
+        locked_since: Optional[float] = None
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            while not self._stopped.is_set():
+                is_locked = connection.execute(sql, dict(table_name=self.table_name_with_schema)).scalar()
+                now = time.perf_counter()
+                if is_locked and locked_since is None:
+                    locked_since = now
+                elif not is_locked and locked_since is not None:
+                    self._add_lock_hold_time(now - locked_since)
+                    locked_since = None
+                self._stopped.wait(self.poll_interval)
+
+            if locked_since is not None:
+                self._add_lock_hold_time(time.perf_counter() - locked_since)
+
+    def _add_lock_hold_time(self, lock_hold_time: float):
+        self.lock_hold_time += lock_hold_time
+        self.longest_lock_hold_time = max(self.longest_lock_hold_time, lock_hold_time)
+
+
+def get_wal_lsn(connection: sqlalchemy.engine.Connection) -> str:
+    return connection.execute(sqlalchemy.text("SELECT CAST(pg_catalog.pg_current_wal_lsn() AS text)")).scalar()
+
+
+def get_wal_bytes_since(connection: sqlalchemy.engine.Connection, wal_lsn: str) -> int:
+    return int(
+        connection.execute(
+            sqlalchemy.text("SELECT pg_catalog.pg_wal_lsn_diff(pg_catalog.pg_current_wal_lsn(), CAST(:lsn AS pg_lsn))"),
+            dict(lsn=wal_lsn),
+        ).scalar()
+    )
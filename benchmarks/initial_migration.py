@@ -0,0 +1,128 @@
+"""
+Benchmark of autogenerating and rendering an initial migration of many tables with enum columns
+
+python -m benchmarks.initial_migration --scales 5k --output initial_migration.jsonl
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+import sqlalchemy
+from alembic.autogenerate import produce_migrations, render_python_code
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import MetaData, Table, Column, Integer
+from sqlalchemy.dialects import postgresql
+
+from .common import (
+    BENCHMARK_SCHEMA_PREFIX,
+    create_engine,
+    drop_benchmark_schemas,
+    get_common_result_fields,
+    measure,
+    parse_choices,
+    write_result,
+)
+
+SCHEMA = f"{BENCHMARK_SCHEMA_PREFIX}initial_migration"
+
+SCALES: Dict[str, int] = {
+    "1k": 1000,
+    "5k": 5000,
+}
+
+
+def build_metadata(table_count: int) -> MetaData:
+    """
+    Build metadata where every table has its own sqlalchemy.Enum column, array of sqlalchemy.Enum column
+    and postgresql.ENUM column, so every enum column is converted or gets create_type=False
+    """
+    metadata = MetaData()
+    for table_index in range(table_count):
+        values = [f"value_{value_index}" for value_index in range(4)]
+        Table(
+            f"table_{table_index}",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column(
+                "status",
+                sqlalchemy.Enum(*values, name=f"status_{table_index}", schema=SCHEMA),
+                server_default="value_0",
+            ),
+            Column(
+                "statuses",
+                postgresql.ARRAY(sqlalchemy.Enum(*values, name=f"array_status_{table_index}", schema=SCHEMA)),
+            ),
+            Column("kind", postgresql.ENUM(*values, name=f"kind_{table_index}", schema=SCHEMA)),
+            schema=SCHEMA,
+        )
+    return metadata
+
+
+def include_benchmark_schema(name: Optional[str], type_: str, parent_names) -> bool:
+    return type_ != "schema" or name == SCHEMA
+
+
+def run_benchmark(scale_name: str, repeat: int, output: Optional[str]):
+    table_count = SCALES[scale_name]
+    engine = create_engine()
+    with engine.connect() as connection:
+        drop_benchmark_schemas(connection)
+        connection.execute(sqlalchemy.text(f'CREATE SCHEMA "{SCHEMA}"'))
+        connection.commit()
+        try:
+            for run_index in range(repeat):
+                # Autogenerate changes column types in place, so every run gets fresh metadata
+                metadata = build_metadata(table_count)
+                migration_context = MigrationContext.configure(
+                    connection,
+                    opts={
+                        "target_metadata": metadata,
+                        "include_schemas": True,
+                        "include_name": include_benchmark_schema,
+                    },
+                )
+                with measure() as measurement:
+                    migration_script = produce_migrations(migration_context, metadata)
+
+                started_at = time.perf_counter()
+                render_python_code(migration_script.upgrade_ops)
+                render_time = time.perf_counter() - started_at
+
+                write_result(
+                    {
+                        "benchmark": "initial_migration",
+                        "scale": scale_name,
+                        "table_count": table_count,
+                        "run": run_index,
+                        "operation_count": len(migration_script.upgrade_ops.ops),
+                        "wall_time": measurement.wall_time,
+                        "render_time": render_time,
+                        "query_count": measurement.query_count,
+                        "phases": measurement.phases,
+                        **get_common_result_fields(),
+                    },
+                    output,
+                )
+        finally:
+            connection.rollback()
+            drop_benchmark_schemas(connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.initial_migration",
+        description="Measure autogenerate and render time of an initial migration of many tables with enum columns, "
+        "results are written as JSON lines",
+    )
+    parser.add_argument("--scales", default="5k", help=f"Comma separated table counts: {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of measured runs of every scale")
+    parser.add_argument("--output", help="File to append results to, stdout by default")
+    args = parser.parse_args()
+
+    for scale_name in parse_choices(args.scales, SCALES):
+        run_benchmark(scale_name, args.repeat, args.output)
+
+
+if __name__ == "__main__":
+    main()
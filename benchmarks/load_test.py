@@ -0,0 +1,296 @@
+"""
+Latency of a concurrent read/write workload while op.sync_enum_values runs
+
+python -m benchmarks.load_test --scale 1m --strategies rewrite,online --format text
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Sequence
+
+import sqlalchemy
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.get_enum_data import LockRetry, OnlineSync
+from .common import create_engine, drop_benchmark_schemas, get_common_result_fields, parse_choices, write_result
+from .sync_enum_values import (
+    CHANGES,
+    ENUM_NAME,
+    SCALES,
+    SCHEMA,
+    TABLE_NAME_WITH_SCHEMA,
+    get_affected_columns,
+    prepare_table,
+)
+
+WORKLOAD_APPLICATION_NAME = "enum_sync_load_test"
+
+STRATEGIES: Dict[str, Dict[str, Any]] = {
+    "rewrite": {},
+    "lock_retry": {"lock_retry": LockRetry(lock_timeout="50ms", retries=50, backoff=0.05)},
+    "online": {"online": OnlineSync(batch_size=10000)},
+}
+
+# Share of reads, updates and inserts in the workload
+QUERY_KINDS = ("read", "update", "insert")
+QUERY_KIND_WEIGHTS = (0.7, 0.2, 0.1)
+
+QUERIES = {
+    "read": f"SELECT status, previous_status, status_history FROM {TABLE_NAME_WITH_SCHEMA} WHERE id = :id",
+    "update": f"UPDATE {TABLE_NAME_WITH_SCHEMA} SET previous_status = status WHERE id = :id",
+    "insert": f"INSERT INTO {TABLE_NAME_WITH_SCHEMA} DEFAULT VALUES",
+}
+
+
+@dataclass(frozen=True)
+class QuerySample:
+    started_at: float
+    latency: float
+    kind: str
+    error: Optional[str]
+
+
+class Workload:
+    """Runs queries of QUERY_KINDS from a pool of threads, every thread uses its own autocommit connection"""
+
+    def __init__(self, engine: sqlalchemy.engine.Engine, row_count: int, worker_count: int, started_at: float):
+        self.engine = engine
+        self.row_count = row_count
+        self.started_at = started_at
+        self.samples: List[QuerySample] = []
+        self._samples_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(worker_count)]
+
+    def __enter__(self) -> "Workload":
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        queries = {kind: sqlalchemy.text(sql) for kind, sql in QUERIES.items()}
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            while not self._stopped.is_set():
+                kind = random.choices(QUERY_KINDS, QUERY_KIND_WEIGHTS)[0]
+                error = None
+                started_at = time.perf_counter()
+                try:
+                    connection.execute(queries[kind], dict(id=random.randint(1, self.row_count)))
+                except sqlalchemy.exc.DBAPIError as exception:
+                    error = type(exception.orig).__name__
+                finally:
+                    finished_at = time.perf_counter()
+
+                with self._samples_lock:
+                    self.samples.append(
+                        QuerySample(started_at - self.started_at, finished_at - started_at, kind, error)
+                    )
+
+
+class LockWaitSampler:
+    """Samples number of workload sessions waiting for a lock from pg_stat_activity"""
+
+    def __init__(self, engine: sqlalchemy.engine.Engine, started_at: float, interval: float = 0.05):
+        self.engine = engine
+        self.started_at = started_at
+        self.interval = interval
+        self.samples: List[Sequence[float]] = []
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "LockWaitSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        sql = sqlalchemy.text(
+            """
+            SELECT count(*) FROM pg_catalog.pg_stat_activity
+            WHERE application_name = :application_name AND wait_event_type = 'Lock'
+        """
+        )
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            while not self._stopped.is_set():
+                waiting_count = connection.execute(sql, dict(application_name=WORKLOAD_APPLICATION_NAME)).scalar()
+                self.samples.append((time.perf_counter() - self.started_at, waiting_count))
+                self._stopped.wait(self.interval)
+
+
+def percentile(values: Sequence[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values"""
+    if not values:
+        return None
+    sorted_values = sorted(values)
+    rank = max(int(round(percent / 100 * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: Sequence[QuerySample], lock_wait_samples: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    latencies = [sample.latency for sample in samples if sample.error is None]
+    return {
+        "query_count": len(samples),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=None),
+        "error_count": sum(sample.error is not None for sample in samples),
+        "max_lock_waiters": max((waiting_count for _, waiting_count in lock_wait_samples), default=0),
+    }
+
+
+def build_report(
+    workload: Workload,
+    lock_wait_sampler: LockWaitSampler,
+    sync_started_at: float,
+    sync_finished_at: float,
+    bucket: float,
+) -> Dict[str, Any]:
+    samples = workload.samples
+    lock_wait_samples = lock_wait_sampler.samples
+
+    def select(started_at: float, finished_at: float):
+        return (
+            [sample for sample in samples if started_at <= sample.started_at < finished_at],
+            [sample for sample in lock_wait_samples if started_at <= sample[0] < finished_at],
+        )
+
+    end = max((sample.started_at for sample in samples), default=sync_finished_at)
+    timeline = []
+    bucket_started_at = 0.0
+    while bucket_started_at <= end:
+        timeline.append(
+            {"time": bucket_started_at, **summarize(*select(bucket_started_at, bucket_started_at + bucket))}
+        )
+        bucket_started_at += bucket
+
+    return {
+        "sync_started_at": sync_started_at,
+        "sync_finished_at": sync_finished_at,
+        "summary": {
+            "before": summarize(*select(0.0, sync_started_at)),
+            "during": summarize(*select(sync_started_at, sync_finished_at)),
+            "after": summarize(*select(sync_finished_at, float("inf"))),
+        },
+        "errors": dict(Counter(sample.error for sample in samples if sample.error is not None)),
+        "timeline": timeline,
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    def format_latency(latency: Optional[float]) -> str:
+        return "-" if latency is None else f"{latency * 1000:.1f}ms"
+
+    lines = [
+        f"{result['strategy']} ({result['change']}, {result['row_count']} rows, {result['worker_count']} workers): "
+        f"sync from {result['sync_started_at']:.1f}s to {result['sync_finished_at']:.1f}s"
+    ]
+    for period, stats in result["summary"].items():
+        lines.append(
+            f"    {period:<6} queries {stats['query_count']:>7}, p50 {format_latency(stats['p50'])}, "
+            f"p99 {format_latency(stats['p99'])}, max {format_latency(stats['max'])}, "
+            f"errors {stats['error_count']}, lock waiters {stats['max_lock_waiters']}"
+        )
+    for error, count in result["errors"].items():
+        lines.append(f"    {error}: {count}")
+    return "\n".join(lines)
+
+
+def run_load_test(
+    scale_name: str,
+    change_name: str,
+    strategy_name: str,
+    worker_count: int,
+    warm_up: float,
+    cool_down: float,
+    bucket: float,
+) -> Dict[str, Any]:
+    row_count = SCALES[scale_name]
+    change = CHANGES[change_name]
+    engine = create_engine()
+    workload_engine = create_engine(
+        connect_args={"application_name": WORKLOAD_APPLICATION_NAME}, pool_size=worker_count
+    )
+    with engine.connect() as connection:
+        prepare_table(connection, row_count, with_indexes=False)
+        try:
+            affected_columns = get_affected_columns(connection)
+            connection.commit()
+            migration_context = MigrationContext.configure(connection)
+            operations = Operations(migration_context)
+
+            started_at = time.perf_counter()
+            with LockWaitSampler(engine, started_at) as lock_wait_sampler, Workload(
+                workload_engine, row_count, worker_count, started_at
+            ) as workload:
+                time.sleep(warm_up)
+                sync_started_at = time.perf_counter() - started_at
+                with migration_context.begin_transaction():
+                    operations.sync_enum_values(
+                        SCHEMA,
+                        ENUM_NAME,
+                        change.new_values,
+                        affected_columns,
+                        enum_values_to_rename=change.enum_values_to_rename,
+                        **STRATEGIES[strategy_name],
+                    )
+                sync_finished_at = time.perf_counter() - started_at
+                time.sleep(cool_down)
+
+            return {
+                "benchmark": "load_test",
+                "scale": scale_name,
+                "row_count": row_count,
+                "change": change_name,
+                "strategy": strategy_name,
+                "worker_count": worker_count,
+                **build_report(workload, lock_wait_sampler, sync_started_at, sync_finished_at, bucket),
+                **get_common_result_fields(),
+            }
+        finally:
+            connection.rollback()
+            drop_benchmark_schemas(connection)
+            workload_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load_test",
+        description="Measure latency, lock waits and errors of a concurrent workload on the affected table "
+        "while op.sync_enum_values runs",
+    )
+    parser.add_argument("--scale", default="10k", choices=list(SCALES))
+    parser.add_argument("--change", default="removal", choices=list(CHANGES))
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help=f"Comma separated: {', '.join(STRATEGIES)}")
+    parser.add_argument("--workers", type=int, default=8, help="Number of workload threads")
+    parser.add_argument("--warm-up", type=float, default=2.0, help="Seconds of workload before the sync")
+    parser.add_argument("--cool-down", type=float, default=2.0, help="Seconds of workload after the sync")
+    parser.add_argument("--bucket", type=float, default=0.5, help="Seconds per timeline entry")
+    parser.add_argument("--format", choices=("json", "text"), default="json")
+    parser.add_argument("--output", help="File to append JSON results to, stdout by default")
+    args = parser.parse_args()
+
+    for strategy_name in parse_choices(args.strategies, STRATEGIES):
+        result = run_load_test(
+            args.scale, args.change, strategy_name, args.workers, args.warm_up, args.cool_down, args.bucket
+        )
+        if args.format == "text":
+            print(format_report(result))
+        else:
+            write_result(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmark of op.sync_enum_values on large tables
+
+python -m benchmarks.sync_enum_values --scales 1m --changes append,removal --output sync_enum_values.jsonl
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.configuration import get_configuration, set_configuration
+from alembic_postgresql_enum.get_enum_data import TableReference, ColumnType
+from .common import (
+    BENCHMARK_SCHEMA_PREFIX,
+    LockProbe,
+    create_engine,
+    drop_benchmark_schemas,
+    get_common_result_fields,
+    get_wal_bytes_since,
+    get_wal_lsn,
+    measure,
+    parse_choices,
+    write_result,
+)
+
+SCHEMA = f"{BENCHMARK_SCHEMA_PREFIX}sync"
+TABLE_NAME = "orders"
+ENUM_NAME = "order_status"
+TABLE_NAME_WITH_SCHEMA = f'"{SCHEMA}"."{TABLE_NAME}"'
+
+OLD_VALUES = ["created", "paid", "shipped", "delivered", "cancelled", "unused"]
+
+SCALES: Dict[str, int] = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+
+@dataclass(frozen=True)
+class EnumChange:
+    new_values: List[str]
+    enum_values_to_rename: List[Tuple[str, str]]
+    add_new_values_in_place: bool = False
+
+
+CHANGES: Dict[str, EnumChange] = {
+    "append": EnumChange(OLD_VALUES + ["returned"], []),
+    "append_in_place": EnumChange(OLD_VALUES + ["returned"], [], add_new_values_in_place=True),
+    "rename": EnumChange(
+        [value if value != "cancelled" else "canceled" for value in OLD_VALUES], [("cancelled", "canceled")]
+    ),
+    "removal": EnumChange([value for value in OLD_VALUES if value != "unused"], []),
+    "reorder": EnumChange(list(reversed(OLD_VALUES)), []),
+}
+
+AFFECTED_COLUMNS = [
+    TableReference(table_schema=SCHEMA, table_name=TABLE_NAME, column_name="status"),
+    TableReference(table_schema=SCHEMA, table_name=TABLE_NAME, column_name="previous_status"),
+    TableReference(
+        table_schema=SCHEMA, table_name=TABLE_NAME, column_name="status_history", column_type=ColumnType.ARRAY
+    ),
+]
+
+
+def prepare_table(connection: sqlalchemy.engine.Connection, row_count: int, with_indexes: bool = True):
+    """
+    Create a table with a defaulted enum column, a nullable enum column and an array of enum column,
+    and fill it with row_count rows of used values.
+    Indexes on enum columns are not created if with_indexes is False, online sync rejects indexed columns
+    """
+    drop_benchmark_schemas(connection)
+    enum_type_name = f'"{SCHEMA}"."{ENUM_NAME}"'
+    used_values = ", ".join(f"'{value}'" for value in OLD_VALUES if value != "unused")
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        CREATE SCHEMA "{SCHEMA}";
+        CREATE TYPE {enum_type_name} AS ENUM ({", ".join(f"'{value}'" for value in OLD_VALUES)});
+        CREATE TABLE {TABLE_NAME_WITH_SCHEMA} (
+            id bigserial PRIMARY KEY,
+            status {enum_type_name} NOT NULL DEFAULT 'created',
+            previous_status {enum_type_name},
+            status_history {enum_type_name}[] NOT NULL DEFAULT '{{}}'
+        );
+        INSERT INTO {TABLE_NAME_WITH_SCHEMA} (status, previous_status, status_history)
+        SELECT
+            (ARRAY[{used_values}]::{enum_type_name}[])[i % 5 + 1],
+            CASE WHEN i % 2 = 0 THEN (ARRAY[{used_values}]::{enum_type_name}[])[(i + 1) % 5 + 1] END,
+            (ARRAY[{used_values}]::{enum_type_name}[])[1:i % 5 + 1]
+        FROM generate_series(1, :row_count) AS i;
+        ANALYZE {TABLE_NAME_WITH_SCHEMA};
+    """
+        ),
+        dict(row_count=row_count),
+    )
+    if with_indexes:
+        connection.execute(
+            sqlalchemy.text(
+                f"""
+            CREATE INDEX orders_status_idx ON {TABLE_NAME_WITH_SCHEMA} (status);
+            CREATE INDEX orders_previous_status_idx ON {TABLE_NAME_WITH_SCHEMA} (previous_status);
+        """
+            )
+        )
+    connection.commit()
+
+
+def get_affected_columns(connection: sqlalchemy.engine.Connection) -> List[TableReference]:
+    column_defaults = dict(
+        connection.execute(
+            sqlalchemy.text(
+                """
+            SELECT column_name, column_default FROM information_schema.columns
+            WHERE table_schema = :schema AND table_name = :table_name
+        """
+            ),
+            dict(schema=SCHEMA, table_name=TABLE_NAME),
+        ).all()
+    )
+    return [
+        replace(table_reference, existing_server_default=column_defaults[table_reference.column_name])
+        for table_reference in AFFECTED_COLUMNS
+    ]
+
+
+def measure_index_rebuild_time(connection: sqlalchemy.engine.Connection) -> float:
+    """
+    Time of rebuilding all indexes of the table. Index builds of a table rewrite are not reported separately,
+    so they are estimated with REINDEX of the rewritten table
+    """
+    started_at = time.perf_counter()
+    connection.execute(sqlalchemy.text(f"REINDEX TABLE {TABLE_NAME_WITH_SCHEMA}"))
+    connection.commit()
+    return time.perf_counter() - started_at
+
+
+def run_benchmark(scale_name: str, change_name: str, single_round_trip: bool, output: Optional[str]):
+    row_count = SCALES[scale_name]
+    change = CHANGES[change_name]
+    engine = create_engine()
+    with engine.connect() as connection:
+        prepare_table(connection, row_count)
+        try:
+            affected_columns = get_affected_columns(connection)
+            operations = Operations(MigrationContext.configure(connection))
+            wal_lsn = get_wal_lsn(connection)
+            connection.commit()
+
+            old_config = get_configuration()
+            set_configuration(
+                replace(
+                    old_config,
+                    add_new_values_in_place=change.add_new_values_in_place,
+                    single_round_trip_sync=single_round_trip,
+                )
+            )
+            try:
+                with LockProbe(engine, TABLE_NAME_WITH_SCHEMA) as lock_probe, measure() as measurement:
+                    operations.sync_enum_values(
+                        SCHEMA,
+                        ENUM_NAME,
+                        change.new_values,
+                        affected_columns,
+                        enum_values_to_rename=change.enum_values_to_rename,
+                    )
+                    connection.commit()
+            finally:
+                set_configuration(old_config)
+
+            wal_bytes = get_wal_bytes_since(connection, wal_lsn)
+            connection.commit()
+
+            index_rebuild_time = None
+            if "step.alter_table" in measurement.phases:
+                index_rebuild_time = measure_index_rebuild_time(connection)
+
+            write_result(
+                {
+                    "benchmark": "sync_enum_values",
+                    "scale": scale_name,
+                    "row_count": row_count,
+                    "change": change_name,
+                    "single_round_trip": single_round_trip,
+                    "total_time": measurement.wall_time,
+                    "lock_hold_time": lock_probe.lock_hold_time,
+                    "longest_lock_hold_time": lock_probe.longest_lock_hold_time,
+                    "wal_bytes": wal_bytes,
+                    "index_rebuild_time": index_rebuild_time,
+                    "query_count": measurement.query_count,
+                    "phases": measurement.phases,
+                    **get_common_result_fields(),
+                },
+                output,
+            )
+        finally:
+            connection.rollback()
+            drop_benchmark_schemas(connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.sync_enum_values",
+        description="Measure total time, lock hold time, generated WAL and index rebuild time of op.sync_enum_values "
+        "on a large table, results are written as JSON lines",
+    )
+    parser.add_argument("--scales", default="10k", help=f"Comma separated row counts: {', '.join(SCALES)}")
+    parser.add_argument("--changes", default=",".join(CHANGES), help=f"Comma separated changes: {', '.join(CHANGES)}")
+    parser.add_argument(
+        "--single-round-trip", action="store_true", help="Sync with single_round_trip_sync configuration flag"
+    )
+    parser.add_argument("--output", help="File to append results to, stdout by default")
+    args = parser.parse_args()
+
+    for scale_name in parse_choices(args.scales, SCALES):
+        for change_name in parse_choices(args.changes, CHANGES):
+            run_benchmark(scale_name, change_name, args.single_round_trip, args.output)
+
+
+if __name__ == "__main__":
+    main()
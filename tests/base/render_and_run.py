@@ -7,7 +7,7 @@ from alembic.operations import Operations
 from sqlalchemy import MetaData
 from sqlalchemy.dialects import postgresql
 
-from alembic_postgresql_enum import ColumnType, TableReference
+from alembic_postgresql_enum import ColumnType, EnumValuesSync, TableReference, EnumDefinition
 from tests.utils.migration_context import create_migration_context
 
 if TYPE_CHECKING:
@@ -54,6 +54,8 @@ def compare_and_run(
             "postgresql": postgresql,
             "ColumnType": ColumnType,
             "TableReference": TableReference,
+            "EnumValuesSync": EnumValuesSync,
+            "EnumDefinition": EnumDefinition,
         },
     )
     exec(
@@ -64,5 +66,7 @@ def compare_and_run(
             "postgresql": postgresql,
             "ColumnType": ColumnType,
             "TableReference": TableReference,
+            "EnumValuesSync": EnumValuesSync,
+            "EnumDefinition": EnumDefinition,
         },
     )
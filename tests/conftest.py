@@ -1,6 +1,21 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 # noinspection PyUnresolvedReferences
 import alembic_postgresql_enum
+from alembic_postgresql_enum.configuration import Config, get_configuration, set_configuration
 
 pytest_plugins = [
     "tests.fixtures",
 ]
+
+
+@contextmanager
+def configured(config: Config) -> Iterator[Config]:
+    """Use the given configuration within the block and restore the previous one afterwards"""
+    old_config = get_configuration()
+    set_configuration(config)
+    try:
+        yield config
+    finally:
+        set_configuration(old_config)
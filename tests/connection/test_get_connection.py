@@ -0,0 +1,63 @@
+from typing import TYPE_CHECKING
+
+import pytest
+import sqlalchemy
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.connection import get_connection, get_connection_metrics, reset_connection_metrics
+from alembic_postgresql_enum.get_enum_data import get_defined_enums
+from tests.fixtures.db import database_uri
+from tests.schemas import DEFAULT_SCHEMA
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+class EngineOperations:
+    """Operations bound to an Engine instead of a migration connection"""
+
+    def __init__(self, engine: sqlalchemy.engine.Engine):
+        self.engine = engine
+
+    def get_bind(self):
+        return self.engine
+
+
+def test_get_connection_reuses_migration_connection(connection: "Connection"):
+    operations = Operations(MigrationContext.configure(connection))
+    reset_connection_metrics()
+
+    for _ in range(3):
+        with get_connection(operations) as operation_connection:
+            assert operation_connection is connection
+
+    metrics = get_connection_metrics()
+    assert (metrics.reused, metrics.checked_out, metrics.in_use) == (3, 0, 0)
+
+
+def test_get_connection_returns_engine_connections_to_pool(connection: "Connection"):
+    # Make the recreated schema visible to connections of the pool
+    connection.commit()
+    engine = sqlalchemy.create_engine(database_uri, pool_size=1, max_overflow=0, pool_timeout=1)
+    operations = EngineOperations(engine)
+    reset_connection_metrics()
+
+    try:
+        for index in range(5):
+            with get_connection(operations) as operation_connection:
+                operation_connection.execute(sqlalchemy.text(f"CREATE TYPE engine_enum_{index} AS ENUM ('a')"))
+
+        with pytest.raises(sqlalchemy.exc.ProgrammingError):
+            with get_connection(operations) as operation_connection:
+                operation_connection.execute(sqlalchemy.text("CREATE TYPE engine_enum_failed AS ENUM ('a')"))
+                operation_connection.execute(sqlalchemy.text("CREATE TYPE engine_enum_0 AS ENUM ('a')"))
+
+        assert engine.pool.checkedout() == 0
+        metrics = get_connection_metrics()
+        assert (metrics.reused, metrics.checked_out, metrics.returned, metrics.in_use) == (0, 6, 6, 0)
+
+        # Successful operations are committed, failed one is rolled back
+        assert set(get_defined_enums(connection, DEFAULT_SCHEMA)) == {f"engine_enum_{index}" for index in range(5)}
+    finally:
+        engine.dispose()
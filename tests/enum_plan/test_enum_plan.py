@@ -0,0 +1,272 @@
+import textwrap
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+from alembic.autogenerate import produce_migrations
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import MetaData, Table, Column, Integer, Index
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum.configuration import Config
+from alembic_postgresql_enum.enum_plan import enum_plan, estimate_upgrade_ops, format_enum_plan
+from alembic_postgresql_enum.get_enum_data import get_defined_enums
+from tests.conftest import configured
+from tests.schemas import DEFAULT_SCHEMA
+from tests.utils.migration_context import create_migration_context
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+def get_schema_with_enums(status_variants, kind_variants) -> MetaData:
+    schema = MetaData()
+
+    Table(
+        "orders",
+        schema,
+        Column("id", Integer, primary_key=True),
+        Column("status", postgresql.ENUM(*status_variants, name="order_status")),
+        Index("orders_status_idx", "status"),
+    )
+    Table(
+        "shipments",
+        schema,
+        Column("id", Integer, primary_key=True),
+        Column("kind", postgresql.ENUM(*kind_variants, name="shipment_kind")),
+    )
+
+    return schema
+
+
+def test_estimate_upgrade_ops(connection: "Connection"):
+    database_schema = get_schema_with_enums(["active", "passive", "banned"], ["ground", "air"])
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            """
+        INSERT INTO orders (status) SELECT 'active' FROM generate_series(1, 1000);
+        ANALYZE orders;
+    """
+        )
+    )
+
+    target_schema = get_schema_with_enums(["active", "passive"], ["ground", "air", "sea"])
+    with configured(Config(add_new_values_in_place=True)):
+        migration_script = produce_migrations(create_migration_context(connection, target_schema), target_schema)
+
+        order_status_estimate, shipment_kind_estimate = estimate_upgrade_ops(connection, migration_script.upgrade_ops)
+
+    assert order_status_estimate.enum_names == ("public.order_status",)
+    assert order_status_estimate.rewrite_required
+    (orders_estimate,) = order_status_estimate.tables
+    assert orders_estimate.table_name_with_schema == '"public"."orders"'
+    assert orders_estimate.strategy == "rewrite"
+    assert orders_estimate.tuples == 1000
+    assert orders_estimate.pages > 0
+    assert orders_estimate.total_size > 0
+    assert orders_estimate.rebuilt_indexes == ("orders_pkey", "orders_status_idx")
+    assert orders_estimate.estimated_seconds > 0
+
+    # Appended value is added with ALTER TYPE ... ADD VALUE
+    assert shipment_kind_estimate.enum_names == ("public.shipment_kind",)
+    assert not shipment_kind_estimate.rewrite_required
+    assert shipment_kind_estimate.estimated_seconds == 0
+
+    report = format_enum_plan([order_status_estimate, shipment_kind_estimate])
+    assert '"public"."orders": rewrite, ' in report
+    assert "rebuilt indexes: orders_pkey, orders_status_idx" in report
+    assert '"public"."shipments": catalog only, ' in report
+
+
+def test_enum_plan_command(connection: "Connection", tmp_path: Path):
+    database_schema = get_schema_with_enums(["active", "passive", "banned"], ["ground", "air"])
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            """
+        INSERT INTO orders (status) VALUES ('banned');
+        INSERT INTO shipments (kind) VALUES ('ground');
+    """
+        )
+    )
+
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "env.py").write_text(
+        textwrap.dedent(
+            """
+        from alembic import context
+
+        context.configure(connection=context.config.attributes["connection"])
+        with context.begin_transaction():
+            context.run_migrations()
+    """
+        )
+    )
+    (tmp_path / "versions" / "0001_change_enums.py").write_text(
+        textwrap.dedent(
+            f"""
+        from alembic import op
+        import sqlalchemy as sa
+        from alembic_postgresql_enum import TableReference
+
+        revision = "0001"
+        down_revision = None
+
+
+        def upgrade():
+            op.create_table("new_table", sa.Column("id", sa.Integer, primary_key=True))
+            op.sync_enum_values(
+                enum_schema="{DEFAULT_SCHEMA}",
+                enum_name="order_status",
+                new_values=["active", "passive"],
+                affected_columns=[TableReference(table_schema="{DEFAULT_SCHEMA}", table_name="orders", column_name="status")],
+                enum_values_to_rename=[],
+            )
+            op.execute("DELETE FROM orders")
+            op.get_bind().execute(sa.text("UPDATE shipments SET kind = 'air'"))
+
+
+        def downgrade():
+            pass
+    """
+        )
+    )
+
+    alembic_config = AlembicConfig()
+    alembic_config.set_main_option("script_location", str(tmp_path))
+    alembic_config.attributes["connection"] = connection
+
+    (order_status_estimate,) = enum_plan(alembic_config)
+
+    assert order_status_estimate.enum_names == ("public.order_status",)
+    assert [table.strategy for table in order_status_estimate.tables] == ["rewrite"]
+
+    # Nothing was executed
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+        "order_status": ("active", "passive", "banned"),
+        "shipment_kind": ("ground", "air"),
+    }
+    assert not sqlalchemy.inspect(connection).has_table("new_table")
+    assert not sqlalchemy.inspect(connection).has_table("alembic_version")
+    assert connection.execute(sqlalchemy.text("SELECT status FROM orders")).scalars().all() == ["banned"]
+    assert connection.execute(sqlalchemy.text("SELECT kind FROM shipments")).scalars().all() == ["ground"]
+
+
+def test_estimate_upgrade_ops_with_created_table(connection: "Connection"):
+    database_schema = get_schema_with_enums(["active", "passive", "banned"], ["ground", "air"])
+    database_schema.create_all(connection)
+
+    target_schema = get_schema_with_enums(["active", "passive"], ["ground", "air"])
+    Table(
+        "archived_orders",
+        target_schema,
+        Column("id", Integer, primary_key=True),
+        Column("status", postgresql.ENUM("active", "passive", name="order_status")),
+    )
+    migration_script = produce_migrations(create_migration_context(connection, target_schema), target_schema)
+
+    statements = []
+
+    def on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(connection, "before_cursor_execute", on_before_cursor_execute)
+    try:
+        (order_status_estimate,) = estimate_upgrade_ops(connection, migration_script.upgrade_ops)
+    finally:
+        sqlalchemy.event.remove(connection, "before_cursor_execute", on_before_cursor_execute)
+
+    # Sizes of existing and missing tables are fetched together
+    assert len([statement for statement in statements if "pg_total_relation_size" in statement]) == 1
+
+    tables = {table.table_name_with_schema: table for table in order_status_estimate.tables}
+    assert tables['"public"."orders"'].strategy == "rewrite"
+    archived_orders_estimate = tables['"public"."archived_orders"']
+    assert archived_orders_estimate.strategy == "created in this migration"
+    assert (archived_orders_estimate.total_size, archived_orders_estimate.rebuilt_indexes) == (0, ())
+    assert archived_orders_estimate.estimated_seconds == 0
+
+    assert '"public"."archived_orders": created in this migration\n' in format_enum_plan([order_status_estimate])
+
+
+def test_enum_plan_command_with_table_created_by_previous_revision(connection: "Connection", tmp_path: Path):
+    database_schema = get_schema_with_enums(["active", "passive", "banned"], ["ground", "air"])
+    database_schema.create_all(connection)
+
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "env.py").write_text(
+        textwrap.dedent(
+            """
+        from alembic import context
+
+        context.configure(connection=context.config.attributes["connection"])
+        with context.begin_transaction():
+            context.run_migrations()
+    """
+        )
+    )
+    (tmp_path / "versions" / "0001_create_table.py").write_text(
+        textwrap.dedent(
+            """
+        from alembic import op
+        import sqlalchemy as sa
+        from sqlalchemy.dialects import postgresql
+
+        revision = "0001"
+        down_revision = None
+
+
+        def upgrade():
+            op.create_table(
+                "archived_orders",
+                sa.Column("id", sa.Integer, primary_key=True),
+                sa.Column("status", postgresql.ENUM(name="order_status", create_type=False)),
+            )
+
+
+        def downgrade():
+            pass
+    """
+        )
+    )
+    (tmp_path / "versions" / "0002_change_enum.py").write_text(
+        textwrap.dedent(
+            f"""
+        from alembic import op as migration_op
+        from alembic_postgresql_enum import TableReference
+
+        revision = "0002"
+        down_revision = "0001"
+
+
+        def upgrade():
+            migration_op.sync_enum_values(
+                enum_schema="{DEFAULT_SCHEMA}",
+                enum_name="order_status",
+                new_values=["active", "passive"],
+                affected_columns=[
+                    TableReference(table_schema="{DEFAULT_SCHEMA}", table_name="orders", column_name="status"),
+                    TableReference(table_schema="{DEFAULT_SCHEMA}", table_name="archived_orders", column_name="status"),
+                ],
+                enum_values_to_rename=[],
+            )
+
+
+        def downgrade():
+            pass
+    """
+        )
+    )
+
+    alembic_config = AlembicConfig()
+    alembic_config.set_main_option("script_location", str(tmp_path))
+    alembic_config.attributes["connection"] = connection
+
+    (order_status_estimate,) = enum_plan(alembic_config)
+
+    assert [(table.table_name_with_schema, table.strategy) for table in order_status_estimate.tables] == [
+        ('"public"."orders"', "rewrite"),
+        ('"public"."archived_orders"', "created in this migration"),
+    ]
+    assert order_status_estimate.rewrite_required
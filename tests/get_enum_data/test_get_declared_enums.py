@@ -1,8 +1,14 @@
 import random
 from typing import TYPE_CHECKING
 
-from alembic_postgresql_enum.get_enum_data import TableReference, get_declared_enums
+import sqlalchemy
+from sqlalchemy import MetaData, Table, Column, Integer
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum.get_enum_data import TableReference, get_declared_enums, get_declared_enums_by_schema
+from alembic_postgresql_enum.sql_commands.column_default import get_column_defaults
 from tests.schemas import (
+    ANOTHER_SCHEMA_NAME,
     get_schema_with_enum_variants,
     DEFAULT_SCHEMA,
     USER_STATUS_ENUM_NAME,
@@ -65,3 +71,88 @@ def test_can_filter_by_name(connection: "Connection"):
 
     assert set(enum_to_include) == set(function_result.enum_values)
     assert set(enum_to_include) == set(function_result.enum_table_references)
+
+
+def test_with_server_default(connection: "Connection"):
+    enum_variants = ["active", "passive"]
+    database_schema = MetaData()
+    Table(
+        "orders",
+        database_schema,
+        Column("id", Integer, primary_key=True),
+        Column("status", postgresql.ENUM(*enum_variants, name="order_status"), server_default=enum_variants[1]),
+    )
+    database_schema.create_all(connection)
+
+    column_defaults = get_column_defaults(connection, [(DEFAULT_SCHEMA, "orders")])
+
+    assert column_defaults == {
+        (DEFAULT_SCHEMA, "orders", "id"): "nextval('orders_id_seq'::regclass)",
+        (DEFAULT_SCHEMA, "orders", "status"): "'passive'::order_status",
+    }
+
+    function_result = get_declared_enums(database_schema, DEFAULT_SCHEMA, DEFAULT_SCHEMA, connection)
+
+    assert function_result.enum_table_references == {
+        "order_status": frozenset(
+            (
+                TableReference(
+                    table_schema=DEFAULT_SCHEMA,
+                    table_name="orders",
+                    column_name="status",
+                    existing_server_default="'passive'::order_status",
+                ),
+            )
+        )
+    }
+
+
+def test_server_defaults_are_fetched_lazily(connection: "Connection"):
+    declared_enum_values = get_declared_enum_values_with_orders_and_users()
+    declared_schema = get_schema_by_declared_enum_values(declared_enum_values)
+
+    executed_statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed_statements.append(statement)
+
+    sqlalchemy.event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        function_result = get_declared_enums(declared_schema, DEFAULT_SCHEMA, DEFAULT_SCHEMA, connection)
+
+        assert function_result.enum_values == declared_enum_values.enum_values
+        assert set(function_result.enum_table_references) == set(declared_enum_values.enum_table_references)
+        assert executed_statements == []
+
+        assert (
+            function_result.enum_table_references["user_status_enum"]
+            == declared_enum_values.enum_table_references["user_status_enum"]
+        )
+        assert len(executed_statements) == 1
+    finally:
+        sqlalchemy.event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def test_grouped_by_schema(connection: "Connection"):
+    declared_schema = MetaData()
+    Table(
+        USER_TABLE_NAME,
+        declared_schema,
+        Column("id", Integer, primary_key=True),
+        Column(USER_STATUS_COLUMN_NAME, postgresql.ENUM("active", "passive", name=USER_STATUS_ENUM_NAME)),
+        Column(
+            "another_status",
+            postgresql.ENUM("active", "banned", name=USER_STATUS_ENUM_NAME, schema=ANOTHER_SCHEMA_NAME),
+        ),
+    )
+
+    function_result = get_declared_enums_by_schema(declared_schema, DEFAULT_SCHEMA, connection)
+
+    assert set(function_result) == {DEFAULT_SCHEMA, ANOTHER_SCHEMA_NAME}
+    assert function_result[DEFAULT_SCHEMA].enum_values == {USER_STATUS_ENUM_NAME: ("active", "passive")}
+    assert function_result[ANOTHER_SCHEMA_NAME].enum_values == {USER_STATUS_ENUM_NAME: ("active", "banned")}
+    assert function_result[ANOTHER_SCHEMA_NAME].enum_table_references == {
+        USER_STATUS_ENUM_NAME: frozenset(
+            (TableReference(table_schema=DEFAULT_SCHEMA, table_name=USER_TABLE_NAME, column_name="another_status"),)
+        )
+    }
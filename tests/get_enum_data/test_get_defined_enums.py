@@ -4,8 +4,13 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sqlalchemy import Connection
 
-from alembic_postgresql_enum.get_enum_data import get_defined_enums
+from sqlalchemy import MetaData, Table, Column, Integer
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum.get_enum_data import get_defined_enums, get_defined_enums_by_schema
 from tests.schemas import (
+    ANOTHER_SCHEMA_NAME,
+    USER_TABLE_NAME,
     get_schema_with_enum_variants,
     DEFAULT_SCHEMA,
     USER_STATUS_ENUM_NAME,
@@ -46,3 +51,26 @@ def test_get_defined_enums_will_filter_by_name(connection: "Connection"):
         connection, DEFAULT_SCHEMA, lambda enum_name: enum_name not in [enum_to_exclude]
     )
     assert enum_to_exclude not in function_result
+
+
+def test_get_defined_enums_by_schema(connection: "Connection"):
+    defined_schema = MetaData()
+    Table(
+        USER_TABLE_NAME,
+        defined_schema,
+        Column("id", Integer, primary_key=True),
+        Column("status", postgresql.ENUM("active", "passive", name=USER_STATUS_ENUM_NAME)),
+        Column(
+            "another_status",
+            postgresql.ENUM("active", "banned", name=USER_STATUS_ENUM_NAME, schema=ANOTHER_SCHEMA_NAME),
+        ),
+    )
+    defined_schema.create_all(connection)
+
+    function_result = get_defined_enums_by_schema(connection, [DEFAULT_SCHEMA, ANOTHER_SCHEMA_NAME, "empty"])
+
+    assert function_result == {
+        DEFAULT_SCHEMA: {USER_STATUS_ENUM_NAME: ("active", "passive")},
+        ANOTHER_SCHEMA_NAME: {USER_STATUS_ENUM_NAME: ("active", "banned")},
+        "empty": {},
+    }
@@ -0,0 +1,61 @@
+from alembic.operations.ops import (
+    UpgradeOps,
+    CreateTableOp,
+    ModifyTableOps,
+    AddColumnOp,
+    AlterColumnOp,
+)
+from sqlalchemy import Column, Integer, String, MetaData, Table, text
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum.add_postgres_using_to_text import PostgresUsingAlterColumnOp
+from alembic_postgresql_enum.preprocess_upgrade_ops import preprocess_upgrade_ops
+from tests.schemas import DEFAULT_SCHEMA, ANOTHER_SCHEMA_NAME
+
+
+def test_preprocess_upgrade_ops():
+    metadata = MetaData()
+    created_tables = [
+        Table(
+            "orders",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column(
+                "status",
+                postgresql.ENUM("new", "paid", name="order_status"),
+                server_default=text("'new'::order_status"),
+            ),
+            schema=ANOTHER_SCHEMA_NAME,
+        ),
+        Table("users", metadata, Column("id", Integer, primary_key=True)),
+        Table("payments", metadata, Column("id", Integer, primary_key=True), schema=ANOTHER_SCHEMA_NAME),
+    ]
+    added_column = Column("color", postgresql.ARRAY(postgresql.ENUM("red", "blue", name="color")))
+    alter_column_op = AlterColumnOp(
+        "cars",
+        "kind",
+        existing_type=String(),
+        modify_type=postgresql.ENUM("sedan", "coupe", name="car_kind"),
+        modify_server_default="'sedan'::car_kind",
+    )
+    upgrade_ops = UpgradeOps(
+        ops=[
+            *(CreateTableOp.from_table(table) for table in created_tables),
+            ModifyTableOps("cars", [AddColumnOp("cars", added_column), alter_column_op]),
+        ]
+    )
+
+    preprocessed_upgrade_ops = preprocess_upgrade_ops(upgrade_ops, DEFAULT_SCHEMA)
+
+    assert preprocessed_upgrade_ops.created_table_schemas == [ANOTHER_SCHEMA_NAME, None]
+    assert preprocessed_upgrade_ops.just_added_defaults == {
+        (ANOTHER_SCHEMA_NAME, "orders", "status"): "'new'::order_status",
+        (DEFAULT_SCHEMA, "cars", "kind"): "'sedan'::car_kind",
+    }
+
+    status_column = upgrade_ops.ops[0].columns[1]
+    assert repr(status_column.type) == "ENUM('new', 'paid', name='order_status', create_type=False)"
+    assert repr(added_column.type.item_type) == "ENUM('red', 'blue', name='color', create_type=False)"
+
+    assert isinstance(alter_column_op, PostgresUsingAlterColumnOp)
+    assert alter_column_op.kw["postgresql_using"] == "kind::car_kind"
@@ -0,0 +1,137 @@
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.configuration import Config
+from alembic_postgresql_enum.get_enum_data import TableReference, get_defined_enums
+from tests.conftest import configured
+from tests.schemas import DEFAULT_SCHEMA
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+def _create_partitioned_events_table(connection: "Connection"):
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        CREATE TYPE {DEFAULT_SCHEMA}.event_kind AS ENUM ('created', 'updated', 'removed', 'other');
+        CREATE TABLE {DEFAULT_SCHEMA}.events (
+            id integer NOT NULL,
+            created date NOT NULL,
+            kind {DEFAULT_SCHEMA}.event_kind NOT NULL DEFAULT 'created'
+        ) PARTITION BY RANGE (created);
+        CREATE TABLE {DEFAULT_SCHEMA}.events_2024_01 PARTITION OF {DEFAULT_SCHEMA}.events
+            FOR VALUES FROM ('2024-01-01') TO ('2024-02-01');
+        CREATE TABLE {DEFAULT_SCHEMA}.events_2024_02 PARTITION OF {DEFAULT_SCHEMA}.events
+            FOR VALUES FROM ('2024-02-01') TO ('2024-03-01') PARTITION BY HASH (id);
+        CREATE TABLE {DEFAULT_SCHEMA}.events_2024_02_0 PARTITION OF {DEFAULT_SCHEMA}.events_2024_02
+            FOR VALUES WITH (MODULUS 2, REMAINDER 0);
+        CREATE TABLE {DEFAULT_SCHEMA}.events_2024_02_1 PARTITION OF {DEFAULT_SCHEMA}.events_2024_02
+            FOR VALUES WITH (MODULUS 2, REMAINDER 1);
+        CREATE TABLE {DEFAULT_SCHEMA}.events_default PARTITION OF {DEFAULT_SCHEMA}.events DEFAULT;
+        CREATE INDEX events_kind_idx ON {DEFAULT_SCHEMA}.events (kind);
+
+        INSERT INTO {DEFAULT_SCHEMA}.events (id, created, kind) VALUES
+            (1, '2024-01-10', 'created'),
+            (2, '2024-02-10', 'updated'),
+            (3, '2024-02-11', 'removed'),
+            (4, '2025-01-01', DEFAULT);
+    """
+        )
+    )
+
+
+def test_sync_enum_values_alter_partitions_separately(connection: "Connection"):
+    _create_partitioned_events_table(connection)
+
+    executed_statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed_statements.append(statement)
+
+    ops = Operations(MigrationContext.configure(connection))
+
+    sqlalchemy.event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        with configured(Config(alter_partitions_separately=True)):
+            ops.sync_enum_values(
+                DEFAULT_SCHEMA,
+                "event_kind",
+                ["created", "updated", "deleted"],
+                [
+                    TableReference(
+                        table_schema=DEFAULT_SCHEMA,
+                        table_name="events",
+                        column_name="kind",
+                        existing_server_default="'created'::event_kind",
+                    )
+                ],
+                enum_values_to_rename=[("removed", "deleted")],
+            )
+    finally:
+        sqlalchemy.event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+    altered_tables = [
+        statement.split()[2]
+        for statement in executed_statements
+        if statement.startswith("ALTER TABLE") and "ALTER COLUMN" in statement
+    ]
+    assert altered_tables == [
+        "public.events_2024_01",
+        "public.events_2024_02_0",
+        "public.events_2024_02_1",
+        "public.events_2024_02",
+        "public.events_default",
+        '"public"."events"',
+    ]
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {"event_kind": ("created", "updated", "deleted")}
+    assert connection.execute(sqlalchemy.text(f"SELECT id, kind FROM {DEFAULT_SCHEMA}.events ORDER BY id")).all() == [
+        (1, "created"),
+        (2, "updated"),
+        (3, "deleted"),
+        (4, "created"),
+    ]
+    # All partitions are attached back with their bounds and without temporary constraints
+    assert (
+        connection.execute(
+            sqlalchemy.text(
+                """
+        SELECT c.relname, pg_catalog.pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_catalog.pg_inherits i
+        JOIN pg_catalog.pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'events'::regclass
+        ORDER BY c.relname
+    """
+            )
+        ).all()
+        == [
+            ("events_2024_01", "FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')"),
+            ("events_2024_02", "FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')"),
+            ("events_default", "DEFAULT"),
+        ]
+    )
+    # Indexes of partitions are attached back to the partitioned index
+    assert (
+        connection.execute(
+            sqlalchemy.text("SELECT count(*) FROM pg_catalog.pg_inherits WHERE inhparent = 'events_kind_idx'::regclass")
+        ).scalar()
+        == 3
+    )
+    assert (
+        connection.execute(
+            sqlalchemy.text("SELECT count(*) FROM pg_catalog.pg_constraint WHERE conname = 'enum_sync_partition_check'")
+        ).scalar()
+        == 0
+    )
+    assert (
+        connection.execute(
+            sqlalchemy.text(
+                f"INSERT INTO {DEFAULT_SCHEMA}.events (id, created) VALUES (5, '2024-01-02') RETURNING kind"
+            )
+        ).scalar()
+        == "created"
+    )
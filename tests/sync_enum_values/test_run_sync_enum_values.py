@@ -1,12 +1,19 @@
+import logging
+import threading
+
 import pytest
 import sqlalchemy
 from alembic.operations import Operations
 from alembic.runtime.migration import MigrationContext
 from sqlalchemy import Table, Column, Integer, MetaData
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine import Connection
 
-from alembic_postgresql_enum.get_enum_data import ColumnType, get_defined_enums
+from alembic_postgresql_enum.configuration import Config
+from alembic_postgresql_enum.get_enum_data import ColumnType, LockRetry, get_defined_enums
 from alembic_postgresql_enum.sql_commands.column_default import get_column_default
+from alembic_postgresql_enum.sql_commands.enum_type import add_type_value
+from tests.conftest import configured
 from tests.schemas import (
     get_schema_with_enum_variants,
     DEFAULT_SCHEMA,
@@ -233,3 +240,509 @@ def test_sync_enum_values_with_renamed_value_with_array(connection: "Connection"
     )
 
     assert users_entries == ["{black}", "{white,purple}"]
+
+
+def _get_enum_type_oid(connection: "Connection", enum_name: str) -> int:
+    return connection.execute(
+        sqlalchemy.text("SELECT oid FROM pg_catalog.pg_type WHERE typname = :enum_name"),
+        dict(enum_name=enum_name),
+    ).scalar()
+
+
+def test_sync_enum_values_add_new_values_in_place(connection: "Connection"):
+    old_enum_variants = ["active", "passive"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    old_enum_type_oid = _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME)
+
+    new_enum_variants = old_enum_variants + ["banned", "deleted"]
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(add_new_values_in_place=True)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            new_enum_variants,
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    defined = get_defined_enums(connection, DEFAULT_SCHEMA)
+
+    assert defined == {USER_STATUS_ENUM_NAME: tuple(new_enum_variants)}
+    # Type was altered, not recreated
+    assert _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME) == old_enum_type_oid
+
+
+def test_sync_enum_values_add_new_values_in_place_with_quotes_and_colons(connection: "Connection"):
+    old_enum_variants = ["active", "it's:old"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    old_enum_type_oid = _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME)
+
+    ops = Operations(MigrationContext.configure(connection))
+
+    with configured(Config(add_new_values_in_place=True)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            old_enum_variants + ["it's:new"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    enum_type_name = f'"{DEFAULT_SCHEMA}"."{USER_STATUS_ENUM_NAME}"'
+    add_type_value(connection, enum_type_name, "o'clock", before="it's:new")
+    add_type_value(connection, enum_type_name, "10:30", after="it's:old")
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+        USER_STATUS_ENUM_NAME: ("active", "it's:old", "10:30", "o'clock", "it's:new")
+    }
+    assert _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME) == old_enum_type_oid
+
+
+def test_sync_enum_values_add_new_values_in_place_not_appended(connection: "Connection"):
+    old_enum_variants = ["active", "passive"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    old_enum_type_oid = _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME)
+
+    new_enum_variants = ["banned", "active", "passive"]
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(add_new_values_in_place=True)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            new_enum_variants,
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    defined = get_defined_enums(connection, DEFAULT_SCHEMA)
+
+    assert defined == {USER_STATUS_ENUM_NAME: tuple(new_enum_variants)}
+    assert _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME) != old_enum_type_oid
+
+
+def test_sync_enum_values_rename_values_in_place(connection: "Connection"):
+    old_enum_variants = ["active", "passive"]
+
+    database_schema = MetaData()
+    Table(
+        "orders",
+        database_schema,
+        Column("id", Integer, primary_key=True),
+        Column(
+            "status",
+            sqlalchemy.Enum(*old_enum_variants, name="order_status"),
+            server_default=old_enum_variants[1],
+        ),
+    )
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text("INSERT INTO orders (status) VALUES ('active'), ('passive')"))
+    old_enum_type_oid = _get_enum_type_oid(connection, "order_status")
+
+    new_enum_variants = ["active", "inactive"]
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    ops.sync_enum_values(
+        DEFAULT_SCHEMA,
+        "order_status",
+        new_enum_variants,
+        (("orders", "status"),),
+        enum_values_to_rename=[("passive", "inactive")],
+    )
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {"order_status": tuple(new_enum_variants)}
+    assert get_column_default(connection, DEFAULT_SCHEMA, "orders", "status") == "'inactive'::order_status"
+    assert connection.execute(sqlalchemy.text("SELECT status FROM orders ORDER BY id")).scalars().all() == [
+        "active",
+        "inactive",
+    ]
+    # Type was altered, not recreated
+    assert _get_enum_type_oid(connection, "order_status") == old_enum_type_oid
+
+
+def test_sync_enum_values_rename_values_with_quotes_and_colons_in_place(connection: "Connection"):
+    database_schema = get_schema_with_enum_variants(["active", "it's:old"])
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(f"INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME}) VALUES ('it''s:old')")
+    )
+    old_enum_type_oid = _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME)
+
+    Operations(MigrationContext.configure(connection)).sync_enum_values(
+        DEFAULT_SCHEMA,
+        USER_STATUS_ENUM_NAME,
+        ["active", "it's:new"],
+        ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        enum_values_to_rename=[("it's:old", "it's:new")],
+    )
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {USER_STATUS_ENUM_NAME: ("active", "it's:new")}
+    assert _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME) == old_enum_type_oid
+    assert connection.execute(
+        sqlalchemy.text(f"SELECT {USER_STATUS_COLUMN_NAME}::text FROM {USER_TABLE_NAME}")
+    ).scalars().all() == ["it's:new"]
+
+
+def test_sync_enum_values_swap_values(connection: "Connection"):
+    old_enum_variants = ["active", "passive"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME}) VALUES ('active'), ('passive')
+    """
+        )
+    )
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    ops.sync_enum_values(
+        DEFAULT_SCHEMA,
+        USER_STATUS_ENUM_NAME,
+        old_enum_variants,
+        ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        enum_values_to_rename=[("active", "passive"), ("passive", "active")],
+    )
+
+    users_entries = (
+        connection.execute(sqlalchemy.text(f"SELECT {USER_STATUS_COLUMN_NAME} FROM {USER_TABLE_NAME} ORDER BY id"))
+        .scalars()
+        .all()
+    )
+
+    assert users_entries == ["passive", "active"]
+
+
+def test_sync_enum_values_validate_removed_values(connection: "Connection"):
+    old_enum_variants = ["active", "passive", "banned", "deleted"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME}) VALUES ('active'), ('banned'), ('banned')
+    """
+        )
+    )
+    old_enum_type_oid = _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME)
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(validate_removed_values=True)):
+        with pytest.raises(ValueError) as error:
+            ops.sync_enum_values(
+                DEFAULT_SCHEMA,
+                USER_STATUS_ENUM_NAME,
+                ["active", "passive"],
+                ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+            )
+
+    assert f"\"{USER_STATUS_COLUMN_NAME}\" contains 'banned' in 2 row(s)" in str(error.value)
+    assert "deleted" not in str(error.value)
+    # Nothing was rewritten, so transaction is still usable
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {USER_STATUS_ENUM_NAME: tuple(old_enum_variants)}
+    assert _get_enum_type_oid(connection, USER_STATUS_ENUM_NAME) == old_enum_type_oid
+
+
+def test_sync_enum_values_validate_removed_values_with_array(connection: "Connection"):
+    old_enum_variants = ["black", "white", "red", "violet"]
+
+    database_schema = get_schema_with_enum_in_array_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {CAR_TABLE_NAME} ({CAR_COLORS_COLUMN_NAME}) VALUES ('{{"black"}}'), ('{{"white", "violet"}}')
+    """
+        )
+    )
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(validate_removed_values=True)):
+        with pytest.raises(ValueError) as error:
+            ops.sync_enum_values(
+                DEFAULT_SCHEMA,
+                CAR_COLORS_ENUM_NAME,
+                ["black", "white", "purple"],
+                ((CAR_TABLE_NAME, CAR_COLORS_COLUMN_NAME, ColumnType.ARRAY),),
+                enum_values_to_rename=[("red", "purple")],
+            )
+
+        assert f"\"{CAR_COLORS_COLUMN_NAME}\" contains 'violet' in 1 row(s)" in str(error.value)
+
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            CAR_COLORS_ENUM_NAME,
+            ["black", "white", "purple"],
+            ((CAR_TABLE_NAME, CAR_COLORS_COLUMN_NAME, ColumnType.ARRAY),),
+            enum_values_to_rename=[("violet", "purple")],
+        )
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {CAR_COLORS_ENUM_NAME: ("black", "white", "purple")}
+
+
+@pytest.mark.parametrize("single_round_trip_sync", [False, True])
+def test_sync_enum_values_lock_retry(connection: "Connection", single_round_trip_sync: bool):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.commit()
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(single_round_trip_sync=single_round_trip_sync)):
+        with connection.engine.connect() as locking_connection:
+            locking_connection.execute(
+                sqlalchemy.text(f"LOCK TABLE {DEFAULT_SCHEMA}.{USER_TABLE_NAME} IN ACCESS SHARE MODE")
+            )
+
+            with pytest.raises(sqlalchemy.exc.OperationalError):
+                ops.sync_enum_values(
+                    DEFAULT_SCHEMA,
+                    USER_STATUS_ENUM_NAME,
+                    ["active", "passive"],
+                    ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+                    lock_retry=LockRetry(lock_timeout="50ms", retries=1, backoff=0.05),
+                )
+            connection.rollback()
+            assert get_defined_enums(connection, DEFAULT_SCHEMA)[USER_STATUS_ENUM_NAME] == tuple(old_enum_variants)
+
+            lock_release = threading.Timer(0.2, locking_connection.rollback)
+            lock_release.start()
+            try:
+                ops.sync_enum_values(
+                    DEFAULT_SCHEMA,
+                    USER_STATUS_ENUM_NAME,
+                    ["active", "passive"],
+                    ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+                    lock_retry=LockRetry(lock_timeout="50ms", retries=10, backoff=0.05),
+                )
+            finally:
+                lock_release.join()
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {USER_STATUS_ENUM_NAME: ("active", "passive")}
+    # lock_timeout is restored after the table is altered
+    assert connection.execute(sqlalchemy.text("SHOW lock_timeout")).scalar() == "0"
+
+    connection.rollback()
+    database_schema.drop_all(connection)
+    connection.commit()
+
+
+def test_sync_enum_values_canary(connection: "Connection", caplog: pytest.LogCaptureFixture):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME})
+        SELECT 'active' FROM generate_series(1, 1000)
+    """
+        )
+    )
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    caplog.set_level(logging.INFO)
+    with configured(Config(canary_sample_percent=100)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            ["active", "passive"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    (canary_message,) = [message for message in caplog.messages if message.startswith("Canary rewrite")]
+    assert f'"{DEFAULT_SCHEMA}"."{USER_TABLE_NAME}"' in canary_message
+    assert "projected rewrite time of the whole table" in canary_message
+    assert "unknown" not in canary_message
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {USER_STATUS_ENUM_NAME: ("active", "passive")}
+    # Sampled copy is removed together with its savepoint
+    assert connection.execute(sqlalchemy.text("SELECT to_regclass('pg_temp.enum_sync_canary')")).scalar() is None
+
+
+def test_sync_enum_values_canary_runs_before_type_is_renamed(connection: "Connection"):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text(f"INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME}) VALUES ('active')"))
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    events = []
+    with configured(
+        Config(canary_sample_percent=100, single_round_trip_sync=True, statement_listeners=[events.append])
+    ):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            ["active", "passive"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    kinds = list(dict.fromkeys(event.kind for event in events))
+    assert kinds == ["canary", "single_round_trip"]
+    # Canary does not split the round trip, the type is renamed together with the table alteration
+    (round_trip_event,) = [event for event in events if event.kind == "single_round_trip"]
+    assert round_trip_event.sql.startswith(f'ALTER TYPE "{DEFAULT_SCHEMA}"."{USER_STATUS_ENUM_NAME}" RENAME TO')
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {USER_STATUS_ENUM_NAME: ("active", "passive")}
+
+
+def test_sync_enum_values_statement_events(connection: "Connection", caplog: pytest.LogCaptureFixture):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            f"""
+        INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME})
+        SELECT 'active' FROM generate_series(1, 10)
+    """
+        )
+    )
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    events = []
+    caplog.set_level(logging.INFO)
+    with configured(Config(statement_listeners=[events.append], log_statement_timings=True)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            ["active", "passive"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    enum_name = f"{DEFAULT_SCHEMA}.{USER_STATUS_ENUM_NAME}"
+    assert list(dict.fromkeys(event.kind for event in events)) == [
+        "rename_type",
+        "create_type",
+        "create_comparison_operators",
+        "alter_table",
+        "drop_comparison_operators",
+        "drop_type",
+    ]
+    assert all(event.enum_names == (enum_name,) for event in events)
+    assert all(event.duration >= 0 for event in events)
+
+    (alter_table_event,) = [event for event in events if event.kind == "alter_table"]
+    assert alter_table_event.table_name_with_schema == f'"{DEFAULT_SCHEMA}"."{USER_TABLE_NAME}"'
+    assert alter_table_event.sql.startswith("ALTER TABLE")
+
+    (summary_message,) = [message for message in caplog.messages if message.startswith(f"Enum {enum_name} synced")]
+    assert f"with {len(events)} statement(s)" in summary_message
+    assert f'"{DEFAULT_SCHEMA}"."{USER_TABLE_NAME}"' in caplog.text
+
+
+def test_sync_enum_values_single_round_trip(connection: "Connection"):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = MetaData()
+    Table(
+        "orders",
+        database_schema,
+        Column("id", Integer, primary_key=True),
+        Column(
+            "status",
+            sqlalchemy.Enum(*old_enum_variants, name="order_status"),
+            server_default="passive",
+        ),
+    )
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text("INSERT INTO orders (status) VALUES ('active'), ('passive')"))
+
+    new_enum_variants = ["active", "inactive"]
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    events = []
+    with configured(Config(single_round_trip_sync=True, statement_listeners=[events.append])):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            "order_status",
+            new_enum_variants,
+            (("orders", "status"),),
+            enum_values_to_rename=[("passive", "inactive")],
+        )
+
+    (event,) = events
+    assert event.kind == "single_round_trip"
+    assert event.sql.startswith('ALTER TYPE "public"."order_status" RENAME TO order_status_old;')
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {"order_status": tuple(new_enum_variants)}
+    assert get_column_default(connection, DEFAULT_SCHEMA, "orders", "status") == "'inactive'::order_status"
+    assert connection.execute(sqlalchemy.text("SELECT status::text FROM orders ORDER BY id")).scalars().all() == [
+        "active",
+        "inactive",
+    ]
+
+
+def test_sync_enum_values_single_round_trip_raise_custom_exception(connection: "Connection"):
+    old_enum_variants = ["active", "passive", "banned"]
+
+    database_schema = get_schema_with_enum_variants(old_enum_variants)
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text(f"INSERT INTO {USER_TABLE_NAME} ({USER_STATUS_COLUMN_NAME}) VALUES ('banned')"))
+
+    mc = MigrationContext.configure(connection)
+    ops = Operations(mc)
+
+    with configured(Config(single_round_trip_sync=True)):
+        with pytest.raises(ValueError):
+            ops.sync_enum_values(
+                DEFAULT_SCHEMA,
+                USER_STATUS_ENUM_NAME,
+                ["active", "passive"],
+                ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+            )
+
+
+def test_sync_enum_values_single_round_trip_with_quotes_and_colons_in_values(connection: "Connection"):
+    database_schema = MetaData()
+    Table(
+        "meetings",
+        database_schema,
+        Column("id", Integer, primary_key=True),
+        Column("time", postgresql.ENUM("o'clock", "10:30", name="meeting_time")),
+    )
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text("INSERT INTO meetings (time) VALUES ('10:30')"))
+
+    new_enum_variants = ["o'clock", "10:30", "11:00"]
+
+    with configured(Config(single_round_trip_sync=True)):
+        Operations(MigrationContext.configure(connection)).sync_enum_values(
+            DEFAULT_SCHEMA, "meeting_time", new_enum_variants, (("meetings", "time"),)
+        )
+
+    assert get_defined_enums(connection, DEFAULT_SCHEMA) == {"meeting_time": tuple(new_enum_variants)}
+    assert connection.execute(sqlalchemy.text("SELECT time::text FROM meetings")).scalar() == "10:30"
@@ -0,0 +1,314 @@
+import logging
+from typing import TYPE_CHECKING, List
+
+import pytest
+import sqlalchemy
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import MetaData, Table, Column, Integer, Index
+from sqlalchemy.dialects import postgresql
+
+from alembic_postgresql_enum import EnumValuesSync
+from alembic_postgresql_enum.operations import sync_enum_values_online as sync_enum_values_online_module
+from alembic_postgresql_enum.get_enum_data import ColumnType, OnlineSync, TableReference, get_defined_enums
+from alembic_postgresql_enum.sql_commands.column_default import get_column_default
+from tests.schemas import DEFAULT_SCHEMA
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+def get_schema_with_enum_columns(status_variants: List[str], color_variants: List[str]) -> MetaData:
+    schema = MetaData()
+
+    Table(
+        "orders",
+        schema,
+        Column("id", Integer, primary_key=True),
+        Column(
+            "status",
+            postgresql.ENUM(*status_variants, name="order_status"),
+            nullable=False,
+            server_default=status_variants[0],
+        ),
+        Column("colors", postgresql.ARRAY(postgresql.ENUM(*color_variants, name="color"))),
+    )
+
+    return schema
+
+
+def get_enum_syncs() -> List[EnumValuesSync]:
+    return [
+        EnumValuesSync(
+            enum_schema=DEFAULT_SCHEMA,
+            enum_name="order_status",
+            new_values=["active", "passive", "blocked"],
+            affected_columns=[
+                TableReference(
+                    table_schema=DEFAULT_SCHEMA,
+                    table_name="orders",
+                    column_name="status",
+                    existing_server_default="'active'::order_status",
+                )
+            ],
+            enum_values_to_rename=[("banned", "blocked")],
+        ),
+        EnumValuesSync(
+            enum_schema=DEFAULT_SCHEMA,
+            enum_name="color",
+            new_values=["black", "white", "purple"],
+            affected_columns=[
+                TableReference(
+                    table_schema=DEFAULT_SCHEMA,
+                    table_name="orders",
+                    column_name="colors",
+                    column_type=ColumnType.ARRAY,
+                )
+            ],
+            enum_values_to_rename=[("violet", "purple")],
+        ),
+    ]
+
+
+def test_sync_enum_values_online(connection: "Connection", caplog: pytest.LogCaptureFixture):
+    database_schema = get_schema_with_enum_columns(
+        ["active", "passive", "banned", "deleted"], ["black", "white", "violet", "other"]
+    )
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            """
+        INSERT INTO orders (status, colors) VALUES
+            ('active', '{"black"}'),
+            ('passive', '{"white", "violet"}'),
+            ('banned', NULL),
+            (DEFAULT, '{}'),
+            ('passive', '{"violet"}')
+    """
+        )
+    )
+    connection.commit()
+
+    migration_context = MigrationContext.configure(connection)
+    ops = Operations(migration_context)
+
+    caplog.set_level(logging.INFO)
+
+    try:
+        with migration_context.begin_transaction():
+            ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync(batch_size=2))
+
+        assert 'Backfilled "public"."orders" in 3 batch(es)' in caplog.messages
+
+        assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+            "order_status": ("active", "passive", "blocked"),
+            "color": ("black", "white", "purple"),
+        }
+        assert connection.execute(sqlalchemy.text("SELECT id, status, colors FROM orders ORDER BY id")).all() == [
+            (1, "active", "{black}"),
+            (2, "passive", "{white,purple}"),
+            (3, "blocked", None),
+            (4, "active", "{}"),
+            (5, "passive", "{purple}"),
+        ]
+        assert get_column_default(connection, DEFAULT_SCHEMA, "orders", "status") == "'active'::order_status"
+        assert connection.execute(
+            sqlalchemy.text(
+                "SELECT attnotnull FROM pg_catalog.pg_attribute WHERE attrelid = 'orders'::regclass AND attname = 'status'"
+            )
+        ).scalar()
+        # Sync trigger is dropped, so new rows get default of the swapped column
+        assert connection.execute(sqlalchemy.text("INSERT INTO orders DEFAULT VALUES RETURNING status")).scalar() == (
+            "active"
+        )
+    finally:
+        connection.rollback()
+        database_schema.drop_all(connection)
+        connection.commit()
+
+
+def test_sync_enum_values_online_refuses_indexed_column(connection: "Connection"):
+    database_schema = get_schema_with_enum_columns(
+        ["active", "passive", "banned", "deleted"], ["black", "white", "violet", "other"]
+    )
+    Index("orders_status_idx", database_schema.tables["orders"].c.status)
+    database_schema.create_all(connection)
+    connection.commit()
+
+    migration_context = MigrationContext.configure(connection)
+    ops = Operations(migration_context)
+
+    with pytest.raises(ValueError, match="orders_status_idx"):
+        with migration_context.begin_transaction():
+            ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync())
+
+    try:
+        # Nothing was changed before the check
+        assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+            "order_status": ("active", "passive", "banned", "deleted"),
+            "color": ("black", "white", "violet", "other"),
+        }
+    finally:
+        connection.rollback()
+        database_schema.drop_all(connection)
+        connection.commit()
+
+
+def test_sync_enum_values_online_reverts_failed_sync(connection: "Connection"):
+    database_schema = get_schema_with_enum_columns(
+        ["active", "passive", "banned", "deleted"], ["black", "white", "violet", "other"]
+    )
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            """
+        INSERT INTO orders (status, colors) SELECT 'active', '{"black"}' FROM generate_series(1, 25);
+        INSERT INTO orders (status, colors) VALUES ('deleted', NULL);
+    """
+        )
+    )
+    connection.commit()
+
+    migration_context = MigrationContext.configure(connection)
+    ops = Operations(migration_context)
+
+    try:
+        # Row with removed 'deleted' value fails the backfill after the first batches are committed
+        with pytest.raises(ValueError, match="reference to old enum value"):
+            with migration_context.begin_transaction():
+                ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync(batch_size=10))
+
+        assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+            "order_status": ("active", "passive", "banned", "deleted"),
+            "color": ("black", "white", "violet", "other"),
+        }
+        assert connection.execute(
+            sqlalchemy.text(
+                "SELECT attname FROM pg_catalog.pg_attribute "
+                "WHERE attrelid = 'orders'::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum"
+            )
+        ).scalars().all() == ["id", "status", "colors"]
+        assert not connection.execute(
+            sqlalchemy.text("SELECT count(*) FROM pg_catalog.pg_trigger WHERE tgrelid = 'orders'::regclass")
+        ).scalar()
+        assert not connection.execute(
+            sqlalchemy.text("SELECT count(*) FROM pg_catalog.pg_proc WHERE proname = 'orders__enum_sync'")
+        ).scalar()
+        # Writes of values removed by the failed sync keep working
+        connection.execute(sqlalchemy.text("INSERT INTO orders (status) VALUES ('deleted')"))
+        connection.commit()
+
+        # Sync can be run again once removed value is not used
+        connection.execute(sqlalchemy.text("DELETE FROM orders WHERE status = 'deleted'"))
+        connection.commit()
+        with migration_context.begin_transaction():
+            ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync(batch_size=10))
+
+        assert get_defined_enums(connection, DEFAULT_SCHEMA) == {
+            "order_status": ("active", "passive", "blocked"),
+            "color": ("black", "white", "purple"),
+        }
+    finally:
+        connection.rollback()
+        database_schema.drop_all(connection)
+        connection.commit()
+
+
+def test_sync_enum_values_online_keeps_columns_comparable_during_backfill(
+    connection: "Connection", monkeypatch: pytest.MonkeyPatch
+):
+    database_schema = get_schema_with_enum_columns(
+        ["active", "passive", "banned", "deleted"], ["black", "white", "violet", "other"]
+    )
+    database_schema.create_all(connection)
+    connection.execute(sqlalchemy.text("INSERT INTO orders (status) VALUES ('active'), ('banned'), ('passive')"))
+    connection.commit()
+
+    counts = []
+
+    def backfill_table(backfill_connection, *args):
+        # Literals of the enum name already have the new type, while the original column still has the old one
+        counts.append(
+            backfill_connection.execute(
+                sqlalchemy.text(
+                    """
+                SELECT
+                    count(*) FILTER (WHERE status = 'active'::order_status),
+                    count(*) FILTER (WHERE 'blocked'::order_status = status),
+                    count(*) FILTER (WHERE status != 'passive'::order_status)
+                FROM orders
+            """
+                )
+            ).one()
+        )
+        original_backfill_table(backfill_connection, *args)
+
+    original_backfill_table = sync_enum_values_online_module._backfill_table
+    monkeypatch.setattr(sync_enum_values_online_module, "_backfill_table", backfill_table)
+
+    migration_context = MigrationContext.configure(connection)
+    ops = Operations(migration_context)
+
+    try:
+        with migration_context.begin_transaction():
+            ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync())
+
+        assert counts == [(1, 1, 2)]
+        # Operators are dropped with the old type
+        assert not connection.execute(
+            sqlalchemy.text("SELECT count(*) FROM pg_catalog.pg_proc WHERE proname LIKE '%%new%%equals'")
+        ).scalar()
+    finally:
+        connection.rollback()
+        database_schema.drop_all(connection)
+        connection.commit()
+
+
+def test_sync_enum_values_online_keeps_column_settings(connection: "Connection"):
+    database_schema = get_schema_with_enum_columns(
+        ["active", "passive", "banned", "deleted"], ["black", "white", "violet", "other"]
+    )
+    database_schema.create_all(connection)
+    connection.execute(
+        sqlalchemy.text(
+            """
+        DROP ROLE IF EXISTS enum_sync_reader;
+        CREATE ROLE enum_sync_reader;
+        COMMENT ON COLUMN orders.status IS 'Status: it''s the order state';
+        ALTER TABLE orders ALTER COLUMN status SET STATISTICS 500;
+        GRANT SELECT (status), UPDATE (status) ON orders TO enum_sync_reader;
+        GRANT SELECT (status) ON orders TO PUBLIC;
+    """
+        )
+    )
+    connection.commit()
+
+    migration_context = MigrationContext.configure(connection)
+    ops = Operations(migration_context)
+
+    try:
+        with migration_context.begin_transaction():
+            ops.sync_multiple_enum_values(get_enum_syncs(), online=OnlineSync())
+
+        assert (
+            connection.execute(
+                sqlalchemy.text(
+                    """
+            SELECT
+                pg_catalog.col_description(attrelid, attnum),
+                attstattarget,
+                has_column_privilege('enum_sync_reader', attrelid, attnum, 'SELECT'),
+                has_column_privilege('enum_sync_reader', attrelid, attnum, 'UPDATE'),
+                has_column_privilege('public', attrelid, attnum, 'SELECT')
+            FROM pg_catalog.pg_attribute
+            WHERE attrelid = 'orders'::regclass AND attname = 'status'
+        """
+                )
+            ).one()
+            == ("Status: it's the order state", 500, True, True, True)
+        )
+    finally:
+        connection.rollback()
+        database_schema.drop_all(connection)
+        connection.execute(sqlalchemy.text("DROP ROLE enum_sync_reader"))
+        connection.commit()
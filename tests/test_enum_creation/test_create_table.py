@@ -121,6 +121,48 @@ class TestCreateEnumOnCreateTableWithSaEnum(CompareAndRunTestCase):
         """
 
 
+class TestCreateEnumOnCreateTableWithSaEnumContainingEnumInValues(CompareAndRunTestCase):
+    """Check that sqlalchemy.Enum is converted to postgresql.ENUM as is, when its name and values contain "Enum" """
+
+    new_enum_variants = ["Enum", "NotEnum"]
+
+    def get_database_schema(self) -> MetaData:
+        return MetaData()
+
+    def get_target_schema(self) -> MetaData:
+        target_schema = MetaData()
+        Table(
+            USER_TABLE_NAME,
+            target_schema,
+            Column("id", Integer, primary_key=True),
+            Column(
+                USER_STATUS_COLUMN_NAME,
+                sqlalchemy.Enum(*self.new_enum_variants, name="Enum_status"),
+            ),
+        )
+        return target_schema
+
+    def get_expected_upgrade(self) -> str:
+        return f"""
+        # ### commands auto generated by Alembic - please adjust! ###
+        sa.Enum('Enum', 'NotEnum', name='Enum_status').create(op.get_bind())
+        op.create_table('{USER_TABLE_NAME}',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', postgresql.ENUM('Enum', 'NotEnum', name='Enum_status', create_type=False), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        # ### end Alembic commands ###
+        """
+
+    def get_expected_downgrade(self) -> str:
+        return f"""
+        # ### commands auto generated by Alembic - please adjust! ###
+        op.drop_table('{USER_TABLE_NAME}')
+        sa.Enum('Enum', 'NotEnum', name='Enum_status').drop(op.get_bind())
+        # ### end Alembic commands ###
+        """
+
+
 class TestCreateEnumOnCreateTableWithAnotherSchema(CompareAndRunTestCase):
     """Check that library correctly creates enum before its use inside create_table inside another table_schema"""
 
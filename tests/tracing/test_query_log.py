@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from alembic.autogenerate import produce_migrations
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.tracing import QueryLog
+from tests.schemas import (
+    get_schema_with_enum_variants,
+    DEFAULT_SCHEMA,
+    USER_STATUS_ENUM_NAME,
+    USER_STATUS_COLUMN_NAME,
+    USER_TABLE_NAME,
+)
+from tests.utils.migration_context import create_migration_context
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+def test_compare_enums_query_budget(connection: "Connection"):
+    database_schema = get_schema_with_enum_variants(["active", "passive"])
+    database_schema.create_all(connection)
+    target_schema = get_schema_with_enum_variants(["active", "passive", "banned"])
+
+    with QueryLog() as query_log:
+        produce_migrations(create_migration_context(connection, target_schema), target_schema)
+
+    assert query_log.count("get_defined_enums") == 1
+    assert query_log.count("get_column_defaults") == 1
+    query_log.assert_max_queries(2)
+
+
+def test_query_budget_exceeded(connection: "Connection"):
+    database_schema = get_schema_with_enum_variants(["active", "passive", "banned"])
+    database_schema.create_all(connection)
+
+    ops = Operations(MigrationContext.configure(connection))
+
+    with QueryLog() as query_log:
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            ["active", "passive"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    assert query_log.get_queries("step.alter_table")[0].startswith("ALTER TABLE")
+    assert list(query_log.by_phase())[:3] == ["get_table_references", "step.rename_type", "step.create_type"]
+    query_log.assert_max_queries(1, phase="step.alter_table")
+
+    with pytest.raises(AssertionError) as error:
+        query_log.assert_max_queries(3)
+    assert f"Expected at most 3 queries, {query_log.count()} executed" in str(error.value)
+    assert "step.drop_type: 1 query(ies)" in str(error.value)
+
+
+def test_queries_outside_of_query_log_are_not_captured(connection: "Connection"):
+    target_schema = get_schema_with_enum_variants(["active", "passive"])
+    query_log = QueryLog()
+    produce_migrations(create_migration_context(connection, target_schema), target_schema)
+
+    assert query_log.count() == 0
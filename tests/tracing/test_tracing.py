@@ -0,0 +1,90 @@
+from typing import TYPE_CHECKING
+
+from alembic.autogenerate import produce_migrations
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from alembic_postgresql_enum.configuration import Config
+from alembic_postgresql_enum.tracing import InMemoryTracer, trace_span
+from tests.conftest import configured
+from tests.schemas import (
+    get_schema_with_enum_variants,
+    DEFAULT_SCHEMA,
+    USER_STATUS_ENUM_NAME,
+    USER_STATUS_COLUMN_NAME,
+    USER_TABLE_NAME,
+)
+from tests.utils.migration_context import create_migration_context
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+
+def test_trace_span_without_tracer():
+    with trace_span("compare_enums", schema=DEFAULT_SCHEMA) as span:
+        assert span is None
+
+
+def test_compare_enums_spans(connection: "Connection"):
+    database_schema = get_schema_with_enum_variants(["active", "passive"])
+    database_schema.create_all(connection)
+    target_schema = get_schema_with_enum_variants(["active", "passive", "banned"])
+
+    tracer = InMemoryTracer()
+    with configured(Config(tracer=tracer)):
+        produce_migrations(create_migration_context(connection, target_schema), target_schema)
+
+    (root_span,) = tracer.get_spans("compare_enums")
+    assert root_span.parent is None
+    # Detection spans are repeated for every schema
+    assert list(dict.fromkeys(span.name for span in root_span.children)) == [
+        "alembic_postgresql_enum.preprocess_upgrade_ops",
+        "alembic_postgresql_enum.get_declared_enums",
+        "alembic_postgresql_enum.get_defined_enums",
+        "alembic_postgresql_enum.create_new_enums",
+        "alembic_postgresql_enum.drop_unused_enums",
+        "alembic_postgresql_enum.sync_changed_enums",
+        "alembic_postgresql_enum.merge_syncs_sharing_tables",
+    ]
+    assert root_span.attributes["operation_count"] == 1
+
+    (defined_enums_span,) = tracer.get_spans("get_defined_enums")
+    assert defined_enums_span.attributes["enum_count"] == 1
+    assert defined_enums_span.attributes["query_count"] == 1
+    assert root_span.attributes["query_count"] >= defined_enums_span.attributes["query_count"]
+
+    assert DEFAULT_SCHEMA in [span.attributes["schema"] for span in tracer.get_spans("sync_changed_enums")]
+
+
+def test_sync_enum_values_spans(connection: "Connection"):
+    database_schema = get_schema_with_enum_variants(["active", "passive", "banned"])
+    database_schema.create_all(connection)
+
+    ops = Operations(MigrationContext.configure(connection))
+
+    tracer = InMemoryTracer()
+    with configured(Config(tracer=tracer)):
+        ops.sync_enum_values(
+            DEFAULT_SCHEMA,
+            USER_STATUS_ENUM_NAME,
+            ["active", "passive"],
+            ((USER_TABLE_NAME, USER_STATUS_COLUMN_NAME),),
+        )
+
+    (root_span,) = tracer.get_spans("sync_enum_values")
+    assert root_span.attributes["enum_names"] == (f"{DEFAULT_SCHEMA}.{USER_STATUS_ENUM_NAME}",)
+    assert root_span.attributes["table_count"] == 1
+    assert [span.name for span in root_span.children] == [
+        "alembic_postgresql_enum.get_table_references",
+        "alembic_postgresql_enum.step.rename_type",
+        "alembic_postgresql_enum.step.create_type",
+        "alembic_postgresql_enum.step.create_comparison_operators",
+        "alembic_postgresql_enum.step.alter_table",
+        "alembic_postgresql_enum.step.drop_comparison_operators",
+        "alembic_postgresql_enum.step.drop_type",
+    ]
+
+    (alter_table_span,) = tracer.get_spans("step.alter_table")
+    assert alter_table_span.attributes["table"] == f'"{DEFAULT_SCHEMA}"."{USER_TABLE_NAME}"'
+    assert alter_table_span.attributes["query_count"] == 1
+    assert root_span.attributes["query_count"] == sum(span.attributes["query_count"] for span in root_span.children)